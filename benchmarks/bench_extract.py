@@ -0,0 +1,66 @@
+"""
+저장된 네이버 페이지(tests/fixtures/*.html)로 가격 추출 경로를 비교하는 벤치마크입니다.
+
+    python benchmarks/bench_extract.py [--repeat 200]
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+from bs4 import BeautifulSoup, SoupStrainer
+from kimchi_gold.extract import PRICE_CLASS, extract_price
+
+FIXTURES_DIR: Path = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def parse_full_dom(content: bytes) -> str:
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.find("strong", class_=PRICE_CLASS).get_text()
+
+
+def parse_strainer(content: bytes) -> str:
+    strainer = SoupStrainer("strong", class_=PRICE_CLASS)
+    soup = BeautifulSoup(content, "html.parser", parse_only=strainer)
+    return soup.find("strong", class_=PRICE_CLASS).get_text()
+
+
+def measure(func: Callable[[bytes], object], pages: List[bytes], repeat: int):
+    """페이지당 평균 CPU 시간(ms)과 한 번 실행할 때의 최대 할당량(KiB)을 잽니다."""
+    tracemalloc.start()
+    for page in pages:
+        func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.process_time()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed = time.process_time() - start
+    return elapsed / (repeat * len(pages)) * 1000, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1024:.0f} KiB total")
+    print(f"{'engine':<16}{'ms/page':>12}{'peak KiB':>12}")
+    engines = [
+        ("fast extractor", extract_price),
+        ("SoupStrainer", parse_strainer),
+        ("full DOM", parse_full_dom),
+    ]
+    for name, func in engines:
+        # BeautifulSoup 경로는 느리므로 반복 횟수를 줄여서 잽니다.
+        repeat = args.repeat if func is extract_price else max(1, args.repeat // 20)
+        ms_per_page, peak_kib = measure(func, pages, repeat)
+        print(f"{name:<16}{ms_per_page:>12.4f}{peak_kib:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+벤치마크용 합성 가격 로그를 만듭니다.
+
+실제 로그(data/kimchi_gold_price_log.csv)와 같은 헤더와 숫자 형식을 쓰며,
+생성한 파일은 benchmarks/.cache에 저장해 다음 실행에서 재사용합니다.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.premium import TROY_OUNCE_GRAMS, compute_premium
+
+CACHE_DIR: Path = Path(__file__).resolve().parent / ".cache"
+
+# 이름 -> (행 수, 간격). 마지막 행이 오늘이 되도록 거꾸로 생성합니다.
+SIZES: Dict[str, Tuple[int, timedelta]] = {
+    "current": (500, timedelta(days=1)),  # 지금 로그 크기 (~500일)
+    "10y-daily": (3650, timedelta(days=1)),
+    "1y-minute": (525_600, timedelta(minutes=1)),
+    "10y-minute": (5_256_000, timedelta(minutes=1)),
+}
+
+
+def generate(rows: int, step: timedelta, seed: int = 0) -> pd.DataFrame:
+    """무작위 보행으로 금값과 환율을 만들고 김치 프리미엄을 계산한 로그를 반환합니다."""
+    rng = np.random.default_rng(seed)
+    end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    index = pd.date_range(end=end, periods=rows, freq=step)
+    scale = np.sqrt(step / timedelta(days=1))
+    international = 2000 * np.exp(np.cumsum(rng.normal(0, 0.01 * scale, rows)))
+    usdkrw = 1300 * np.exp(np.cumsum(rng.normal(0, 0.004 * scale, rows)))
+    domestic = (
+        international * usdkrw / TROY_OUNCE_GRAMS * (1 + rng.normal(0.005, 0.01, rows))
+    )
+    premium = compute_premium(domestic, international, usdkrw)
+    if step >= timedelta(days=1):
+        dates = index.strftime("%Y-%m-%d")
+    else:
+        dates = index.strftime("%Y-%m-%dT%H:%M:%S")
+    return pd.DataFrame(
+        {
+            LOG_HEADER[0]: dates,
+            LOG_HEADER[1]: domestic.round(2),
+            LOG_HEADER[2]: international.round(2),
+            LOG_HEADER[3]: usdkrw.round(2),
+            LOG_HEADER[4]: premium.difference.round(2),
+            LOG_HEADER[5]: premium.percent.round(2),
+        }
+    )
+
+
+def dataset_path(name: str) -> Path:
+    """이름에 해당하는 합성 로그 CSV 경로를 반환합니다. 없거나 날짜가 지났으면 새로 만듭니다."""
+    rows, step = SIZES[name]
+    today = datetime.now().strftime("%Y%m%d")
+    path = CACHE_DIR / f"log_{name}_{today}.csv"
+    if not path.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in CACHE_DIR.glob(f"log_{name}_*.csv"):
+            stale.unlink()
+        generate(rows, step).to_csv(path, index=False, lineterminator="\r\n")
+    return path
@@ -0,0 +1,256 @@
+"""
+성능이 중요한 경로를 합성 데이터 크기별로 측정하고 기준 결과와 비교합니다.
+
+    python benchmarks/run.py                          # 기본 크기로 실행, 결과 저장
+    python benchmarks/run.py --sizes current 10y-minute
+    python benchmarks/run.py --baseline benchmarks/results/baseline.json
+    python benchmarks/run.py --save-baseline          # 이번 결과를 기준으로 저장
+
+기준보다 --threshold(기본 25%) 넘게 느려진 항목이 있으면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from datasets import SIZES, dataset_path  # noqa: E402
+from kimchi_gold import backtest, collect_price, loader, now_price, plot, rollup  # noqa: E402
+from kimchi_gold.extract import extract_price  # noqa: E402
+from kimchi_gold.writer import LogWriter  # noqa: E402
+
+BENCH_DIR: Path = Path(__file__).resolve().parent
+RESULTS_DIR: Path = BENCH_DIR / "results"
+BASELINE_FILE: Path = RESULTS_DIR / "baseline.json"
+FIXTURES_DIR: Path = BENCH_DIR.parent / "tests" / "fixtures"
+DEFAULT_SIZES: List[str] = ["current", "10y-daily", "1y-minute"]
+MIN_TIME: float = 0.5  # 항목마다 최소 이 시간(초)만큼 반복합니다.
+MAX_REPEAT: int = 50
+
+Setup = Callable[[Path, Path], Callable[[], object]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Setup  # (데이터 경로, 작업 폴더) -> 측정할 함수
+    sized: bool = True  # False면 데이터 크기와 무관하므로 한 번만 잽니다.
+    max_rows: Optional[int] = None  # 이보다 큰 데이터는 건너뜁니다.
+
+
+def _setup_extract(data: Path, workdir: Path) -> Callable[[], object]:
+    pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    return lambda: [extract_price(page) for page in pages]
+
+
+def _setup_calc_premium(data: Path, workdir: Path) -> Callable[[], object]:
+    quotes = (150000.0, 3345.0, 1399.0)
+
+    def run():
+        with patch.object(now_price, "fetch_quotes", return_value=quotes):
+            for _ in range(1000):
+                now_price.calc_kimchi_premium()
+
+    return run
+
+
+def _setup_is_today_logged(data: Path, workdir: Path) -> Callable[[], object]:
+    return lambda: collect_price.is_today_logged(data)
+
+
+def _setup_write_to_csv(data: Path, workdir: Path) -> Callable[[], object]:
+    target = workdir / data.name
+    shutil.copyfile(data, target)
+    row = ["2099-01-01", "150000.00", "3345.00", "1399.00", "-452.50", "-0.30"]
+    return lambda: collect_price.write_to_csv(row, target)
+
+
+def _setup_log_writer(data: Path, workdir: Path) -> Callable[[], object]:
+    # 장중 샘플링처럼 행을 자주 쓰는 경우: 1000행을 100행씩 모아 씁니다.
+    target = workdir / "writer.csv"
+    row = ["2099-01-01T09:00:00", "150000.00", "3345.00", "1399.00", "-452.50", "-0.30"]
+
+    def run():
+        with LogWriter(target, max_rows=100) as writer:
+            for _ in range(1000):
+                writer.write(row)
+
+    return run
+
+
+def _setup_load(data: Path, workdir: Path) -> Callable[[], object]:
+    def run():
+        loader.clear_cache()  # 매번 CSV를 새로 파싱하는 시간을 잽니다.
+        return plot.load_and_preprocess_data(data, 12)
+
+    return run
+
+
+def _setup_load_cached(data: Path, workdir: Path) -> Callable[[], object]:
+    # 같은 파일로 여러 기간을 조회하는 경우: 파싱 결과를 재사용하고 창만 자릅니다.
+    return lambda: [plot.load_and_preprocess_data(data, months) for months in (6, 12, None)]
+
+
+def _setup_render(data: Path, workdir: Path) -> Callable[[], object]:
+    return lambda: plot.render_windows(
+        [12], data_file=data, output_dir=workdir, force=True
+    )
+
+
+def _setup_rollup_rebuild(data: Path, workdir: Path) -> Callable[[], object]:
+    target = workdir / data.name
+    shutil.copyfile(data, target)
+
+    def run():
+        loader.clear_cache()
+        return rollup.rebuild_rollups(target)
+
+    return run
+
+
+def _setup_rollup_update(data: Path, workdir: Path) -> Callable[[], object]:
+    # collect_data가 행 하나를 붙인 뒤 현재 주/월 구간만 고치는 비용입니다.
+    target = workdir / data.name
+    shutil.copyfile(data, target)
+    rollup.rebuild_rollups(target)
+    seconds = itertools.count()
+
+    def run():
+        second = next(seconds)
+        key = f"2099-01-01T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+        rollup.update_rollups([key, "150000.00", "3345.00", "1399.00", "-452.50", "-0.30"], target)
+
+    return run
+
+
+def _setup_backtest_sweep(data: Path, workdir: Path) -> Callable[[], object]:
+    # (entry, exit) 100쌍 × 수수료 4조합. 병렬화와 무관한 한 프로세스의 탐색 비용입니다.
+    history = backtest.load_history(data)
+    entries = [0.5 + 0.25 * i for i in range(10)]
+    exits = [-0.9 + 0.2 * i for i in range(10)]
+    return lambda: backtest.sweep(
+        history, entries, exits, fees=(0.0, 0.01), fx_spreads=(0.0, 0.1), workers=1
+    )
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("extract_price", _setup_extract, sized=False),
+    Benchmark("calc_kimchi_premium_x1000", _setup_calc_premium, sized=False),
+    Benchmark("is_today_logged", _setup_is_today_logged),
+    Benchmark("write_to_csv", _setup_write_to_csv),
+    Benchmark("log_writer_x1000", _setup_log_writer, sized=False),
+    Benchmark("load_and_preprocess_data", _setup_load),
+    Benchmark("load_windows_cached", _setup_load_cached),
+    Benchmark("plot_render", _setup_render, max_rows=1_000_000),
+    Benchmark("rollup_rebuild", _setup_rollup_rebuild),
+    Benchmark("rollup_update", _setup_rollup_update),
+    Benchmark("backtest_sweep", _setup_backtest_sweep),
+]
+
+
+def measure(func: Callable[[], object]) -> Dict[str, float]:
+    """한 번 워밍업한 뒤 MIN_TIME을 채울 때까지 반복해 중앙값과 최솟값을 구합니다."""
+    func()
+    times: List[float] = []
+    total = 0.0
+    while len(times) < MAX_REPEAT and (total < MIN_TIME or len(times) < 3):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+        if elapsed > 5.0:  # 아주 느린 항목은 한 번으로 충분합니다.
+            break
+    return {"median": statistics.median(times), "min": min(times), "repeat": len(times)}
+
+
+def run(sizes: List[str], only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for bench in BENCHMARKS:
+            if only and bench.name not in only:
+                continue
+            for size in sizes if bench.sized else ["-"]:
+                key = bench.name if size == "-" else f"{bench.name}@{size}"
+                if bench.max_rows is not None and size != "-" and SIZES[size][0] > bench.max_rows:
+                    print(f"{key:<45}{'skipped':>12}")
+                    continue
+                data = dataset_path(size) if size != "-" else Path()
+                results[key] = measure(bench.setup(data, workdir))
+                print(f"{key:<45}{results[key]['median'] * 1000:>12.3f} ms")
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """기준보다 threshold 비율 넘게 느려진 항목 이름을 반환합니다."""
+    regressions = []
+    print(f"\n{'benchmark':<45}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for key, current in results.items():
+        if key not in baseline:
+            continue
+        ratio = current["median"] / baseline[key]["median"]
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(
+            f"{key:<45}{baseline[key]['median'] * 1000:>10.3f}ms"
+            f"{current['median'] * 1000:>10.3f}ms{ratio:>8.2f}{flag}"
+        )
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", help="실행할 벤치마크 이름")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.only)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"run_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n결과 저장: {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"기준 저장: {args.baseline}")
+        return 0
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 저하 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+from kimchi_gold.cli import run
+
+run()
@@ -0,0 +1,467 @@
+import json
+import math
+import operator
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import requests
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.now_price import RESULT_FIELDS
+
+ALERT_RULES_ENV: str = "KIMCHI_GOLD_ALERT_RULES"
+ALERT_WEBHOOK_ENV: str = "KIMCHI_GOLD_ALERT_WEBHOOK"
+ALERTS_NAME: str = "kimchi_gold_alerts.jsonl"
+
+# 규칙에서 쓰는 짧은 이름
+FIELD_ALIASES: Dict[str, str] = {"premium": "premium_percent", "fx": "usdkrw"}
+# 가격 로그 열 → 틱 필드
+LOG_FIELDS: Dict[str, str] = dict(
+    zip(
+        LOG_HEADER[1:],
+        ("domestic", "international", "usdkrw", "difference", "premium_percent"),
+    )
+)
+WINDOW_UNITS: Dict[str, float] = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+FUNCTIONS = ("mean", "std", "min", "max", "zscore", "change", "move", "delta")
+OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_RULE_RE = re.compile(
+    r"^\s*(?:(?P<func>\w+)\(\s*(?P<arg>\w+)\s*,\s*(?P<window>\d+(?:\.\d+)?[smhdw])\s*\)"
+    r"|(?P<field>\w+))\s*(?P<op>>=|<=|>|<)\s*(?P<threshold>[-+]?\d+(?:\.\d+)?)\s*%?\s*$"
+)
+
+
+def parse_window(text: str) -> float:
+    """'90s', '15m', '1h', '30d', '2w' 같은 기간을 초로 바꿉니다."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", text.strip())
+    if not match:
+        raise ValueError(f"기간 형식이 잘못되었습니다: {text!r}")
+    return float(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def tick_from_result(result: Sequence[float]) -> Dict[str, float]:
+    """calc_kimchi_premium 결과 튜플을 필드 이름이 붙은 틱으로 바꿉니다."""
+    return dict(zip(RESULT_FIELDS, result))
+
+
+class WindowStats:
+    """
+    한 필드의 최근 seconds초 값을 담는 시간 창입니다.
+
+    값을 넣을 때 창 밖으로 밀려난 값만 앞에서 빼고 합·제곱합을 고치므로 추가와 만료는
+    분할 상환 O(1)입니다. 최솟값·최댓값은 단조 덱으로, 창의 첫 값은 덱 맨 앞에서 바로 읽습니다.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError("seconds는 0보다 커야 합니다.")
+        self.seconds = seconds
+        self._items: Deque[Tuple[float, float]] = deque()
+        self._lows: Deque[Tuple[float, float]] = deque()
+        self._highs: Deque[Tuple[float, float]] = deque()
+        self._sum = self._sumsq = 0.0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, t: float, x: float) -> None:
+        if math.isnan(x):
+            return
+        self._items.append((t, x))
+        self._sum += x
+        self._sumsq += x * x
+        while self._lows and self._lows[-1][1] >= x:
+            self._lows.pop()
+        self._lows.append((t, x))
+        while self._highs and self._highs[-1][1] <= x:
+            self._highs.pop()
+        self._highs.append((t, x))
+        cutoff = t - self.seconds
+        while self._items[0][0] < cutoff:
+            _, old = self._items.popleft()
+            self._sum -= old
+            self._sumsq -= old * old
+            self._evicted += 1
+        while self._lows[0][0] < cutoff:
+            self._lows.popleft()
+        while self._highs[0][0] < cutoff:
+            self._highs.popleft()
+        if self._evicted >= len(self._items):
+            # 누적 합의 부동소수점 오차가 쌓이지 않도록 가끔 다시 합산합니다.
+            self._sum = math.fsum(x for _, x in self._items)
+            self._sumsq = math.fsum(x * x for _, x in self._items)
+            self._evicted = 0
+
+    @property
+    def last(self) -> float:
+        return self._items[-1][1] if self._items else math.nan
+
+    @property
+    def first(self) -> float:
+        return self._items[0][1] if self._items else math.nan
+
+    def mean(self) -> float:
+        return self._sum / len(self._items) if self._items else math.nan
+
+    def std(self) -> float:
+        n = len(self._items)
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(self._sumsq - self._sum * self._sum / n, 0.0) / (n - 1))
+
+    def min(self) -> float:
+        return self._lows[0][1] if self._lows else math.nan
+
+    def max(self) -> float:
+        return self._highs[0][1] if self._highs else math.nan
+
+    def zscore(self) -> float:
+        std = self.std()
+        return (self.last - self.mean()) / std if std > 0 else math.nan
+
+    def change(self) -> float:
+        """창의 첫 값 대비 마지막 값의 변화율(%)."""
+        first = self.first
+        return (self.last - first) / first * 100 if first else math.nan
+
+    def move(self) -> float:
+        return abs(self.change())
+
+    def delta(self) -> float:
+        return self.last - self.first
+
+
+@dataclass
+class Rule:
+    """
+    알림 규칙 하나입니다.
+
+    when은 '<지표> <비교> <기준값>' 형식입니다. 지표는 틱 필드 이름(premium, fx 같은 별칭
+    포함)이거나 '<함수>(<필드>, <기간>)'입니다. 함수는 mean, std, min, max, zscore,
+    change(변화율 %), move(변화율 절댓값 %), delta(차이)이고 기간은 '1h', '30d'처럼 씁니다.
+    기준값 뒤의 %는 읽기 편하라고 붙이는 표시일 뿐입니다.
+
+        premium > 3%
+        zscore(premium, 30d) > 2
+        move(fx, 1h) > 1%
+
+    Args:
+        name (str): 규칙 이름. 엔진 안에서 고유해야 합니다.
+        when (str): 조건식.
+        confirm (int): 조건이 이만큼 연속으로 맞아야 알립니다 (순간적인 튐을 거릅니다).
+        cooldown (float): 한 번 알린 뒤 다시 알리기까지 최소 간격(초).
+    """
+
+    name: str
+    when: str
+    confirm: int = 1
+    cooldown: float = 0.0
+    func: Optional[str] = field(init=False, default=None)
+    target: str = field(init=False, default="")
+    window: Optional[float] = field(init=False, default=None)
+    op: str = field(init=False, default=">")
+    threshold: float = field(init=False, default=0.0)
+
+    def __post_init__(self) -> None:
+        match = _RULE_RE.match(self.when)
+        if not match:
+            raise ValueError(f"규칙 '{self.name}'의 조건을 읽을 수 없습니다: {self.when!r}")
+        name = match.group("arg") or match.group("field")
+        self.target = FIELD_ALIASES.get(name, name)
+        if self.target not in RESULT_FIELDS:
+            raise ValueError(f"규칙 '{self.name}': 알 수 없는 필드입니다: {name!r}")
+        if match.group("func"):
+            if match.group("func") not in FUNCTIONS:
+                raise ValueError(
+                    f"규칙 '{self.name}': 함수는 {', '.join(FUNCTIONS)} 중 하나여야 합니다."
+                )
+            self.func = match.group("func")
+            self.window = parse_window(match.group("window"))
+        self.op = match.group("op")
+        self.threshold = float(match.group("threshold"))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "Rule":
+        return cls(
+            name=str(data["name"]),
+            when=str(data["when"]),
+            confirm=int(data.get("confirm", 1)),
+            cooldown=float(data.get("cooldown", 0.0)),
+        )
+
+
+@dataclass
+class Alert:
+    rule: str
+    when: str
+    value: float
+    threshold: float
+    at: float
+    tick: Dict[str, float]
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["time"] = datetime.fromtimestamp(self.at).isoformat(timespec="seconds")
+        return data
+
+    def message(self) -> str:
+        return f"[{self.rule}] {self.when} (현재 {self.value:.4g})"
+
+
+@dataclass
+class _RuleState:
+    streak: int = 0
+    active: bool = False
+    last_fired: Optional[float] = None
+
+
+Sink = Callable[[Alert], None]
+
+
+class FileSink:
+    """알림을 한 줄짜리 JSON으로 파일 끝에 덧붙입니다."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, alert: Alert) -> None:
+        line = json.dumps(alert.to_dict(), ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class WebhookSink:
+    """
+    알림을 JSON으로 webhook URL에 POST합니다.
+    전송은 전용 스레드 하나가 순서대로 맡으므로 수집 루프는 네트워크를 기다리지 않습니다.
+    """
+
+    def __init__(
+        self, url: str, session: Optional[requests.Session] = None, timeout: float = 5.0
+    ) -> None:
+        self.url = url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-webhook")
+
+    def _post(self, payload: Dict[str, object]) -> None:
+        try:
+            self.session.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+        except requests.RequestException as e:
+            print(f"알림 전송 실패: {e}")
+
+    def __call__(self, alert: Alert) -> None:
+        payload = alert.to_dict()
+        payload["text"] = alert.message()
+        self._pool.submit(self._post, payload)
+
+    def close(self) -> None:
+        """대기 중인 전송이 끝날 때까지 기다립니다."""
+        self._pool.shutdown(wait=True)
+
+
+class AlertEngine:
+    """
+    틱마다 모든 규칙을 평가해 알림을 내보내는 엔진입니다.
+
+    같은 (필드, 기간)을 쓰는 규칙은 WindowStats 하나를 함께 쓰므로, 틱 하나의 비용은
+    서로 다른 창 수만큼의 갱신과 규칙마다 O(1) 평가입니다. 규칙 수백 개도 수집 루프에
+    느껴질 만한 지연을 더하지 않습니다.
+
+    알림은 조건이 confirm번 연속 맞을 때 한 번 나가고, 조건이 풀릴 때까지는 다시 나가지
+    않습니다 (중복 제거). 다시 맞더라도 cooldown초가 지나지 않았으면 알리지 않습니다.
+    state_file을 주면 이 상태를 파일에 남겨 하루 한 번 도는 collect처럼 매번 새로 뜨는
+    프로세스에서도 같은 알림을 되풀이하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Rule] = (),
+        sinks: Iterable[Sink] = (),
+        state_file: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.sinks: List[Sink] = list(sinks)
+        self.state_file = state_file
+        self.clock = clock
+        self.rules: List[Rule] = []
+        self._windows: Dict[Tuple[str, float], WindowStats] = {}
+        self._evaluators: List[Callable[[Mapping[str, float]], float]] = []
+        self._states: List[_RuleState] = []
+        for rule in rules:
+            self.add_rule(rule)
+        self._load_state()
+
+    def add_rule(self, rule: Rule) -> None:
+        if any(existing.name == rule.name for existing in self.rules):
+            raise ValueError(f"규칙 이름이 중복됩니다: {rule.name}")
+        if rule.func is None:
+            name = rule.target
+            evaluate = lambda tick: tick.get(name, math.nan)  # noqa: E731
+        else:
+            key = (rule.target, rule.window)
+            stats = self._windows.get(key)
+            if stats is None:
+                stats = self._windows[key] = WindowStats(rule.window)
+            evaluate = lambda tick, f=getattr(stats, rule.func): f()  # noqa: E731
+        self.rules.append(rule)
+        self._evaluators.append(evaluate)
+        self._states.append(_RuleState())
+
+    def warm(self, ticks: Iterable[Tuple[float, Mapping[str, float]]]) -> None:
+        """지난 틱으로 창을 채웁니다. 규칙은 평가하지 않으므로 알림이 나가지 않습니다."""
+        for t, tick in ticks:
+            self._push(t, tick)
+
+    def warm_from_log(self, data_file: Path, until: Optional[datetime] = None) -> None:
+        """가격 로그에서 가장 긴 창 길이만큼의 행으로 창을 채웁니다. until 이후 행은 뺍니다."""
+        if not self._windows:
+            return
+        from kimchi_gold.loader import load_log
+
+        try:
+            df = load_log(data_file)
+        except FileNotFoundError:
+            return
+        end = until or datetime.now()
+        longest = max(seconds for _, seconds in self._windows)
+        start = datetime.fromtimestamp(end.timestamp() - longest)
+        df = df.iloc[df.index.searchsorted(start) : df.index.searchsorted(end)]
+        names = [LOG_FIELDS[column] for column in df.columns]
+        self.warm(
+            (stamp.to_pydatetime().timestamp(), dict(zip(names, values)))
+            for stamp, values in zip(df.index, df.to_numpy().tolist())
+        )
+
+    def _push(self, t: float, tick: Mapping[str, float]) -> None:
+        for (name, _), stats in self._windows.items():
+            value = tick.get(name)
+            if value is not None:
+                stats.push(t, float(value))
+
+    def update(self, tick: Mapping[str, float], at: Optional[float] = None) -> List[Alert]:
+        """틱 하나를 반영하고 새로 나간 알림 목록을 반환합니다."""
+        t = self.clock() if at is None else at
+        self._push(t, tick)
+        alerts: List[Alert] = []
+        changed = False  # 상태가 그대로인 틱에서는 상태 파일을 다시 쓰지 않습니다.
+        for rule, evaluate, state in zip(self.rules, self._evaluators, self._states):
+            value = evaluate(tick)
+            if not OPERATORS[rule.op](value, rule.threshold):  # NaN은 항상 거짓
+                if state.streak or state.active:
+                    state.streak = 0
+                    state.active = False
+                    changed = True
+                continue
+            if state.streak < rule.confirm:  # confirm에 닿은 뒤로는 더 셀 필요가 없습니다.
+                state.streak += 1
+                changed = True
+            if state.active or state.streak < rule.confirm:
+                continue
+            if state.last_fired is not None and t - state.last_fired < rule.cooldown:
+                continue
+            state.active = True
+            state.last_fired = t
+            changed = True
+            alerts.append(Alert(rule.name, rule.when, value, rule.threshold, t, dict(tick)))
+        for alert in alerts:
+            self._deliver(alert)
+        if changed and self.state_file is not None:
+            self._save_state()
+        return alerts
+
+    def _deliver(self, alert: Alert) -> None:
+        for sink in self.sinks:
+            try:
+                sink(alert)
+            except Exception as e:  # 알림 실패가 수집을 멈추지 않게 합니다.
+                print(f"알림 전달 실패 ({alert.rule}): {e}")
+
+    def _load_state(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        saved = json.loads(self.state_file.read_text(encoding="utf-8"))
+        for rule, state in zip(self.rules, self._states):
+            if rule.name in saved:
+                state.__dict__.update(saved[rule.name])
+
+    def _save_state(self) -> None:
+        data = {rule.name: asdict(state) for rule, state in zip(self.rules, self._states)}
+        tmp = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.state_file)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+
+def load_rules(path: Path) -> List[Rule]:
+    """[{"name": ..., "when": ..., "confirm": 1, "cooldown": 0}, ...] 형식의 JSON 파일을 읽습니다."""
+    return [Rule.from_dict(item) for item in json.loads(Path(path).read_text(encoding="utf-8"))]
+
+
+def engine_from_env() -> Optional[AlertEngine]:
+    """
+    KIMCHI_GOLD_ALERT_RULES가 규칙 JSON 파일을 가리키면 엔진을 만듭니다.
+    알림은 규칙 파일 옆의 kimchi_gold_alerts.jsonl에 쌓이고, KIMCHI_GOLD_ALERT_WEBHOOK이
+    있으면 그 주소로도 보냅니다. 규칙 상태는 규칙 파일 옆 '<이름>.state.json'에 남깁니다.
+    """
+    rules_file = os.environ.get(ALERT_RULES_ENV)
+    if not rules_file:
+        return None
+    path = Path(rules_file)
+    sinks: List[Sink] = [FileSink(path.parent / ALERTS_NAME)]
+    webhook = os.environ.get(ALERT_WEBHOOK_ENV)
+    if webhook:
+        sinks.append(WebhookSink(webhook))
+    return AlertEngine(
+        load_rules(path), sinks, state_file=path.with_name(path.stem + ".state.json")
+    )
+
+
+def evaluate_from_env(
+    result: Sequence[float], data_file: Path, at: Optional[datetime] = None
+) -> List[Alert]:
+    """
+    collect_data용 훅입니다. 규칙이 설정되어 있으면 가격 로그의 어제까지 기록으로 창을
+    채운 뒤 오늘 결과 하나를 평가합니다. 규칙이 없으면 아무것도 하지 않습니다.
+    """
+    engine = engine_from_env()
+    if engine is None:
+        return []
+    now = at or datetime.now()
+    try:
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        engine.warm_from_log(data_file, until=today)
+        return engine.update(tick_from_result(result), now.timestamp())
+    finally:
+        engine.close()
@@ -0,0 +1,178 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+PREMIUM_COL: str = "김치프리미엄(%)"
+FX_COL: str = "환율(원/달러)"
+DEFAULT_WINDOW: int = 30
+
+ANALYTICS_COLUMNS: List[str] = [
+    "rolling_mean",
+    "rolling_std",
+    "zscore",
+    "pct_rank",
+    "drawdown",
+    "max_drawdown",
+    "fx_corr",
+]
+
+
+def compute_analytics(df: pd.DataFrame, window: int = DEFAULT_WINDOW) -> pd.DataFrame:
+    """
+    김치 프리미엄(%) 시계열 전체에 대한 통계를 벡터 연산으로 계산합니다.
+
+    Args:
+        df (pd.DataFrame): 'load_and_preprocess_data'가 반환하는 형식의 데이터프레임.
+        window (int): 이동 통계에 사용할 행 개수.
+
+    Returns:
+        pd.DataFrame: ANALYTICS_COLUMNS 열을 가진 데이터프레임 (인덱스는 df와 동일).
+            창이 다 차기 전의 이동 통계는 NaN입니다.
+    """
+    premium: pd.Series = df[PREMIUM_COL].astype(float)
+    fx: pd.Series = pd.to_numeric(df[FX_COL], errors="coerce")
+    rolling = premium.rolling(window)
+    mean = rolling.mean()
+    std = rolling.std()
+    drawdown = premium - premium.cummax()
+    return pd.DataFrame(
+        {
+            "rolling_mean": mean,
+            "rolling_std": std,
+            "zscore": (premium - mean) / std,
+            "pct_rank": rolling.rank(pct=True),
+            "drawdown": drawdown,
+            "max_drawdown": drawdown.cummin(),
+            "fx_corr": rolling.corr(fx),
+        },
+        index=df.index,
+    )
+
+
+class IncrementalAnalytics:
+    """
+    compute_analytics와 같은 통계를 한 행씩 갱신하는 상태 객체입니다.
+
+    최근 window개 값을 고정 크기 배열에 담고 합, 제곱합, 곱의 합을 유지하므로
+    평균·표준편차·z-점수·상관계수는 O(1), 백분위 순위는 정렬된 창에서 이진 탐색으로 구합니다.
+    행을 하나 추가할 때 전체 기록을 다시 계산하지 않습니다.
+
+    비어 있는 값(NaN)은 합에 더하지 않고 창 안의 개수만 셉니다. pandas rolling처럼
+    창 안에 하나라도 있으면 그 값을 쓰는 통계는 NaN이고, 창을 벗어나면 다시 계산됩니다.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        if window < 2:
+            raise ValueError("window는 2 이상이어야 합니다.")
+        self.window = window
+        self._x = np.zeros(window)  # 프리미엄
+        self._y = np.zeros(window)  # 환율
+        self._sorted: List[float] = []
+        self._next = 0
+        self._count = 0
+        self._missing_x = 0  # 창 안의 NaN 개수
+        self._missing_y = 0
+        self._updates = 0
+        self._sx = self._sxx = self._sy = self._syy = self._sxy = 0.0
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, window: int = DEFAULT_WINDOW
+    ) -> "IncrementalAnalytics":
+        """기존 기록으로 상태를 초기화합니다. 창 밖의 값은 최고점/낙폭에만 반영합니다."""
+        state = cls(window)
+        premium = df[PREMIUM_COL].to_numpy(dtype=float)
+        fx = pd.to_numeric(df[FX_COL], errors="coerce").to_numpy(dtype=float)
+        known = premium[np.isfinite(premium)]  # cummax/cummin처럼 NaN은 건너뜁니다.
+        if len(known):
+            state.peak = float(np.max(known))
+            state.max_drawdown = float(np.min(known - np.maximum.accumulate(known)))
+        for x, y in zip(premium[-window:], fx[-window:]):
+            state._push(float(x), float(y))
+        return state
+
+    def _add(self, x: float, y: float, sign: int) -> None:
+        """값 한 쌍을 합에 더하거나(sign=1) 뺍니다(sign=-1). NaN은 개수만 셉니다."""
+        x_ok, y_ok = math.isfinite(x), math.isfinite(y)
+        if x_ok:
+            self._sx += sign * x
+            self._sxx += sign * x * x
+            if sign > 0:
+                insort(self._sorted, x)
+            else:
+                del self._sorted[bisect_left(self._sorted, x)]
+        else:
+            self._missing_x += sign
+        if y_ok:
+            self._sy += sign * y
+            self._syy += sign * y * y
+        else:
+            self._missing_y += sign
+        if x_ok and y_ok:
+            self._sxy += sign * x * y
+
+    def _push(self, x: float, y: float) -> None:
+        if self._count == self.window:
+            self._add(float(self._x[self._next]), float(self._y[self._next]), -1)
+        else:
+            self._count += 1
+        self._x[self._next] = x
+        self._y[self._next] = y
+        self._next = (self._next + 1) % self.window
+        self._add(x, y, 1)
+        self._updates += 1
+        if self._updates % self.window == 0:
+            # 누적 합의 부동소수점 오차가 쌓이지 않도록 주기적으로 다시 합산합니다.
+            x_win, y_win = self._x[: self._count], self._y[: self._count]
+            x_ok, y_ok = np.isfinite(x_win), np.isfinite(y_win)
+            x_known, y_known = x_win[x_ok], y_win[y_ok]
+            both = x_ok & y_ok
+            self._sx, self._sxx = float(x_known.sum()), float((x_known * x_known).sum())
+            self._sy, self._syy = float(y_known.sum()), float((y_known * y_known).sum())
+            self._sxy = float((x_win[both] * y_win[both]).sum())
+
+    def update(self, premium: float, fx: float) -> Dict[str, float]:
+        """새 행 하나를 반영하고 그 시점의 통계를 반환합니다."""
+        self._push(premium, fx)
+        stats = dict.fromkeys(ANALYTICS_COLUMNS, float("nan"))
+        if math.isfinite(premium):  # cummax/cummin처럼 NaN 행은 NaN으로 두고 건너뜁니다.
+            self.peak = max(self.peak, premium)
+            drawdown = premium - self.peak
+            self.max_drawdown = min(self.max_drawdown, drawdown)
+            stats["drawdown"] = drawdown
+            stats["max_drawdown"] = self.max_drawdown
+        if self._count < self.window or self._missing_x:
+            return stats
+
+        n = self._count
+        mean = self._sx / n
+        var_x = max(self._sxx - self._sx * self._sx / n, 0.0) / (n - 1)
+        var_y = max(self._syy - self._sy * self._sy / n, 0.0) / (n - 1)
+        cov = (self._sxy - self._sx * self._sy / n) / (n - 1)
+        std = math.sqrt(var_x)
+        less = bisect_left(self._sorted, premium)
+        equal = bisect_right(self._sorted, premium) - less
+        stats["rolling_mean"] = mean
+        stats["rolling_std"] = std
+        stats["zscore"] = (premium - mean) / std if std > 0 else float("nan")
+        # pandas rank(method="average")와 같은 방식으로 동률을 처리합니다.
+        stats["pct_rank"] = (less + (equal + 1) / 2) / n
+        denominator = math.sqrt(var_x * var_y)
+        if not self._missing_y and denominator > 0:
+            stats["fx_corr"] = cov / denominator
+        return stats
+
+
+def load_analytics(
+    data_file: Optional[Path] = None, months: int = 12, window: int = DEFAULT_WINDOW
+) -> pd.DataFrame:
+    """plot.py와 같은 방식으로 최근 'months' 개월 데이터를 읽어 통계를 계산합니다."""
+    from kimchi_gold.plot import FilePaths, load_and_preprocess_data
+
+    df = load_and_preprocess_data(data_file or FilePaths.DATA_FILE, months)
+    return compute_analytics(df, window)
@@ -0,0 +1,419 @@
+import csv
+import io
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+import requests
+from kimchi_gold import metrics
+from kimchi_gold.collect_price import DATA_DIR
+from kimchi_gold.extract import DEFAULT_PRICE_REGEX, PRICE_CLASS
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.now_price import (
+    DOMESTIC_GOLD_URL,
+    INTERNATIONAL_GOLD_URL,
+    USD_KRW_URL,
+    calc_kimchi_premium,
+    parse_content,
+)
+from kimchi_gold.premium import compute_premium
+from kimchi_gold.writer import LogWriter, file_lock
+
+ARCHIVE_DIR_ENV: str = "KIMCHI_GOLD_ARCHIVE_DIR"  # 설정하면 받은 응답 원문을 보관합니다.
+ARCHIVE_DIR: Path = DATA_DIR / "archive"
+INDEX_HEADER: List[str] = ["fetched_at", "url", "offset", "length", "size", "status"]
+COMPRESS_LEVEL: int = 6
+REPLAY_CHUNK: int = 256  # 작업자 프로세스 하나에 한 번에 넘길 레코드 수
+
+_FRAME = struct.Struct(">I")  # 압축된 본문 길이
+
+
+class ArchiveRecord(NamedTuple):
+    fetched_at: float
+    url: str
+    segment: str
+    offset: int
+    length: int
+    size: int
+    status: Optional[int]
+
+
+class ResponseArchive:
+    """
+    받은 응답 원문을 압축해 덧붙이기만 하는 보관소입니다.
+
+    응답은 달마다 하나인 세그먼트 파일(responses-YYYY-MM.bin)에 [길이][zlib 본문] 프레임으로
+    붙고, 같은 이름의 .idx 파일에 받은 시각·URL·위치가 한 줄씩 쌓입니다. 레코드마다 따로
+    압축하므로 색인만 읽고 필요한 응답 하나를 바로 꺼낼 수 있습니다. 쓰기는 writer.file_lock으로
+    직렬화하므로 여러 수집기가 같은 보관소를 함께 써도 됩니다.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def segment_name(self, fetched_at: float) -> str:
+        return datetime.fromtimestamp(fetched_at).strftime("responses-%Y-%m")
+
+    def append(
+        self,
+        url: str,
+        content: bytes,
+        fetched_at: Optional[float] = None,
+        status: Optional[int] = None,
+    ) -> ArchiveRecord:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        segment = self.segment_name(fetched_at)
+        payload = zlib.compress(content, COMPRESS_LEVEL)
+        frame = _FRAME.pack(len(payload)) + payload
+        data_path = self.directory / f"{segment}.bin"
+        with file_lock(data_path) as fd:
+            offset = os.fstat(fd).st_size
+            view = memoryview(frame)
+            while view:
+                view = view[os.write(fd, view) :]
+            record = ArchiveRecord(
+                fetched_at, url, segment, offset, len(frame), len(content), status
+            )
+            line = io.StringIO()
+            csv.writer(line).writerow(
+                [repr(fetched_at), url, offset, len(frame), len(content), status or ""]
+            )
+            index_path = self.directory / f"{segment}.idx"
+            index_fd = os.open(index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(index_fd).st_size == 0:
+                    os.write(index_fd, ",".join(INDEX_HEADER).encode() + b"\r\n")
+                os.write(index_fd, line.getvalue().encode("utf-8"))
+            finally:
+                os.close(index_fd)
+        return record
+
+    def segments(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("responses-*.idx"))
+
+    def records(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        urls: Optional[Sequence[str]] = None,
+    ) -> Iterator[ArchiveRecord]:
+        """색인을 읽어 [start, end) 구간, urls에 속하는 레코드를 시간 순으로 돌려줍니다."""
+        wanted = set(urls) if urls is not None else None
+        first = self.segment_name(start) if start is not None else None
+        last = self.segment_name(end) if end is not None else None
+        for segment in self.segments():
+            if (first and segment < first) or (last and segment > last):
+                continue  # 세그먼트 이름이 달 단위라 색인을 열지 않고 건너뜁니다.
+            with open(self.directory / f"{segment}.idx", encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            found = []
+            for row in rows:
+                fetched_at = float(row["fetched_at"])
+                if start is not None and fetched_at < start:
+                    continue
+                if end is not None and fetched_at >= end:
+                    continue
+                if wanted is not None and row["url"] not in wanted:
+                    continue
+                found.append(
+                    ArchiveRecord(
+                        fetched_at,
+                        row["url"],
+                        segment,
+                        int(row["offset"]),
+                        int(row["length"]),
+                        int(row["size"]),
+                        int(row["status"]) if row["status"] else None,
+                    )
+                )
+            found.sort(key=lambda record: record.fetched_at)
+            yield from found
+
+    def read(self, record: ArchiveRecord) -> bytes:
+        with open(self.directory / f"{record.segment}.bin", "rb") as f:
+            f.seek(record.offset)
+            return _decode(f.read(record.length))
+
+
+def _decode(frame: bytes) -> bytes:
+    (length,) = _FRAME.unpack_from(frame)
+    return zlib.decompress(frame[_FRAME.size : _FRAME.size + length])
+
+
+# --- 기록 ---------------------------------------------------------------------
+
+
+class ArchiveRecorder:
+    """
+    응답 본문이 있는 FetchEvent를 보관소에 남기는 metrics 훅입니다.
+    TTL 캐시에서 꺼낸 본문은 새로 받은 응답이 아니므로 남기지 않습니다.
+    """
+
+    def __init__(self, archive: ResponseArchive) -> None:
+        self.archive = archive
+
+    def __call__(self, event: metrics.FetchEvent) -> None:
+        if event.content is None or event.cached:
+            return
+        try:
+            self.archive.append(event.url, event.content, event.started_at, event.status)
+        except OSError as e:  # 보관 실패가 수집을 멈추지 않게 합니다.
+            print(f"응답 보관 실패: {e}")
+
+
+def archive_dir_from_env() -> Path:
+    return Path(os.environ.get(ARCHIVE_DIR_ENV) or ARCHIVE_DIR)
+
+
+def install_recorder_from_env() -> Optional[ArchiveRecorder]:
+    """KIMCHI_GOLD_ARCHIVE_DIR가 설정되어 있으면 응답 원문 보관을 켭니다."""
+    directory = os.environ.get(ARCHIVE_DIR_ENV)
+    if not directory:
+        return None
+    for hook in metrics.FETCH_HOOKS:
+        if isinstance(hook, ArchiveRecorder):
+            return hook
+    recorder = ArchiveRecorder(ResponseArchive(Path(directory)))
+    metrics.add_fetch_hook(recorder)
+    return recorder
+
+
+# --- 재생 ---------------------------------------------------------------------
+
+
+def _parse_chunk(
+    directory: str,
+    segment: str,
+    spans: List[Tuple[int, int]],
+    regex: str,
+    class_name: str,
+) -> List[Optional[float]]:
+    """작업자 프로세스에서 한 세그먼트의 레코드들을 읽어 가격을 추출합니다."""
+    prices: List[Optional[float]] = []
+    with open(Path(directory) / f"{segment}.bin", "rb") as f:
+        for offset, length in spans:
+            f.seek(offset)
+            try:
+                prices.append(parse_content(_decode(f.read(length)), "", regex, class_name))
+            except (ValueError, zlib.error):
+                prices.append(None)
+    return prices
+
+
+def replay(
+    archive: ResponseArchive,
+    records: Optional[Sequence[ArchiveRecord]] = None,
+    workers: Optional[int] = None,
+    regex: str = DEFAULT_PRICE_REGEX,
+    class_name: str = PRICE_CLASS,
+) -> List[Tuple[ArchiveRecord, Optional[float]]]:
+    """
+    보관한 응답을 지금의 추출기로 다시 파싱합니다. 추출에 실패한 레코드의 가격은 None입니다.
+
+    레코드를 세그먼트별로 REPLAY_CHUNK개씩 묶어 프로세스 풀에 나눠 주므로 CPU 코어 수만큼
+    빨라집니다. 페이지 구조가 바뀌었다면 class_name·regex를 바꿔 옛 응답을 다시 읽습니다.
+    workers가 1이면 현재 프로세스에서 처리합니다.
+    """
+    records = list(archive.records()) if records is None else list(records)
+    chunks: List[List[ArchiveRecord]] = []
+    by_segment: Dict[str, List[ArchiveRecord]] = defaultdict(list)
+    for record in records:
+        by_segment[record.segment].append(record)
+    for segment_records in by_segment.values():
+        segment_records.sort(key=lambda record: record.offset)  # 파일을 앞에서부터 읽습니다.
+        for i in range(0, len(segment_records), REPLAY_CHUNK):
+            chunks.append(segment_records[i : i + REPLAY_CHUNK])
+
+    def arguments(chunk: List[ArchiveRecord]):
+        spans = [(record.offset, record.length) for record in chunk]
+        return str(archive.directory), chunk[0].segment, spans, regex, class_name
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_parse_chunk(*arguments(chunk)) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_parse_chunk, *arguments(chunk)) for chunk in chunks]
+            results = [future.result() for future in futures]
+    parsed = [
+        (record, price)
+        for chunk, prices in zip(chunks, results)
+        for record, price in zip(chunk, prices)
+    ]
+    parsed.sort(key=lambda item: item[0].fetched_at)
+    return parsed
+
+
+def rebuild_rows(parsed: Sequence[Tuple[ArchiveRecord, Optional[float]]]) -> List[List[str]]:
+    """
+    재파싱 결과를 가격 로그 행으로 묶습니다. collect_data처럼 하루 한 행이며, 날짜마다
+    세 시세 각각의 그날 첫 성공 값을 씁니다. 세 시세가 모두 있는 날만 행을 만듭니다.
+    """
+    quote_urls = {
+        metrics.instrument_name(url): position
+        for position, url in enumerate((DOMESTIC_GOLD_URL, INTERNATIONAL_GOLD_URL, USD_KRW_URL))
+    }
+    days: Dict[str, List[Optional[float]]] = {}
+    for record, price in parsed:
+        position = quote_urls.get(metrics.instrument_name(record.url))
+        if position is None or price is None:
+            continue
+        day = datetime.fromtimestamp(record.fetched_at).strftime("%Y-%m-%d")
+        quotes = days.setdefault(day, [None, None, None])
+        if quotes[position] is None:
+            quotes[position] = price
+    rows = []
+    for day in sorted(days):
+        domestic, international, usdkrw = days[day]
+        if domestic is None or international is None or usdkrw is None:
+            continue
+        _, _, difference, percent = compute_premium(domestic, international, usdkrw)
+        rows.append(
+            [
+                day,
+                f"{domestic:.2f}",
+                f"{international:.2f}",
+                f"{usdkrw:.2f}",
+                f"{difference:.2f}",
+                f"{percent:.2f}",
+            ]
+        )
+    return rows
+
+
+def rebuild_log(
+    archive: ResponseArchive,
+    output: Path,
+    workers: Optional[int] = None,
+    regex: str = DEFAULT_PRICE_REGEX,
+    class_name: str = PRICE_CLASS,
+) -> int:
+    """
+    보관소 전체를 다시 파싱해 output에 새 가격 로그를 씁니다. 쓴 행 수를 반환합니다.
+
+    Raises:
+        FileExistsError: output이 이미 있을 경우 발생합니다 (기존 로그를 덮어쓰지 않습니다).
+    """
+    if output.exists():
+        raise FileExistsError(f"Error: {output} already exists.")
+    rows = rebuild_rows(replay(archive, workers=workers, regex=regex, class_name=class_name))
+    with LogWriter(output, header=LOG_HEADER, max_rows=len(rows) or 1) as writer:
+        writer.write_rows(rows)
+    return len(rows)
+
+
+# --- 재생 서버 ----------------------------------------------------------------
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "ReplayServer"
+
+    def do_GET(self):
+        body = self.server.next_body(urlsplit(self.path).path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    보관한 응답을 원래 URL 경로로 되돌려 주는 로컬 HTTP 서버입니다.
+
+    경로마다 보관된 응답을 시간 순서대로 돌아가며 보내므로, fetch_quotes(base_url=server.url)
+    처럼 수집기를 붙이면 네트워크 없이 실제 페이지로 높은 요청률의 부하 시험을 할 수 있습니다.
+    본문은 시작할 때 모두 풀어 메모리에 올려 두고, 연결은 keep-alive로 재사용합니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        archive: ResponseArchive,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        records: Optional[Sequence[ArchiveRecord]] = None,
+    ) -> None:
+        bodies: Dict[str, List[bytes]] = defaultdict(list)
+        for record in archive.records() if records is None else records:
+            bodies[urlsplit(record.url).path].append(archive.read(record))
+        self._bodies = {path: cycle(items) for path, items in bodies.items()}
+        self._lock = threading.Lock()
+        super().__init__((host, port), _ReplayHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def paths(self) -> List[str]:
+        return sorted(self._bodies)
+
+    def next_body(self, path: str) -> Optional[bytes]:
+        bodies = self._bodies.get(path)
+        if bodies is None:
+            return None
+        with self._lock:
+            return next(bodies)
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 요청을 받기 시작합니다. 멈추려면 shutdown()을 부릅니다."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def load_test(base_url: str, snapshots: int = 1000, concurrency: int = 16) -> Dict[str, float]:
+    """
+    base_url(보통 ReplayServer.url)을 상류로 삼아 calc_kimchi_premium을 snapshots번,
+    concurrency개씩 동시에 부르고 처리량과 스냅샷 지연 분위수를 반환합니다.
+    """
+    session = requests.Session()
+    adapter = metrics.TimedHTTPAdapter(pool_connections=1, pool_maxsize=3 * concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def one(_: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            calc_kimchi_premium(session=session, base_url=base_url)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one, range(snapshots)))
+    elapsed = time.perf_counter() - start
+    ok = sorted(latency for latency in latencies if latency is not None)
+
+    def quantile(q: float) -> float:
+        return ok[min(len(ok) - 1, int(q * len(ok)))] if ok else float("nan")
+
+    return {
+        "snapshots": float(snapshots),
+        "errors": float(snapshots - len(ok)),
+        "seconds": elapsed,
+        "snapshots_per_second": snapshots / elapsed if elapsed else float("inf"),
+        "p50": quantile(0.5),
+        "p99": quantile(0.99),
+    }
@@ -0,0 +1,379 @@
+"""
+김치 프리미엄 되돌림 규칙을 가격 로그 전체에 대해 시험하는 벡터화 백테스터입니다.
+
+규칙은 국내 금과 국제 금(원화 환산)을 같은 금액만큼 반대로 잡는 스프레드 거래입니다.
+
+    프리미엄 >= entry   국내 금이 비싸므로 국내 매도·국제 매수 (포지션 -1)
+    프리미엄 <= exit    위 포지션 청산
+    프리미엄 <= -entry  국내 금이 싸므로 국내 매수·국제 매도 (포지션 +1)
+    프리미엄 >= -exit   위 포지션 청산
+
+각 시점의 종가로 신호를 보고 그 가격에 거래하며, 수익은 다음 시점부터 붙습니다.
+포지션 한 단위를 바꿀 때마다 두 다리의 수수료(fee, 한 쪽당 %)와 국제 쪽 환전
+스프레드(fx_spread, %)를 냅니다. 마지막 시점에는 열린 포지션을 청산합니다.
+
+시계열 전체를 훑는 연산은 문턱값 하나마다 '조건이 막 참이 된 시점'을 찾는 것뿐이고,
+같은 문턱값을 쓰는 (entry, exit) 쌍들은 그 결과를 함께 씁니다. 그 뒤로는 보유 구간
+(진입~청산) 목록과 미리 계산한 누적 합으로 수익률·샤프 비율을 구하므로, 쌍과 수수료
+조합마다의 비용은 거래 수에만 비례합니다. sweep은 (entry, exit) 쌍을
+프로세스 풀에 나눠 주고, 시계열은 공유 메모리에 한 번만 올려 작업자마다 복사(pickle)하지
+않습니다.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.premium import compute_premium
+
+PRICE_COLUMNS: List[str] = LOG_HEADER[1:4]  # 국내금, 국제금, 환율
+SECONDS_PER_YEAR: float = 365.25 * 86400
+SWEEP_TASKS_PER_WORKER: int = 4  # 작업자마다 나눠 줄 작업 수 (느린 작업에 몰리지 않도록)
+
+
+class Params(NamedTuple):
+    entry: float  # 진입 프리미엄 (%), 0보다 큼
+    exit: float  # 청산 프리미엄 (%), -entry < exit < entry
+    fee: float = 0.0  # 한 쪽 다리 거래 수수료 (%)
+    fx_spread: float = 0.0  # 국제 쪽 환전 스프레드 (%)
+
+    @property
+    def cost(self) -> float:
+        """포지션 한 단위를 바꿀 때의 비용 (로그 수익률 단위)."""
+        return _cost(self.fee, self.fx_spread)
+
+
+class Result(NamedTuple):
+    entry: float
+    exit: float
+    fee: float
+    fx_spread: float
+    total_return: float  # 누적 수익률 (%)
+    trades: int  # 진입 횟수
+    exposure: float  # 포지션을 들고 있던 시점 비율
+    max_drawdown: float  # 진입·청산 직후에 평가한 자산 기준 최대 낙폭 (%, 0 이하)
+    sharpe: float  # 시점별 순수익으로 구한 연율화 샤프 비율 (무위험 수익률 0)
+
+
+RESULT_COLUMNS: List[str] = list(Result._fields)
+
+
+class History(NamedTuple):
+    """백테스트 입력. 가격이 빠진 행은 뺀, 시간순 배열들입니다."""
+
+    index: pd.DatetimeIndex
+    premium: np.ndarray  # 김치 프리미엄 (%)
+    log_ratio: np.ndarray  # log(국내 / 국제 원화 환산) = log1p(premium / 100)
+    cum_sq: np.ndarray  # cum_sq[i] = 구간 0..i-1의 로그 비율 변화 제곱 합 (분산 계산용)
+    steps_per_year: float  # 샤프 비율 연율화에 쓰는 1년당 시점 수
+
+
+class _Holds(NamedTuple):
+    """시간순 보유 구간. starts[k] 종가에 진입해 ends[k] 종가에 청산합니다."""
+
+    starts: np.ndarray
+    ends: np.ndarray
+    sides: np.ndarray  # +1 (국내 매수) / -1 (국내 매도)
+
+
+def _cost(fee: float, fx_spread: float) -> float:
+    return (2 * fee + fx_spread) / 100
+
+
+def _percent(log_return: float) -> float:
+    """로그 수익률을 % 수익률로. 너무 크면 OverflowError 대신 inf를 돌려줍니다."""
+    return math.expm1(log_return) * 100 if log_return < 700 else math.inf
+
+
+def prepare(df: pd.DataFrame) -> History:
+    """
+    load_log 형식의 데이터프레임에서 백테스트 입력을 만듭니다.
+    로그의 김치프리미엄(%) 열은 소수 둘째 자리로 반올림되어 있으므로 가격 열로 다시 계산합니다.
+    """
+    premium = compute_premium(
+        df[PRICE_COLUMNS[0]].to_numpy(np.float64),
+        df[PRICE_COLUMNS[1]].to_numpy(np.float64),
+        df[PRICE_COLUMNS[2]].to_numpy(np.float64),
+    ).percent
+    valid = np.isfinite(premium)
+    index = df.index[valid]
+    premium = np.ascontiguousarray(premium[valid])
+    if len(premium) < 2:
+        raise ValueError("백테스트에는 가격이 있는 행이 2개 이상 필요합니다.")
+    log_ratio = np.log1p(premium / 100)
+    cum_sq = np.zeros(len(premium))
+    np.cumsum(np.square(np.diff(log_ratio)), out=cum_sq[1:])
+    span = (index[-1] - index[0]).total_seconds()
+    steps_per_year = (len(premium) - 1) / (span / SECONDS_PER_YEAR) if span > 0 else 1.0
+    return History(index, premium, log_ratio, cum_sq, steps_per_year)
+
+
+def load_history(data_file: Path) -> History:
+    from kimchi_gold.loader import load_log
+
+    return prepare(load_log(data_file, columns=PRICE_COLUMNS))
+
+
+def _validate(entry: float, exit: float) -> None:
+    if not entry > 0:
+        raise ValueError(f"entry는 0보다 커야 합니다: {entry}")
+    if not -entry < exit < entry:
+        raise ValueError(f"exit는 -entry와 entry 사이여야 합니다: entry={entry}, exit={exit}")
+
+
+class _Edges:
+    """
+    문턱값별로 '프리미엄 >= 문턱값'(또는 <=)이 막 참이 된 시점들을 기억합니다.
+    조건이 이어지는 동안의 나머지 시점은 진입·청산을 바꾸지 못하므로 이것만 있으면 됩니다.
+    """
+
+    def __init__(self, premium: np.ndarray) -> None:
+        self.premium = premium
+        self._cache: Dict[Tuple[float, bool], np.ndarray] = {}
+
+    def get(self, threshold: float, above: bool) -> np.ndarray:
+        key = (threshold, above)
+        edges = self._cache.get(key)
+        if edges is None:
+            mask = self.premium >= threshold if above else self.premium <= threshold
+            rises = np.diff(mask.view(np.int8), prepend=np.int8(0))
+            edges = self._cache[key] = np.flatnonzero(rises == 1)
+        return edges
+
+
+def _latch(on: np.ndarray, off: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    on 시점에 열고 off 시점에 닫는 상태의 (여는 시점, 닫는 시점) 배열. 두 조건은 동시에
+    참일 수 없으므로 시점을 합쳐 정렬한 뒤 상태가 바뀌는 곳만 골라냅니다.
+    마지막에 열려 있으면 닫는 시점이 하나 적습니다.
+    """
+    times = np.concatenate([on, off])
+    order = np.argsort(times, kind="stable")
+    state = (order < len(on)).view(np.int8)
+    changes = np.flatnonzero(np.diff(state, prepend=np.int8(0)))
+    # 처음 상태는 닫힘이므로 바뀌는 곳은 열기, 닫기가 번갈아 나옵니다.
+    times = times[order[changes]]
+    return times[0::2], times[1::2]
+
+
+def _holds(
+    premium: np.ndarray, entry: float, exit: float, edges: Optional[_Edges] = None
+) -> _Holds:
+    """
+    두 방향의 보유 구간을 시간순으로 합칩니다. -entry < exit이므로 매도 쪽이 열려 있을 때
+    매수 진입 조건(<= -entry)이 오면 같은 종가에 매도 청산 조건(<= exit)도 만족해,
+    두 쪽이 동시에 열리지 않습니다. 마지막 종가에 새로 여는 구간은 버립니다.
+    """
+    _validate(entry, exit)
+    if edges is None:
+        edges = _Edges(premium)
+    last = len(premium) - 1
+    legs = []
+    for side, on, off in (
+        (-1, edges.get(entry, True), edges.get(exit, False)),
+        (1, edges.get(-entry, False), edges.get(-exit, True)),
+    ):
+        starts, ends = _latch(on, off)
+        if len(ends) < len(starts):
+            ends = np.append(ends, last)  # 끝까지 열려 있으면 마지막 종가에 청산합니다.
+        keep = starts < last
+        legs.append((starts[keep], ends[keep], np.full(np.count_nonzero(keep), side, np.int8)))
+    starts, ends, sides = (np.concatenate(parts) for parts in zip(*legs))
+    order = np.argsort(starts, kind="stable")
+    return _Holds(starts[order], ends[order], sides[order])
+
+
+def positions(premium: np.ndarray, entry: float, exit: float) -> np.ndarray:
+    """각 시점 종가 뒤의 포지션 (-1, 0, +1). 마지막 시점은 청산해서 0입니다."""
+    holds = _holds(premium, entry, exit)
+    delta = np.zeros(len(premium) + 1, dtype=np.int8)
+    np.add.at(delta, holds.starts, holds.sides)
+    np.add.at(delta, holds.ends, -holds.sides)
+    return np.cumsum(delta[:-1], dtype=np.int8)
+
+
+def _evaluate(
+    history: History,
+    entry: float,
+    exit: float,
+    costs: Sequence[Tuple[float, float]],
+    edges: Optional[_Edges] = None,
+) -> List[Result]:
+    """(entry, exit) 하나의 보유 구간으로 수수료 조합마다 성과를 계산합니다."""
+    starts, ends, sides = _holds(history.premium, entry, exit, edges)
+    log_ratio = history.log_ratio
+    n = len(log_ratio)
+    steps = n - 1  # 구간 i는 시점 i -> i+1
+    trades = len(starts)
+    exposure = float(np.sum(ends - starts)) / n
+    gross = sides * (log_ratio[ends] - log_ratio[starts])
+    cum_gross = np.cumsum(gross)
+    sum_g = float(cum_gross[-1]) if trades else 0.0
+    sum_gg = float(np.sum(history.cum_sq[ends] - history.cum_sq[starts]))
+
+    # 거래 비용은 거래한 종가의 구간에 붙습니다 (마지막 종가의 청산은 마지막 구간).
+    # 분산의 교차항에는 거래가 있는 구간의 수익만 필요합니다. 진입 구간에서는 그 방향을,
+    # 청산 구간에서는 같은 종가에 반대 방향으로 다시 들어갔으면 그 방향을, 아니면 0을
+    # (마지막 종가의 강제 청산이면 청산 전 방향을) 들고 있습니다.
+    exit_steps = np.minimum(ends, steps - 1)
+    reentered = np.zeros(trades, dtype=bool)
+    reentered[:-1] = starts[1:] == ends[:-1]
+    exit_sides = np.where(reentered, np.append(sides[1:], 0), 0)
+    exit_sides = np.where(ends == steps, sides, exit_sides)
+    entry_change = log_ratio[starts + 1] - log_ratio[starts]
+    exit_change = log_ratio[exit_steps + 1] - log_ratio[exit_steps]
+    sum_gt = float(np.dot(sides, entry_change) + np.dot(exit_sides, exit_change))
+    # 진입·청산 구간을 번갈아 늘어놓으면 이미 정렬되어 있으므로, 같은 구간이 이어지는
+    # 길이가 그 구간의 거래량입니다 (청산과 재진입이 겹치면 2, 마지막 구간은 3까지).
+    trade_steps = np.empty(2 * trades, dtype=np.int64)
+    trade_steps[0::2] = starts
+    trade_steps[1::2] = exit_steps
+    bounds = np.flatnonzero(np.diff(trade_steps)) + 1
+    counts = np.diff(np.concatenate([[0], bounds, [2 * trades]]))
+    sum_t = float(2 * trades)
+    sum_tt = float(np.dot(counts, counts))
+
+    # 진입 직후와 청산 직후 자산의 (비용 전 누적 수익, 누적 거래량). 0번은 시작 시점입니다.
+    marks_gross = np.zeros(2 * trades + 1)
+    marks_gross[2::2] = cum_gross
+    marks_gross[1::2] = marks_gross[0:-1:2]
+    marks_turnover = np.arange(2 * trades + 1, dtype=np.float64)
+
+    annualize = math.sqrt(history.steps_per_year)
+    results = []
+    for fee, fx_spread in costs:
+        c = _cost(fee, fx_spread)
+        # 순수익 = gross - c * 거래량 이므로 합과 제곱합을 전개해 시점별 배열을 만들지 않습니다.
+        total = sum_g - c * sum_t
+        mean = total / steps
+        square = sum_gg - 2 * c * sum_gt + c * c * sum_tt
+        variance = (square - steps * mean * mean) / (steps - 1) if steps > 1 else 0.0
+        std = math.sqrt(variance) if variance > 1e-24 else 0.0
+        sharpe = mean / std * annualize if std > 0 else math.nan
+        equity = marks_gross - c * marks_turnover
+        drawdown = float(np.min(equity - np.maximum.accumulate(equity)))
+        results.append(
+            Result(
+                entry,
+                exit,
+                fee,
+                fx_spread,
+                _percent(total),
+                trades,
+                exposure,
+                _percent(drawdown),
+                sharpe,
+            )
+        )
+    return results
+
+
+def simulate(history: History, params: Params) -> Result:
+    """파라미터 한 조합의 성과."""
+    return _evaluate(history, params.entry, params.exit, [(params.fee, params.fx_spread)])[0]
+
+
+def equity_curve(history: History, params: Params) -> pd.DataFrame:
+    """
+    시점별 포지션과 누적 수익률(%). 규칙 하나를 자세히 볼 때 씁니다.
+    보유 중의 평가 손익까지 시점마다 담으며, 마지막 값은 simulate의 total_return과 같습니다.
+    """
+    pos = positions(history.premium, params.entry, params.exit)
+    turnover = np.abs(np.diff(pos, prepend=np.int8(0))).astype(np.float64)
+    turnover[-2] += turnover[-1]  # 마지막 종가의 청산 비용은 마지막 구간에 매깁니다.
+    net = pos[:-1] * np.diff(history.log_ratio) - params.cost * turnover[:-1]
+    equity = np.zeros(len(pos))
+    np.cumsum(net, out=equity[1:])
+    return pd.DataFrame(
+        {"premium": history.premium, "position": pos, "equity": np.expm1(equity) * 100},
+        index=history.index,
+    )
+
+
+# --- 파라미터 탐색 -------------------------------------------------------------
+
+_shared: Optional[Tuple[shared_memory.SharedMemory, History]] = None
+
+
+def _attach(name: str, length: int, steps_per_year: float) -> None:
+    """작업자 초기화: 부모가 올린 공유 메모리를 복사 없이 배열로 봅니다."""
+    global _shared
+    shm = shared_memory.SharedMemory(name=name)
+    premium, log_ratio, cum_sq = np.ndarray((3, length), dtype=np.float64, buffer=shm.buf)
+    # 공유 메모리가 닫히지 않도록 shm도 함께 붙잡아 둡니다.
+    history = History(pd.DatetimeIndex([]), premium, log_ratio, cum_sq, steps_per_year)
+    _shared = (shm, history)
+
+
+def _evaluate_pairs(
+    history: History,
+    pairs: Sequence[Tuple[float, float]],
+    costs: Sequence[Tuple[float, float]],
+) -> List[Result]:
+    edges = _Edges(history.premium)  # 같은 문턱값을 쓰는 쌍끼리 시계열 훑기를 나눠 씁니다.
+    return [r for entry, exit in pairs for r in _evaluate(history, entry, exit, costs, edges)]
+
+
+def _evaluate_chunk(
+    pairs: Sequence[Tuple[float, float]], costs: Sequence[Tuple[float, float]]
+) -> List[Result]:
+    assert _shared is not None, "_attach로 초기화되지 않은 작업자입니다."
+    return _evaluate_pairs(_shared[1], pairs, costs)
+
+
+def grid(
+    entries: Iterable[float], exits: Iterable[float]
+) -> List[Tuple[float, float]]:
+    """-entry < exit < entry를 만족하는 (entry, exit) 쌍만 골라냅니다."""
+    exits = list(exits)
+    return [(e, x) for e in entries if e > 0 for x in exits if -e < x < e]
+
+
+def sweep(
+    history: History,
+    entries: Iterable[float],
+    exits: Iterable[float],
+    fees: Iterable[float] = (0.0,),
+    fx_spreads: Iterable[float] = (0.0,),
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    entries × exits × fees × fx_spreads 격자 전체의 성과를 RESULT_COLUMNS 데이터프레임으로
+    반환합니다. 행 순서는 격자 순서이며 workers와 무관합니다.
+
+    workers가 1이면 현재 프로세스에서 계산합니다. 그 외에는 시계열 세 개를 공유 메모리
+    한 블록에 올리고, 작업자는 초기화 때 그 블록을 붙잡아 배열로 봅니다. 작업에는
+    (entry, exit) 쌍 목록만 실어 보내므로 시계열 길이와 무관하게 가볍습니다.
+    """
+    pairs = grid(entries, exits)
+    costs = [(fee, spread) for fee in fees for spread in fx_spreads]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pairs)))
+    if workers == 1:
+        return pd.DataFrame(_evaluate_pairs(history, pairs, costs), columns=RESULT_COLUMNS)
+
+    length = len(history.premium)
+    shm = shared_memory.SharedMemory(create=True, size=3 * length * 8)
+    try:
+        arrays = np.ndarray((3, length), dtype=np.float64, buffer=shm.buf)
+        arrays[:] = (history.premium, history.log_ratio, history.cum_sq)
+        del arrays  # 닫기 전에 버퍼를 가리키는 배열을 없애야 합니다.
+        size = max(1, math.ceil(len(pairs) / (workers * SWEEP_TASKS_PER_WORKER)))
+        chunks = [pairs[i : i + size] for i in range(0, len(pairs), size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(shm.name, length, history.steps_per_year),
+        ) as executor:
+            futures = [executor.submit(_evaluate_chunk, chunk, costs) for chunk in chunks]
+            results = [r for future in futures for r in future.result()]
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
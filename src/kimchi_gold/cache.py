@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from kimchi_gold import metrics
+from kimchi_gold.policy import UpstreamError
+
+CACHE_TTL_ENV: str = "KIMCHI_GOLD_CACHE_TTL"  # 초 단위 TTL. 설정하면 기본 캐시가 켜집니다.
+CACHE_PATH_ENV: str = "KIMCHI_GOLD_CACHE_PATH"
+DEFAULT_CACHE_PATH: Path = Path.home() / ".cache" / "kimchi_gold" / "responses.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+class ResponseCache:
+    """
+    URL을 키로 하는 디스크 응답 캐시입니다.
+
+    - TTL 안의 요청은 네트워크 없이 저장된 본문을 돌려줍니다.
+    - TTL이 지나면 ETag/Last-Modified로 조건부 요청을 보내고, 304면 본문을 재사용합니다.
+    - 항목 수가 max_entries를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다(LRU).
+
+    저장소는 WAL 모드의 SQLite 파일이라 같은 호스트의 여러 프로세스가
+    (예: 크론의 collect_price.py와 대화형 now_price.py) 하나의 캐시를 안전하게 공유합니다.
+    """
+
+    def __init__(self, path: Path, ttl: float = 60.0, max_entries: int = 256) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간에 공유할 수 없으므로 스레드마다 하나씩 엽니다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """저장된 항목을 반환합니다. TTL은 확인하지 않습니다."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return {
+            "body": bytes(body),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+        }
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE url IN ("
+                "SELECT url FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def _touch(self, url: str, revalidated: bool) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            if revalidated:
+                conn.execute(
+                    "UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?",
+                    (now, now, url),
+                )
+            else:
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE url = ?", (now, url)
+                )
+
+    def fetch(
+        self,
+        url: str,
+        http: Any,
+        headers: Dict[str, str],
+        timeout: Optional[Any] = None,
+    ) -> bytes:
+        """
+        캐시를 거쳐 url의 본문을 가져옵니다.
+
+        Args:
+            url (str): 요청할 주소.
+            http: get(url, headers=...)를 제공하는 객체 (requests 모듈 또는 Session).
+            headers (Dict[str, str]): 기본 요청 헤더.
+            timeout: 주면 http.get에 그대로 넘깁니다.
+
+        Returns:
+            bytes: 응답 본문. 200이 아닌 응답은 저장하지 않고 그대로 돌려줍니다.
+
+        Raises:
+            UpstreamError: 5xx 응답. 캐시 없이 요청할 때처럼 재시도와 회로 차단기 집계 대상입니다.
+        """
+        entry = self.get(url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self._touch(url, revalidated=False)
+            event = metrics.current_event()
+            if event is not None:
+                event.cached = True
+            return entry["body"]
+
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        response = http.get(url, headers=request_headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self._touch(url, revalidated=True)
+            return entry["body"]
+        if response.status_code >= 500:
+            raise UpstreamError(f"{url}: HTTP {response.status_code}", response=response)
+        if response.status_code == 200:
+            self.put(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response.content
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_env_cache: Optional[ResponseCache] = None
+_env_cache_lock = threading.Lock()
+
+
+def cache_from_env() -> Optional[ResponseCache]:
+    """
+    KIMCHI_GOLD_CACHE_TTL 환경 변수가 설정되어 있으면 프로세스 공용 캐시를 반환합니다.
+    설정되어 있지 않으면 None을 반환해 캐시 없이 동작합니다.
+    """
+    global _env_cache
+    ttl = os.environ.get(CACHE_TTL_ENV)
+    if not ttl:
+        return None
+    with _env_cache_lock:
+        if _env_cache is None:
+            path = Path(os.environ.get(CACHE_PATH_ENV, DEFAULT_CACHE_PATH))
+            _env_cache = ResponseCache(path, ttl=float(ttl))
+        return _env_cache
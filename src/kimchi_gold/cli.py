@@ -0,0 +1,430 @@
+"""
+kimchi-gold 명령행 도구입니다.
+
+    kimchi-gold now [--json]        현재 김치 프리미엄 출력
+    kimchi-gold collect             오늘 시세를 로그에 기록
+    kimchi-gold plot [--windows ..] 기간별 그래프 생성
+    kimchi-gold intraday            장중 상주 수집기 실행
+    kimchi-gold backfill            ECOS 환율 기록 내려받기
+    kimchi-gold join                ECOS 환율 기준 김치 프리미엄 계산
+    kimchi-gold snapshot            여러 종목(은, 백금, 엔·위안 환율 등) 동시 수집
+    kimchi-gold serve               최신 시세를 메모리에 두고 HTTP로 제공
+    kimchi-gold archive             보관한 응답 원문으로 로그 재생성·재생 서버·부하 시험
+    kimchi-gold rollup              주/월 집계 출력 또는 다시 만들기
+    kimchi-gold backtest            김치 프리미엄 되돌림 규칙 백테스트·파라미터 탐색
+
+셸 스크립트나 모니터링에서 자주 부르는 'now'가 빨리 뜨도록, pandas·matplotlib·bs4 같은
+무거운 모듈은 이 파일의 최상단에서 불러오지 않고 각 하위 명령 안에서 필요할 때만 불러옵니다.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional, Sequence
+from kimchi_gold import profiling
+
+
+def _cmd_now(args: argparse.Namespace) -> int:
+    with profiling.span("import"):
+        from kimchi_gold.now_price import (
+            RESULT_FIELDS,
+            calc_kimchi_premium,
+            format_premium,
+        )
+
+    result = calc_kimchi_premium()
+    if args.json:
+        print(json.dumps(dict(zip(RESULT_FIELDS, result))))
+    else:
+        print(format_premium(result))
+    return 0
+
+
+def _cmd_collect(args: argparse.Namespace) -> int:
+    with profiling.span("import"):
+        from kimchi_gold.collect_price import collect_data
+
+    collect_data()
+    return 0
+
+
+def _parse_window(value: str) -> Optional[int]:
+    if value == "all":
+        return None
+    months = int(value)
+    if months <= 0:
+        raise argparse.ArgumentTypeError("기간은 1 이상의 개월 수 또는 'all'이어야 합니다.")
+    return months
+
+
+def _cmd_plot(args: argparse.Namespace) -> int:
+    with profiling.span("import"):
+        from kimchi_gold.plot import Config, FilePaths, render_windows, status_label
+
+    windows = args.windows if args.windows else list(Config.WINDOWS)
+    try:
+        results = render_windows(windows, force=args.force)
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        return 1
+    for filename, rendered in results.items():
+        print(f"{FilePaths.DATA_DIR / filename}: {status_label(rendered)}")
+    return 0
+
+
+def _cmd_intraday(args: argparse.Namespace) -> int:
+    from kimchi_gold.alerts import engine_from_env
+    from kimchi_gold.intraday import IntradayCollector, MarketHours
+
+    engine = engine_from_env()
+    collector = IntradayCollector(
+        interval=args.interval,
+        market_hours=None if args.always else MarketHours(),
+        alerts=engine,
+    )
+    try:
+        collector.run()
+    except KeyboardInterrupt:
+        collector.stop()
+    finally:
+        if engine is not None:
+            engine.close()
+    return 0
+
+
+def _cmd_backfill(args: argparse.Namespace) -> int:
+    import os
+    from pathlib import Path
+    from kimchi_gold.ecos import ECOS_FILE, EcosClient, backfill, parse_date
+    from kimchi_gold.ratelimit import RateLimiter
+
+    api_key = args.api_key or os.environ.get("ECOS_API_KEY")
+    if not api_key:
+        print("ECOS API 키가 필요합니다. --api-key 또는 ECOS_API_KEY를 설정하세요.")
+        return 1
+    client = EcosClient(api_key, rate_limiter=RateLimiter(rate=args.rate))
+    added = backfill(
+        client,
+        parse_date(args.begin),
+        parse_date(args.end),
+        output_file=Path(args.output) if args.output else ECOS_FILE,
+        chunk_days=args.chunk_days,
+        workers=args.workers,
+    )
+    print(f"백필 완료: {added}일 추가")
+    return 0
+
+
+def _cmd_join(args: argparse.Namespace) -> int:
+    from pathlib import Path
+    import pandas as pd
+    from kimchi_gold.collect_price import DATA_FILE
+    from kimchi_gold.ecos import ECOS_FILE
+    from kimchi_gold.join import join_ecos
+
+    ecos_file = Path(args.ecos) if args.ecos else ECOS_FILE
+    try:
+        result = join_ecos(
+            DATA_FILE, ecos_file, tolerance=pd.Timedelta(days=args.tolerance_days)
+        )
+    except FileNotFoundError as e:
+        print(e)
+        if not ecos_file.exists():
+            print("ECOS 환율 파일이 없습니다. --ecos로 지정하거나 kimchi-gold backfill로 받으세요.")
+        return 1
+    if args.output:
+        result.to_csv(args.output, float_format="%.2f")
+        print(f"저장 완료: {args.output}")
+    else:
+        print(result.tail(args.tail).to_string())
+    return 0
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> int:
+    from pathlib import Path
+    from kimchi_gold.instruments import (
+        INSTRUMENTS,
+        INSTRUMENTS_FILE,
+        collect_instruments,
+    )
+
+    if args.list:
+        for instrument in INSTRUMENTS.values():
+            unit = f"{instrument.currency}/{instrument.unit}"
+            print(f"{instrument.name:<10} {unit:<8} {instrument.url}")
+        return 0
+    try:
+        rows, errors = collect_instruments(
+            args.instruments, Path(args.output) if args.output else INSTRUMENTS_FILE
+        )
+    except KeyError as e:
+        print(e.args[0])
+        return 1
+    for row in rows:
+        print(", ".join(row))
+    for name, error in errors.items():
+        print(f"수집 실패: {name}: {error}")
+    return 1 if errors else 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from kimchi_gold.server import serve
+
+    serve(args.host, args.port, args.interval)
+    return 0
+
+
+def _cmd_archive(args: argparse.Namespace) -> int:
+    from pathlib import Path
+    from kimchi_gold.archive import (
+        ReplayServer,
+        ResponseArchive,
+        archive_dir_from_env,
+        load_test,
+        rebuild_log,
+    )
+
+    archive = ResponseArchive(Path(args.dir) if args.dir else archive_dir_from_env())
+    if args.action == "rebuild":
+        kwargs = {"class_name": args.class_name} if args.class_name else {}
+        try:
+            count = rebuild_log(
+                archive, Path(args.output), workers=args.workers, **kwargs
+            )
+        except FileExistsError as e:
+            print(e)
+            return 1
+        print(f"{args.output}: {count}행 재생성")
+        return 0
+    server = ReplayServer(archive, port=args.port)
+    if not server.paths:
+        print(f"{archive.directory}에 보관된 응답이 없습니다.")
+        return 1
+    if args.action == "serve":
+        print(f"{server.url} 에서 보관한 응답을 재생합니다: {', '.join(server.paths)}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    server.start()
+    try:
+        result = load_test(server.url, args.snapshots, args.concurrency)
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(json.dumps(result))
+    return 0
+
+
+def _cmd_rollup(args: argparse.Namespace) -> int:
+    from kimchi_gold.collect_price import DATA_FILE
+    from kimchi_gold.rollup import load_rollup, rebuild_rollups
+
+    try:
+        if args.rebuild:
+            for period, count in rebuild_rollups(DATA_FILE).items():
+                print(f"{period}: {count}개 구간")
+            return 0
+        table = load_rollup(args.period, DATA_FILE)
+    except FileNotFoundError as e:
+        print(e)
+        return 1
+    print(table.tail(args.tail).to_string())
+    return 0
+
+
+def _parse_values(value: str) -> List[float]:
+    """'1.5' 같은 값 하나 또는 'start:stop:step' 범위 (stop 포함)."""
+    try:
+        parts = [float(part) for part in value.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"숫자 또는 start:stop:step이어야 합니다: {value}")
+    if len(parts) == 1:
+        return parts
+    if len(parts) != 3 or parts[2] <= 0 or parts[1] < parts[0]:
+        raise argparse.ArgumentTypeError(f"start <= stop, step > 0인 범위여야 합니다: {value}")
+    start, stop, step = parts
+    count = int(round((stop - start) / step, 9)) + 1
+    # 부동소수 누적 오차 없이 0.1 간격 같은 값을 그대로 보이도록 반올림합니다.
+    return [round(start + i * step, 10) for i in range(count)]
+
+
+def _flatten(groups: Optional[List[List[float]]], default: float) -> List[float]:
+    return [value for group in groups for value in group] if groups else [default]
+
+
+def _cmd_backtest(args: argparse.Namespace) -> int:
+    from kimchi_gold.backtest import Params, load_history, simulate, sweep
+    from kimchi_gold.collect_price import DATA_FILE
+
+    try:
+        history = load_history(DATA_FILE)
+        if not (args.entries or args.exits or args.fees or args.fx_spreads):
+            result = simulate(history, Params(args.entry, args.exit, args.fee, args.fx_spread))
+            for field, value in result._asdict().items():
+                print(f"{field:<13} {value}")
+            return 0
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        return 1
+    table = sweep(
+        history,
+        _flatten(args.entries, args.entry),
+        _flatten(args.exits, args.exit),
+        fees=_flatten(args.fees, args.fee),
+        fx_spreads=_flatten(args.fx_spreads, args.fx_spread),
+        workers=args.workers,
+    )
+    if table.empty:
+        print("-entry < exit < entry를 만족하는 (entry, exit) 조합이 없습니다.")
+        return 1
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"저장 완료: {args.output} ({len(table)}개 조합)")
+    ranked = table.sort_values(args.sort, ascending=False, na_position="last", kind="stable")
+    print(ranked.head(args.top).to_string(index=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="kimchi-gold", description="KRX 금 김치 프리미엄 도구"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    now = subparsers.add_parser("now", help="현재 김치 프리미엄을 출력합니다.")
+    now.add_argument("--json", action="store_true", help="JSON 한 줄로 출력합니다.")
+    now.set_defaults(func=_cmd_now)
+
+    collect = subparsers.add_parser("collect", help="오늘 시세를 로그에 기록합니다.")
+    collect.set_defaults(func=_cmd_collect)
+
+    plot = subparsers.add_parser("plot", help="기간별 그래프를 생성합니다.")
+    plot.add_argument(
+        "--windows",
+        nargs="+",
+        type=_parse_window,
+        metavar="MONTHS",
+        help="그릴 기간(개월 수) 목록. 'all'은 전체 기간입니다.",
+    )
+    plot.add_argument(
+        "--force", action="store_true", help="데이터가 같아도 다시 그립니다."
+    )
+    plot.set_defaults(func=_cmd_plot)
+
+    intraday = subparsers.add_parser("intraday", help="장중 상주 수집기를 실행합니다.")
+    intraday.add_argument(
+        "--interval", type=float, default=60.0, help="샘플링 간격(초)."
+    )
+    intraday.add_argument(
+        "--always", action="store_true", help="장 시간과 상관없이 샘플링합니다."
+    )
+    intraday.set_defaults(func=_cmd_intraday)
+
+    backfill = subparsers.add_parser("backfill", help="ECOS 환율 기록을 내려받습니다.")
+    backfill.add_argument("--begin", required=True, help="시작일 (YYYYMMDD)")
+    backfill.add_argument("--end", required=True, help="종료일 (YYYYMMDD)")
+    backfill.add_argument("--api-key", help="ECOS API 키 (기본: ECOS_API_KEY)")
+    backfill.add_argument("--output", help="저장할 CSV 경로")
+    backfill.add_argument("--chunk-days", type=int, default=365)
+    backfill.add_argument("--workers", type=int, default=4)
+    backfill.add_argument("--rate", type=float, default=5.0, help="초당 최대 요청 수")
+    backfill.set_defaults(func=_cmd_backfill)
+
+    join = subparsers.add_parser("join", help="ECOS 환율 기준 김치 프리미엄을 계산합니다.")
+    join.add_argument("--ecos", help="ECOS 환율 CSV 경로")
+    join.add_argument("--tolerance-days", type=int, default=7)
+    join.add_argument("--output", help="결과를 저장할 CSV 경로 (없으면 마지막 행 출력)")
+    join.add_argument("--tail", type=int, default=10)
+    join.set_defaults(func=_cmd_join)
+
+    snapshot = subparsers.add_parser("snapshot", help="여러 종목을 동시에 수집합니다.")
+    snapshot.add_argument(
+        "--instruments", nargs="+", metavar="NAME", help="수집할 종목 (기본: 전체)"
+    )
+    snapshot.add_argument("--output", help="기록할 CSV 경로")
+    snapshot.add_argument("--list", action="store_true", help="등록된 종목을 보여줍니다.")
+    snapshot.set_defaults(func=_cmd_snapshot)
+
+    serve = subparsers.add_parser("serve", help="시세 HTTP 서버를 실행합니다.")
+    serve.add_argument("--host", default="127.0.0.1", help="들을 주소")
+    serve.add_argument("--port", type=int, default=8765, help="들을 포트")
+    serve.add_argument(
+        "--interval", type=float, default=60.0, help="상류 시세 갱신 간격(초)."
+    )
+    serve.set_defaults(func=_cmd_serve)
+
+    archive = subparsers.add_parser(
+        "archive", help="보관한 응답 원문으로 로그를 다시 만들거나 재생합니다."
+    )
+    archive.add_argument(
+        "action",
+        choices=("rebuild", "serve", "bench"),
+        help="rebuild: 가격 로그 재생성, serve: 재생 서버, bench: 재생 서버로 부하 시험",
+    )
+    archive.add_argument(
+        "--dir", help="보관소 폴더 (기본: KIMCHI_GOLD_ARCHIVE_DIR 또는 data/archive)"
+    )
+    archive.add_argument("--output", default="kimchi_gold_price_log.rebuilt.csv")
+    archive.add_argument("--class-name", help="가격 태그 클래스 (페이지 구조가 바뀐 경우)")
+    archive.add_argument("--workers", type=int, help="재파싱 프로세스 수")
+    archive.add_argument("--port", type=int, default=0, help="재생 서버 포트")
+    archive.add_argument("--snapshots", type=int, default=1000)
+    archive.add_argument("--concurrency", type=int, default=16)
+    archive.set_defaults(func=_cmd_archive)
+
+    rollup = subparsers.add_parser("rollup", help="주/월 집계를 보여주거나 다시 만듭니다.")
+    rollup.add_argument("--period", choices=("weekly", "monthly"), default="monthly")
+    rollup.add_argument("--tail", type=int, default=12)
+    rollup.add_argument(
+        "--rebuild", action="store_true", help="가격 로그 전체에서 집계를 다시 만듭니다."
+    )
+    rollup.set_defaults(func=_cmd_rollup)
+
+    backtest = subparsers.add_parser(
+        "backtest",
+        help="김치 프리미엄 되돌림 규칙을 가격 로그로 백테스트합니다.",
+        description="목록 인자(--entries 등)를 하나라도 주면 그 격자 전체를 탐색합니다.",
+    )
+    backtest.add_argument("--entry", type=float, default=1.0, help="진입 프리미엄 (%%)")
+    backtest.add_argument("--exit", type=float, default=0.0, help="청산 프리미엄 (%%)")
+    backtest.add_argument("--fee", type=float, default=0.0, help="한 쪽 거래 수수료 (%%)")
+    backtest.add_argument(
+        "--fx-spread", type=float, default=0.0, help="국제 쪽 환전 스프레드 (%%)"
+    )
+    for name in ("entries", "exits", "fees", "fx-spreads"):
+        backtest.add_argument(
+            f"--{name}",
+            nargs="+",
+            type=_parse_values,
+            metavar="VALUE",
+            help="탐색할 값 또는 start:stop:step 범위",
+        )
+    backtest.add_argument("--workers", type=int, help="탐색 프로세스 수 (기본: CPU 수)")
+    backtest.add_argument(
+        "--sort",
+        choices=("total_return", "sharpe", "max_drawdown", "trades"),
+        default="sharpe",
+        help="탐색 결과 정렬 기준 (큰 값부터)",
+    )
+    backtest.add_argument("--top", type=int, default=20, help="출력할 탐색 결과 수")
+    backtest.add_argument("--output", help="탐색 결과 전체를 저장할 CSV 경로")
+    backtest.set_defaults(func=_cmd_backtest)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # KIMCHI_GOLD_PROFILE이 설정되어 있으면 하위 명령의 지연 import까지 포함해 프로파일링합니다.
+    with profiling.session(args.command):
+        return args.func(args)
+
+
+def run() -> None:
+    """콘솔 스크립트 진입점."""
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
@@ -1,53 +1,80 @@
-import csv
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple
+from kimchi_gold import alerts, metrics, profiling
+from kimchi_gold.log_index import LOG_HEADER, LogIndex, read_last_row
 from kimchi_gold.now_price import calc_kimchi_premium
+from kimchi_gold.writer import LogWriter
 
 CURRENT_DIR: Path = Path(__file__).resolve().parent
 ROOT_DIR: Path = CURRENT_DIR.parent.parent  # 루트 폴더
 DATA_DIR: Path = ROOT_DIR / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DATA_FILE: Path = DATA_DIR / "kimchi_gold_price_log.csv"
+STORE_DIR: Path = DATA_DIR / "store"  # 있으면 열 지향 저장소에도 함께 기록합니다.
 
 
 def is_today_logged(filename: Path) -> bool:
-    """오늘 날짜(YYYY-MM-DD)가 이미 파일에 기록되어 있으면 True 반환"""
-    if not filename.exists():
+    """
+    오늘 날짜(YYYY-MM-DD)가 이미 파일에 기록되어 있으면 True 반환
+    로그는 날짜 순으로 쌓이므로 파일 끝의 마지막 행만 확인합니다.
+    """
+    last_row = read_last_row(filename)
+    if not last_row:
         return False
     today_str: str = datetime.now().strftime("%Y-%m-%d")
-    with filename.open("r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        next(reader, None)  # 헤더 스킵
-        for row in reader:
-            if row and row[0].startswith(today_str):
-                return True
-    return False
-
-
-def write_to_csv(row: List[str], filename: Path = DATA_FILE) -> None:
-    file_exists: bool = filename.exists()
-    with filename.open(mode="a", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            # 헤더 작성
-            writer.writerow(
-                [
-                    "날짜",
-                    "국내금(원/g)",
-                    "국제금(달러/온스)",
-                    "환율(원/달러)",
-                    "김치프리미엄(원/g)",
-                    "김치프리미엄(%)",
-                ]
-            )
-        writer.writerow(row)
+    return last_row[0].startswith(today_str)
+
+
+def write_to_csv(
+    row: List[str], filename: Path = DATA_FILE, fsync: str = "batch"
+) -> None:
+    """
+    행 하나를 로그 끝에 붙입니다. 빈 파일이면 헤더를 먼저 씁니다.
+    파일 잠금 안에서 헤더 여부를 정하므로 여러 수집기가 동시에 써도 헤더가 겹치지 않습니다.
+    여러 행을 자주 쓴다면 writer.LogWriter로 모아서 쓰세요.
+    """
+    with LogWriter(filename, header=LOG_HEADER, fsync=fsync) as writer:
+        writer.write(row)
+
+
+def upsert_row(row: List[str], filename: Path = DATA_FILE) -> bool:
+    """
+    첫 번째 열(날짜 또는 타임스탬프)이 같은 행이 있으면 교체하고, 없으면 추가합니다.
+    사이드카 인덱스를 사용하므로 파일 전체를 다시 읽지 않습니다.
+    하루에 여러 번 스냅샷을 남길 때 중복 없이 기록하는 데 사용합니다.
+
+    Returns:
+        bool: 기존 행을 교체했으면 True.
+    """
+    return LogIndex(filename).upsert(row)
 
 
 def collect_data() -> None:
+    """
+    오늘 시세를 수집해 로그에 기록합니다.
+    KIMCHI_GOLD_METRICS_DIR가 설정되어 있으면 요청별 측정값(JSON lines)과
+    Prometheus textfile을 그 폴더에 남깁니다.
+    KIMCHI_GOLD_ALERT_RULES가 설정되어 있으면 기록한 값으로 알림 규칙을 평가합니다.
+    KIMCHI_GOLD_ARCHIVE_DIR가 설정되어 있으면 받은 응답 원문을 그 폴더에 보관합니다.
+    KIMCHI_GOLD_PROFILE이 설정되어 있으면 단계별 소요 시간 보고서를 data/profiles에 남깁니다.
+    기록한 행은 주/월 집계 파일의 현재 구간에도 반영합니다.
+    """
+    with profiling.session("collect"):
+        _collect()
+
+
+def _collect() -> None:
     if is_today_logged(DATA_FILE):
         print("오늘 데이터가 이미 존재합니다. 수집을 중단합니다.")
         return
+    metrics.install_jsonl_from_env()
+    from kimchi_gold.archive import install_recorder_from_env
+
+    install_recorder_from_env()
+    start = time.perf_counter()
+    outcome = "ok"
     try:
         result: Tuple[float, float, float, float, float, float] = calc_kimchi_premium()
         domestic, international, international_krw_per_g, usdkrw, diff, premium = result
@@ -60,10 +87,34 @@ def collect_data() -> None:
             f"{diff:.2f}",
             f"{premium:.2f}",
         ]
-        write_to_csv(row)
+        with profiling.span("write"):
+            write_to_csv(row)
+        try:
+            with profiling.span("rollup"):
+                from kimchi_gold.rollup import update_rollups
+
+                update_rollups(row, DATA_FILE)
+        except Exception as e:  # 집계는 언제든 다시 만들 수 있으므로 수집을 실패로 보지 않습니다.
+            print(f"주/월 집계 갱신 실패: {e}")
+        if STORE_DIR.exists():
+            try:
+                with profiling.span("store"):
+                    from kimchi_gold.storage import ColumnStore
+
+                    ColumnStore(STORE_DIR).append_rows([row])
+            except Exception as e:  # 컬럼 저장소는 CSV 로그에서 다시 만들 수 있습니다.
+                print(f"컬럼 저장소 갱신 실패: {e}")
         print(f"수집 완료: {row}")
+        with profiling.span("alerts"):
+            fired = alerts.evaluate_from_env(result, DATA_FILE)
+        for alert in fired:
+            print(f"알림: {alert.message()}")
     except Exception as e:
+        outcome = "error"
         print(f"수집 실패: {e}")
+    finally:
+        metrics.record_collect(time.perf_counter() - start, outcome)
+        metrics.export_from_env()
 
 
 if __name__ == "__main__":
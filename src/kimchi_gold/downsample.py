@@ -0,0 +1,92 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax")
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return np.asarray(x, dtype=np.float64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets로 그릴 점의 위치(정수 인덱스)를 고릅니다.
+
+    첫 점과 마지막 점은 항상 남기고, 나머지를 threshold-2개 구간으로 나눠 구간마다
+    앞서 고른 점·다음 구간 평균과 가장 큰 삼각형을 이루는 점 하나를 고릅니다.
+    구간 수만큼만 파이썬 반복을 돌고 구간 안 계산은 배열 연산이므로, 비용은
+    입력 길이에 선형이고 반복 횟수는 출력 크기(그림 폭)에만 비례합니다.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    xs = _as_float(x)
+    ys = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        ax, ay = xs[a], ys[a]
+        # 다음 구간의 평균점 (마지막 구간 다음은 마지막 점)
+        lo, hi = end, edges[i + 2] if i + 2 < len(edges) else n
+        if hi > lo and i + 2 < len(edges):
+            next_y = ys[lo:hi]
+            next_y = next_y[~np.isnan(next_y)]
+            cx = xs[lo:hi].mean()
+            cy = next_y.mean() if len(next_y) else ay
+        else:
+            cx, cy = xs[n - 1], ys[n - 1]
+        bucket_x, bucket_y = xs[start:end], ys[start:end]
+        area = np.abs((ax - cx) * (bucket_y - ay) - (ax - bucket_x) * (cy - ay))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    입력을 buckets개 구간으로 나눠 구간마다 최솟값과 최댓값 위치를 남깁니다 (최대 2*buckets점).
+    한 픽셀 열에 들어가는 점들의 세로 범위를 그대로 보존하므로 극값이 사라지지 않습니다.
+    반복 없이 배열을 (구간, 구간 크기)로 바꿔 한 번에 계산합니다.
+    """
+    n = len(y)
+    if buckets <= 0 or 2 * buckets >= n:
+        return np.arange(n)
+    ys = np.asarray(y, dtype=np.float64)
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = ys
+    grid = padded.reshape(rows, size)
+    offsets = np.arange(rows) * size
+    lows = offsets + np.argmin(np.where(np.isnan(grid), np.inf, grid), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(grid), -np.inf, grid), axis=1)
+    picked = np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+    return picked[picked < n]
+
+
+def downsample_index(
+    x: np.ndarray, y: np.ndarray, points: int, method: str = "lttb"
+) -> np.ndarray:
+    """method에 따라 남길 점의 정렬된 인덱스를 반환합니다. 점이 적으면 전부 반환합니다."""
+    if method == "lttb":
+        return lttb(x, y, points)
+    if method == "minmax":
+        return minmax(y, max(1, points // 2))
+    raise ValueError(f"method는 {', '.join(METHODS)} 중 하나여야 합니다: {method!r}")
+
+
+def downsample_series(
+    series: pd.Series, points: Optional[int], method: str = "lttb"
+) -> pd.Series:
+    """시계열을 약 points개 점으로 줄입니다. points가 None이면 그대로 반환합니다."""
+    if points is None or len(series) <= points:
+        return series
+    index = downsample_index(series.index.to_numpy(), series.to_numpy(), points, method)
+    return series.iloc[index]
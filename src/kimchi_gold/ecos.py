@@ -0,0 +1,197 @@
+import csv
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import requests
+from kimchi_gold.collect_price import DATA_DIR
+from kimchi_gold.ratelimit import RateLimiter
+
+ECOS_BASE_URL: str = "https://ecos.bok.or.kr/api"
+ECOS_FILE: Path = DATA_DIR / "ecos_usdkrw.csv"
+ECOS_HEADER: List[str] = ["Name", "Date", "Value"]  # test_script/api_test.py와 같은 형식
+NO_DATA_CODE: str = "INFO-200"  # 해당하는 데이터가 없습니다.
+
+
+@dataclass(frozen=True)
+class EcosSeries:
+    """ECOS StatisticSearch로 조회할 통계 항목."""
+
+    stat_code: str
+    item_code: str
+    cycle: str = "D"  # 주기(년:A, 반년:S, 분기:Q, 월:M, 반월:SM, 일: D)
+
+
+USD_KRW_SERIES = EcosSeries(stat_code="731Y001", item_code="0000001")  # 원/달러 매매기준율
+
+
+def split_date_range(begin: date, end: date, chunk_days: int) -> List[Tuple[date, date]]:
+    """[begin, end] 구간을 chunk_days일 이하의 연속된 조각으로 나눕니다."""
+    chunks = []
+    start = begin
+    while start <= end:
+        stop = min(start + timedelta(days=chunk_days - 1), end)
+        chunks.append((start, stop))
+        start = stop + timedelta(days=1)
+    return chunks
+
+
+class EcosClient:
+    """
+    한국은행 ECOS StatisticSearch API 클라이언트입니다.
+    한 조각 안에서도 결과가 page_size보다 많으면 행 번호 범위를 나눠 여러 번 요청합니다.
+    모든 요청은 rate_limiter를 거치므로 여러 스레드가 같은 클라이언트를 써도 호출 빈도가 제한됩니다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = ECOS_BASE_URL,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        page_size: int = 10000,
+        timeout: float = 10.0,
+        retries: int = 3,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter or RateLimiter(rate=5.0)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.retries = retries
+
+    def _url(self, series: EcosSeries, first: int, last: int, begin: str, end: str) -> str:
+        return (
+            f"{self.base_url}/StatisticSearch/{self.api_key}/json/kr/{first}/{last}/"
+            f"{series.stat_code}/{series.cycle}/{begin}/{end}/{series.item_code}/"
+        )
+
+    def _get_json(self, url: str) -> Dict:
+        for attempt in range(self.retries):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError):
+                if attempt == self.retries - 1:
+                    raise
+                time.sleep(0.5 * 2**attempt)
+        raise RuntimeError("unreachable")
+
+    def fetch_page(
+        self, series: EcosSeries, begin: str, end: str, first: int, last: int
+    ) -> Tuple[int, List[Dict[str, str]]]:
+        """한 페이지를 조회해 (전체 행 수, 행 목록)을 반환합니다."""
+        data = self._get_json(self._url(series, first, last, begin, end))
+        if "RESULT" in data:
+            code = data["RESULT"].get("CODE", "")
+            if code == NO_DATA_CODE:
+                return 0, []
+            raise RuntimeError(f"ECOS 오류 {code}: {data['RESULT'].get('MESSAGE', '')}")
+        body = data.get("StatisticSearch", {})
+        return int(body.get("list_total_count", 0)), body.get("row", [])
+
+    def fetch_range(self, series: EcosSeries, begin: str, end: str) -> List[Dict[str, str]]:
+        """한 날짜 조각의 모든 행을 페이지를 넘겨 가며 가져옵니다."""
+        total, rows = self.fetch_page(series, begin, end, 1, self.page_size)
+        first = self.page_size + 1
+        while first <= total:
+            _, page = self.fetch_page(series, begin, end, first, first + self.page_size - 1)
+            rows.extend(page)
+            first += self.page_size
+        return rows
+
+
+def read_series(filename: Path) -> Dict[str, Tuple[str, str]]:
+    """저장된 시계열을 {날짜: (이름, 값)}으로 읽습니다."""
+    if not filename.exists():
+        return {}
+    with filename.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # 헤더 스킵
+        return {row[1]: (row[0], row[2]) for row in reader if len(row) >= 3}
+
+
+def merge_series(filename: Path, rows: List[Dict[str, str]]) -> int:
+    """
+    ECOS 행을 날짜(YYYYMMDD)를 키로 기존 파일과 합칩니다. 같은 날짜는 새 값으로 덮어씁니다.
+    임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 기존 파일이 깨지지 않습니다.
+
+    Returns:
+        int: 새로 추가된 날짜 수.
+    """
+    merged = read_series(filename)
+    before = len(merged)
+    for row in rows:
+        merged[row["TIME"]] = (row.get("ITEM_NAME1", ""), row["DATA_VALUE"])
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filename.with_name(filename.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(ECOS_HEADER)
+        for day in sorted(merged):
+            name, value = merged[day]
+            writer.writerow([name, day, value])
+    tmp_path.replace(filename)
+    return len(merged) - before
+
+
+def backfill(
+    client: EcosClient,
+    begin: date,
+    end: date,
+    series: EcosSeries = USD_KRW_SERIES,
+    output_file: Path = ECOS_FILE,
+    chunk_days: int = 365,
+    workers: int = 4,
+    checkpoint_file: Optional[Path] = None,
+) -> int:
+    """
+    [begin, end] 구간을 chunk_days 단위로 나눠 동시에 내려받고 output_file에 합칩니다.
+
+    끝난 조각은 checkpoint_file(기본: output_file 옆의 .checkpoint.json)에 기록하므로,
+    중단된 뒤 다시 실행하면 남은 조각만 받습니다. 모든 조각이 끝나면 체크포인트를 지웁니다.
+
+    Returns:
+        int: 새로 추가된 날짜 수.
+    """
+    if checkpoint_file is None:
+        checkpoint_file = output_file.with_name(output_file.name + ".checkpoint.json")
+    done: List[str] = []
+    if checkpoint_file.exists():
+        done = json.loads(checkpoint_file.read_text(encoding="utf-8"))
+
+    chunks = [
+        (start.strftime("%Y%m%d"), stop.strftime("%Y%m%d"))
+        for start, stop in split_date_range(begin, end, chunk_days)
+    ]
+    pending = [chunk for chunk in chunks if f"{chunk[0]}-{chunk[1]}" not in done]
+    lock = threading.Lock()
+    added = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(client.fetch_range, series, start, stop): (start, stop)
+            for start, stop in pending
+        }
+        for future in as_completed(futures):
+            start, stop = futures[future]
+            rows = future.result()
+            with lock:
+                added += merge_series(output_file, rows)
+                done.append(f"{start}-{stop}")
+                checkpoint_file.write_text(json.dumps(sorted(done)), encoding="utf-8")
+
+    checkpoint_file.unlink(missing_ok=True)
+    return added
+
+
+def parse_date(text: str) -> date:
+    """'YYYYMMDD' 또는 'YYYY-MM-DD' 형식의 날짜를 읽습니다."""
+    return datetime.strptime(text.replace("-", ""), "%Y%m%d").date()
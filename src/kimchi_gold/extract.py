@@ -0,0 +1,66 @@
+import html
+import re
+from typing import Optional
+
+PRICE_CLASS: str = "DetailInfo_price__I_VJn"
+DEFAULT_PRICE_REGEX: str = r"[\d,]+(?:\.\d+)?"
+
+_TAG_RE = re.compile(rb"<[^>]*>")
+_CLASS_DELIMITERS: bytes = b"\"' \t\r\n"
+
+
+def extract_price_text(content: bytes, class_name: str = PRICE_CLASS) -> Optional[str]:
+    """
+    HTML 바이트에서 <strong class="...class_name...">의 텍스트만 잘라냅니다.
+    DOM을 만들지 않고 클래스 이름을 bytes.find로 찾은 뒤 태그 경계만 확인하므로,
+    가격 노드를 찾는 즉시 멈추고 페이지 나머지는 읽지 않습니다.
+    태그를 찾지 못하면 None을 반환합니다.
+    """
+    needle = class_name.encode("ascii")
+    pos = content.find(needle)
+    while pos != -1:
+        end = pos + len(needle)
+        # 다른 클래스 이름의 일부(예: ...price__I_VJn_x)나 CSS 선택자는 건너뜁니다.
+        if (
+            content[pos - 1 : pos] in _CLASS_DELIMITERS
+            and content[end : end + 1] in _CLASS_DELIMITERS
+        ):
+            tag_start = content.rfind(b"<", 0, pos)
+            tag_end = content.find(b">", end)
+            if (
+                tag_start != -1
+                and tag_end != -1
+                and content[tag_start + 1 : tag_start + 7].lower() == b"strong"
+                and content[tag_start + 7 : tag_start + 8] in _CLASS_DELIMITERS
+                and b">" not in content[tag_start:pos]
+            ):
+                close = content.find(b"</strong>", tag_end)
+                if close != -1:
+                    inner = _TAG_RE.sub(b"", content[tag_end + 1 : close])
+                    return html.unescape(inner.decode("utf-8", errors="replace"))
+        pos = content.find(needle, end)
+    return None
+
+
+def parse_price(text: str, regex: str = DEFAULT_PRICE_REGEX) -> Optional[float]:
+    """가격 텍스트에서 첫 번째 숫자를 찾아 float으로 변환합니다. 없으면 None."""
+    price = re.search(regex, text)
+    if price:
+        return float(price.group().replace(",", ""))
+    return None
+
+
+def extract_price(
+    content: bytes,
+    regex: str = DEFAULT_PRICE_REGEX,
+    class_name: str = PRICE_CLASS,
+) -> Optional[float]:
+    """
+    빠른 추출기로 가격을 구합니다.
+    가격 노드가 없거나 숫자를 읽지 못하면 None을 반환하므로, 호출하는 쪽에서
+    BeautifulSoup 경로로 대체할 수 있습니다.
+    """
+    text = extract_price_text(content, class_name)
+    if text is None:
+        return None
+    return parse_price(text, regex)
@@ -0,0 +1,287 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+import requests
+from kimchi_gold.cache import ResponseCache, cache_from_env
+from kimchi_gold.collect_price import DATA_DIR
+from kimchi_gold.extract import DEFAULT_PRICE_REGEX, PRICE_CLASS
+from kimchi_gold.now_price import (
+    DOMESTIC_GOLD_URL,
+    INTERNATIONAL_GOLD_URL,
+    USD_KRW_URL,
+    get_price_from_naver,
+    get_session,
+)
+from kimchi_gold.policy import DEFAULT_POLICY, FetchPolicy
+from kimchi_gold.premium import TROY_OUNCE_GRAMS
+from kimchi_gold.ratelimit import RateLimiter
+from kimchi_gold.writer import LogWriter
+
+INSTRUMENTS_FILE: Path = DATA_DIR / "kimchi_gold_instruments.csv"
+INSTRUMENTS_HEADER: List[str] = [
+    "시각",
+    "종목",
+    "가격",
+    "단위",
+    "원화환산",  # 금속은 원/g, 환율은 원/1통화단위
+    "김치프리미엄(%)",  # reference가 있는 종목만
+]
+PER_HOST_CONNECTIONS: int = 4  # 한 호스트에 동시에 보내는 요청 수
+PER_HOST_RATE: float = 10.0  # 한 호스트에 보내는 초당 요청 수
+MAX_WORKERS: int = 16
+
+
+@dataclass(frozen=True)
+class Instrument:
+    """
+    수집할 시세 하나의 선언입니다.
+
+    Attributes:
+        name (str): 기록에 쓰는 짧은 이름.
+        url (str): 네이버 금융 모바일 페이지 주소.
+        unit (str): 가격 단위. "g"(그램당) 또는 "oz"(트로이온스당), 환율은 "fx".
+        currency (str): 가격 통화 (KRW, USD ...). 환율은 기준 통화입니다.
+        quote_size (float): 환율 고시 단위 (엔화는 100엔당).
+        reference (Optional[str]): 김치 프리미엄을 계산할 해외 시세 종목 이름.
+        class_name / regex: 가격 추출 설정.
+    """
+
+    name: str
+    url: str
+    unit: str
+    currency: str
+    quote_size: float = 1.0
+    reference: Optional[str] = None
+    class_name: str = PRICE_CLASS
+    regex: str = DEFAULT_PRICE_REGEX
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+    @property
+    def is_fx(self) -> bool:
+        return self.unit == "fx"
+
+
+NAVER_METALS_URL: str = "https://m.stock.naver.com/marketindex/metals/"
+NAVER_EXCHANGE_URL: str = "https://m.stock.naver.com/marketindex/exchange/"
+
+INSTRUMENTS: Dict[str, Instrument] = {
+    instrument.name: instrument
+    for instrument in (
+        Instrument("krx_gold", DOMESTIC_GOLD_URL, "g", "KRW", reference="gold"),
+        Instrument("gold", INTERNATIONAL_GOLD_URL, "oz", "USD"),
+        Instrument("silver", NAVER_METALS_URL + "SIcv1", "oz", "USD"),
+        Instrument("platinum", NAVER_METALS_URL + "PLcv1", "oz", "USD"),
+        Instrument("usdkrw", USD_KRW_URL, "fx", "USD"),
+        Instrument(
+            "jpykrw", NAVER_EXCHANGE_URL + "FX_JPYKRW", "fx", "JPY", quote_size=100
+        ),
+        Instrument("cnykrw", NAVER_EXCHANGE_URL + "FX_CNYKRW", "fx", "CNY"),
+    )
+}
+# 원화 환산에 필요한 통화 -> 환율 종목
+FX_BY_CURRENCY: Dict[str, str] = {
+    instrument.currency: name
+    for name, instrument in INSTRUMENTS.items()
+    if instrument.is_fx
+}
+
+
+def register(instrument: Instrument) -> None:
+    """종목을 추가하거나 같은 이름의 종목을 교체합니다."""
+    INSTRUMENTS[instrument.name] = instrument
+    if instrument.is_fx:
+        FX_BY_CURRENCY[instrument.currency] = instrument.name
+
+
+def resolve(names: Optional[Iterable[str]] = None) -> List[Instrument]:
+    """
+    이름 목록을 종목 목록으로 바꿉니다. None이면 전체입니다.
+    원화 환산과 프리미엄 계산에 필요한 환율·기준 종목도 함께 넣습니다.
+    """
+    selected = list(INSTRUMENTS) if names is None else list(dict.fromkeys(names))
+    unknown = [name for name in selected if name not in INSTRUMENTS]
+    if unknown:
+        raise KeyError(f"알 수 없는 종목입니다: {', '.join(unknown)}")
+    for name in list(selected):
+        instrument = INSTRUMENTS[name]
+        needed = [instrument.reference, FX_BY_CURRENCY.get(instrument.currency)]
+        if instrument.reference:
+            reference = INSTRUMENTS[instrument.reference]
+            needed.append(FX_BY_CURRENCY.get(reference.currency))
+        for dependency in needed:
+            if dependency and dependency not in selected:
+                selected.append(dependency)
+    return [INSTRUMENTS[name] for name in selected]
+
+
+class HostLimiter:
+    """
+    호스트마다 동시 요청 수(세마포어)와 초당 요청 수(RateLimiter)를 제한합니다.
+    종목이 늘면 워커 풀도 커지지만, 한 사이트에 몰리는 부하는 이 한도를 넘지 않습니다.
+    """
+
+    def __init__(
+        self,
+        connections: int = PER_HOST_CONNECTIONS,
+        rate: float = PER_HOST_RATE,
+    ) -> None:
+        self.connections = connections
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Tuple[threading.Semaphore, RateLimiter]] = {}
+
+    def _limits(self, host: str) -> Tuple[threading.Semaphore, RateLimiter]:
+        with self._lock:
+            limits = self._hosts.get(host)
+            if limits is None:
+                limits = self._hosts[host] = (
+                    threading.BoundedSemaphore(self.connections),
+                    RateLimiter(self.rate, burst=self.connections),
+                )
+            return limits
+
+    def call(self, host: str, func, *args, **kwargs):
+        semaphore, limiter = self._limits(host)
+        with semaphore:
+            limiter.acquire()
+            return func(*args, **kwargs)
+
+
+def fetch_instruments(
+    instruments: Sequence[Instrument],
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[HostLimiter] = None,
+    max_workers: int = MAX_WORKERS,
+    policy: Optional[FetchPolicy] = None,
+) -> Tuple[Dict[str, float], Dict[str, Exception]]:
+    """
+    여러 종목의 시세를 동시에 가져옵니다.
+    전체 소요 시간은 호스트별 한도 안에서 가장 느린 요청 몇 개에 가깝고,
+    종목 수에 비례해 늘어나지 않습니다. 모든 요청이 policy.deadline 하나를 나눠 씁니다.
+
+    Returns:
+        Tuple[Dict[str, float], Dict[str, Exception]]: (이름 -> 가격, 이름 -> 실패 원인)
+    """
+    if session is None:
+        session = get_session()
+    if cache is None:
+        cache = cache_from_env()
+    if limiter is None:
+        limiter = HostLimiter()
+    policy = policy if policy is not None else DEFAULT_POLICY
+    deadline = policy.start()
+    prices: Dict[str, float] = {}
+    errors: Dict[str, Exception] = {}
+    if not instruments:
+        return prices, errors
+    workers = min(max_workers, len(instruments))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            instrument.name: executor.submit(
+                limiter.call,
+                instrument.host,
+                get_price_from_naver,
+                instrument.url,
+                f"{instrument.name} 가격 정보를 찾을 수 없습니다.",
+                instrument.regex,
+                session=session,
+                cache=cache,
+                class_name=instrument.class_name,
+                policy=policy,
+                deadline=deadline,
+            )
+            for instrument in instruments
+        }
+        for name, future in futures.items():
+            try:
+                prices[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    return prices, errors
+
+
+def krw_value(
+    instrument: Instrument, price: float, prices: Mapping[str, float]
+) -> Optional[float]:
+    """
+    가격을 원화로 환산합니다. 금속은 원/g, 환율은 1통화단위당 원입니다.
+    필요한 환율이 없으면 None.
+    """
+    if instrument.is_fx:
+        return price / instrument.quote_size
+    value = price
+    if instrument.currency != "KRW":
+        fx_name = FX_BY_CURRENCY.get(instrument.currency)
+        if fx_name not in prices:
+            return None
+        value = value * prices[fx_name] / INSTRUMENTS[fx_name].quote_size
+    if instrument.unit == "oz":
+        value = value / TROY_OUNCE_GRAMS
+    return value
+
+
+def snapshot_rows(
+    instruments: Sequence[Instrument],
+    prices: Mapping[str, float],
+    timestamp: Optional[datetime] = None,
+) -> List[List[str]]:
+    """한 번의 수집 결과를 종목당 한 행으로 만듭니다. 가격을 얻지 못한 종목은 뺍니다."""
+    stamp = (timestamp or datetime.now()).isoformat(timespec="seconds")
+    rows: List[List[str]] = []
+    for instrument in instruments:
+        if instrument.name not in prices:
+            continue
+        price = prices[instrument.name]
+        krw = krw_value(instrument, price, prices)
+        premium = ""
+        if krw is not None and instrument.reference in prices:
+            reference = INSTRUMENTS[instrument.reference]
+            reference_krw = krw_value(reference, prices[reference.name], prices)
+            if reference_krw:
+                premium = f"{(krw - reference_krw) / reference_krw * 100:.2f}"
+        unit = "fx" if instrument.is_fx else f"{instrument.currency}/{instrument.unit}"
+        rows.append(
+            [
+                stamp,
+                instrument.name,
+                f"{price:.4f}".rstrip("0").rstrip("."),
+                unit,
+                "" if krw is None else f"{krw:.2f}",
+                premium,
+            ]
+        )
+    return rows
+
+
+def write_rows(rows: Sequence[Sequence[str]], filename: Path = INSTRUMENTS_FILE) -> None:
+    """스냅샷의 모든 행을 잠금 한 번, write 한 번으로 붙입니다."""
+    with LogWriter(filename, header=INSTRUMENTS_HEADER, max_rows=len(rows)) as writer:
+        writer.write_rows(rows)
+
+
+def collect_instruments(
+    names: Optional[Iterable[str]] = None,
+    filename: Path = INSTRUMENTS_FILE,
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Tuple[List[List[str]], Dict[str, Exception]]:
+    """
+    선택한 종목을 동시에 수집해 종목당 한 행씩 filename에 덧붙입니다.
+
+    Returns:
+        Tuple[List[List[str]], Dict[str, Exception]]: (기록한 행, 실패한 종목)
+    """
+    instruments = resolve(names)
+    prices, errors = fetch_instruments(instruments, session=session, cache=cache)
+    rows = snapshot_rows(instruments, prices)
+    if rows:
+        write_rows(rows, filename)
+    return rows, errors
@@ -0,0 +1,206 @@
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, FrozenSet, List, Optional, Tuple
+import numpy as np
+from kimchi_gold.alerts import AlertEngine, tick_from_result
+from kimchi_gold.collect_price import DATA_DIR
+from kimchi_gold.log_index import LogIndex
+from kimchi_gold.now_price import calc_kimchi_premium
+
+KST = timezone(timedelta(hours=9))
+OHLC_FILE: Path = DATA_DIR / "kimchi_gold_ohlc.csv"
+
+# 링 버퍼의 행 순서. 0번 행은 epoch 초입니다.
+TICK_FIELDS: Tuple[str, ...] = (
+    "timestamp",
+    "김치프리미엄(%)",
+    "국내금(원/g)",
+    "국제금(달러/온스)",
+    "환율(원/달러)",
+)
+OHLC_HEADER: List[str] = (
+    ["날짜"]
+    + [
+        f"{name}_{part}"
+        for name in TICK_FIELDS[1:]
+        for part in ("시가", "고가", "저가", "종가")
+    ]
+    + ["틱수"]
+)
+
+
+class TickRing:
+    """
+    최근 틱을 고정 크기 NumPy 배열에 담는 링 버퍼입니다.
+    용량이 차면 가장 오래된 틱을 덮어쓰므로 가동 시간과 상관없이 메모리가 일정합니다.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self._data = np.full((len(TICK_FIELDS), capacity), np.nan)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, timestamp: float, *values: float) -> None:
+        """틱 하나를 O(1)로 추가합니다. values는 TICK_FIELDS[1:] 순서입니다."""
+        self._data[0, self._next] = timestamp
+        self._data[1:, self._next] = values
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def view(self) -> np.ndarray:
+        """오래된 순서로 정렬된 (필드, 틱) 배열을 반환합니다."""
+        if self._size < self.capacity:
+            return self._data[:, : self._size]
+        return np.roll(self._data, -self._next, axis=1)
+
+    def latest(self) -> Optional[np.ndarray]:
+        if not self._size:
+            return None
+        return self._data[:, (self._next - 1) % self.capacity]
+
+
+def kst_day(timestamps: np.ndarray) -> np.ndarray:
+    """epoch 초 배열을 KST 기준 날짜 번호(1970-01-01부터 일수)로 바꿉니다."""
+    offset = KST.utcoffset(None).total_seconds()
+    return np.floor((timestamps + offset) / 86400).astype(np.int64)
+
+
+def rollup_daily(ticks: np.ndarray) -> List[List[str]]:
+    """
+    (필드, 틱) 배열을 KST 날짜별 시가/고가/저가/종가 행으로 묶습니다.
+    틱은 시간 순이라고 가정하며, 날짜 경계를 한 번에 찾아 reduceat으로 집계합니다.
+    """
+    if ticks.shape[1] == 0:
+        return []
+    days = kst_day(ticks[0])
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)] - 1
+    values = ticks[1:]
+    opens = values[:, starts]
+    highs = np.maximum.reduceat(values, starts, axis=1)
+    lows = np.minimum.reduceat(values, starts, axis=1)
+    closes = values[:, ends]
+    counts = ends - starts + 1
+
+    rows = []
+    for j, day in enumerate(days[starts]):
+        date = datetime(1970, 1, 1) + timedelta(days=int(day))
+        row = [date.strftime("%Y-%m-%d")]
+        for i in range(values.shape[0]):
+            row += [f"{opens[i, j]:.2f}", f"{highs[i, j]:.2f}"]
+            row += [f"{lows[i, j]:.2f}", f"{closes[i, j]:.2f}"]
+        rows.append(row + [str(counts[j])])
+    return rows
+
+
+@dataclass(frozen=True)
+class MarketHours:
+    """KRX 금시장 거래 시간 (기본: 평일 09:00~15:30 KST)."""
+
+    open: dtime = dtime(9, 0)
+    close: dtime = dtime(15, 30)
+    weekdays: FrozenSet[int] = field(default_factory=lambda: frozenset(range(5)))
+
+    def is_open(self, moment: datetime) -> bool:
+        local = moment.astimezone(KST)
+        return local.weekday() in self.weekdays and self.open <= local.time() <= self.close
+
+
+class IntradayCollector:
+    """
+    interval초마다 세 시세를 샘플링해 링 버퍼에 쌓고, 날짜가 바뀌면
+    전날 틱을 시가/고가/저가/종가 한 행으로 묶어 OHLC 로그에 기록하는 상주 수집기입니다.
+    market_hours가 None이면 시간과 상관없이 샘플링합니다.
+    flush_every번 샘플링할 때마다 당일 OHLC 행도 갱신해 두므로, 중간에 죽어도 당일 집계가 남습니다.
+    alerts를 주면 샘플마다 알림 규칙을 평가합니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = 60.0,
+        market_hours: Optional[MarketHours] = MarketHours(),
+        ohlc_file: Path = OHLC_FILE,
+        fetch: Callable[[], Tuple[float, ...]] = calc_kimchi_premium,
+        clock: Callable[[], float] = time.time,
+        flush_every: int = 10,
+        alerts: Optional[AlertEngine] = None,
+    ) -> None:
+        self.interval = interval
+        self.market_hours = market_hours
+        self.ohlc_file = ohlc_file
+        self.fetch = fetch
+        self.clock = clock
+        self.flush_every = flush_every
+        self.alerts = alerts
+        self._samples = 0
+        # 하루치 틱을 모두 담을 수 있는 크기로 잡습니다.
+        self.ring = TickRing(math.ceil(86400 / interval) + 1)
+        self._day: Optional[int] = None
+        self._stop = threading.Event()
+
+    def sample(self) -> bool:
+        """시세를 한 번 샘플링합니다. 성공하면 True."""
+        now = self.clock()
+        day = int(kst_day(np.array([now]))[0])
+        if self._day is not None and day != self._day:
+            self.flush()
+        try:
+            result = self.fetch()
+        except Exception as e:
+            print(f"수집 실패: {e}")
+            return False
+        domestic, international, _, usdkrw, _, premium = result
+        self.ring.push(now, premium, domestic, international, usdkrw)
+        if self.alerts is not None:
+            for alert in self.alerts.update(tick_from_result(result), now):
+                print(f"알림: {alert.message()}")
+        self._day = day
+        self._samples += 1
+        if self.flush_every and self._samples % self.flush_every == 0:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """현재 날짜의 틱을 OHLC 행으로 묶어 기록합니다. 같은 날짜 행은 교체합니다."""
+        if self._day is None:
+            return
+        ticks = self.ring.view()
+        ticks = ticks[:, kst_day(ticks[0]) == self._day]
+        rows = rollup_daily(ticks)
+        if rows:
+            LogIndex(self.ohlc_file).upsert(rows[-1], header=OHLC_HEADER)
+
+    def run(self) -> None:
+        """stop()이 호출될 때까지 interval 경계에 맞춰 샘플링합니다."""
+        self._stop.clear()
+        try:
+            while not self._stop.is_set():
+                now = self.clock()
+                if self.market_hours is None or self.market_hours.is_open(
+                    datetime.fromtimestamp(now, tz=KST)
+                ):
+                    self.sample()
+                self._stop.wait(self.interval - (self.clock() % self.interval))
+        finally:
+            self.flush()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    collector = IntradayCollector()
+    try:
+        collector.run()
+    except KeyboardInterrupt:
+        collector.stop()
@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import Mapping, Optional, Union
+import pandas as pd
+from kimchi_gold import loader
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.premium import compute_premium
+
+DATE_COL, DOMESTIC_COL, INTERNATIONAL_COL, FX_COL, DIFF_COL, PREMIUM_COL = LOG_HEADER
+DEFAULT_TOLERANCE: pd.Timedelta = pd.Timedelta(days=7)  # 연휴로 고시가 비는 기간을 덮습니다.
+
+
+def load_log(data_file: Path) -> pd.DataFrame:
+    """가격 로그를 DatetimeIndex로 정렬된 숫자형 데이터프레임으로 읽습니다."""
+    return loader.load_log(data_file)
+
+
+def load_ecos_series(path: Path, name: Optional[str] = None) -> pd.Series:
+    """
+    ECOS CSV(Name, Date=YYYYMMDD, Value)를 날짜 인덱스를 가진 시계열로 읽습니다.
+    같은 날짜가 여러 번 있으면 마지막 값을 사용합니다.
+    """
+    df = pd.read_csv(path, dtype={"Date": str})
+    series = pd.Series(
+        pd.to_numeric(df["Value"], errors="coerce").to_numpy(),
+        index=pd.to_datetime(df["Date"], format="%Y%m%d"),
+        name=name or Path(path).stem,
+    )
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    return series.dropna()
+
+
+def asof_join(
+    log: pd.DataFrame,
+    series: Mapping[str, pd.Series],
+    tolerance: Union[pd.Timedelta, Mapping[str, pd.Timedelta]] = DEFAULT_TOLERANCE,
+) -> pd.DataFrame:
+    """
+    외부 시계열들을 가격 로그의 각 시점에 맞춥니다.
+
+    각 로그 시점마다 그 시점 이전(같은 시점 포함)의 가장 가까운 관측값을 붙이며,
+    tolerance보다 오래된 값은 NaN으로 둡니다. 양쪽을 정렬한 뒤 pd.merge_asof로
+    한 번에 병합하므로 로그가 장중 해상도로 커져도 행마다 파이썬 조회를 하지 않습니다.
+
+    Args:
+        log (pd.DataFrame): DatetimeIndex를 가진 가격 로그.
+        series (Mapping[str, pd.Series]): 붙일 열 이름 -> DatetimeIndex 시계열.
+        tolerance: 모든 시계열에 쓸 허용 간격, 또는 열 이름별 허용 간격.
+
+    Returns:
+        pd.DataFrame: log의 열에 series 열들이 추가된 데이터프레임.
+    """
+    result = log if log.index.is_monotonic_increasing else log.sort_index()
+    result = result.copy()
+    left = pd.DataFrame(index=result.index)
+    for column, values in series.items():
+        limit = tolerance[column] if isinstance(tolerance, Mapping) else tolerance
+        right = values.rename(column).sort_index().to_frame()
+        merged = pd.merge_asof(
+            left,
+            right,
+            left_index=True,
+            right_index=True,
+            direction="backward",
+            tolerance=limit,
+        )
+        result[column] = merged[column].to_numpy()
+    return result
+
+
+def recompute_premium(df: pd.DataFrame, fx_column: str, label: str) -> pd.DataFrame:
+    """
+    fx_column 환율로 김치프리미엄(원/g)과 (%)를 다시 계산해 '_label'이 붙은 열로 추가합니다.
+    """
+    premium = compute_premium(df[DOMESTIC_COL], df[INTERNATIONAL_COL], df[fx_column])
+    result = df.copy()
+    result[f"{DIFF_COL}_{label}"] = premium.difference
+    result[f"{PREMIUM_COL}_{label}"] = premium.percent
+    return result
+
+
+def join_ecos(
+    log_file: Path,
+    ecos_file: Path,
+    label: str = "ECOS",
+    tolerance: pd.Timedelta = DEFAULT_TOLERANCE,
+) -> pd.DataFrame:
+    """가격 로그에 ECOS 환율을 붙이고, 그 환율 기준 김치 프리미엄을 함께 계산합니다."""
+    fx_column = f"{FX_COL}_{label}"
+    joined = asof_join(
+        load_log(log_file), {fx_column: load_ecos_series(ecos_file)}, tolerance
+    )
+    return recompute_premium(joined, fx_column, label)
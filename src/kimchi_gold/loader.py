@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from kimchi_gold.log_index import LOG_HEADER
+
+DATE_COL: str = LOG_HEADER[0]
+NUMERIC_COLUMNS: Tuple[str, ...] = tuple(LOG_HEADER[1:])
+CACHE_SIZE: int = 4  # 프로세스 안에 보관할 파싱 결과 수
+
+_CacheKey = Tuple[str, int, int, Tuple[str, ...], str]
+_cache: "OrderedDict[_CacheKey, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _parse(path: Path, columns: Tuple[str, ...], dtype: type) -> pd.DataFrame:
+    usecols = [DATE_COL, *columns]
+    try:
+        # C 파서는 '1323.88 '처럼 뒤에 공백이 붙은 숫자도 바로 float으로 읽습니다.
+        df = pd.read_csv(
+            path,
+            usecols=usecols,
+            dtype={DATE_COL: str, **{column: dtype for column in columns}},
+            skipinitialspace=True,
+        )
+    except ValueError:
+        # 숫자가 아닌 값이 섞여 있으면 문자열로 읽은 뒤 공백을 지우고 변환합니다.
+        df = pd.read_csv(path, usecols=usecols, dtype=str, skipinitialspace=True)
+        for column in columns:
+            df[column] = pd.to_numeric(df[column].str.strip()).astype(dtype)
+    index = pd.DatetimeIndex(pd.to_datetime(df.pop(DATE_COL), format="ISO8601"))
+    df.index = index.rename(DATE_COL)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="stable")
+    return df[list(columns)]
+
+
+def load_log(
+    data_file: Path,
+    columns: Optional[Sequence[str]] = None,
+    float32: bool = False,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    가격 로그를 정렬된 DatetimeIndex와 명시적인 숫자 dtype으로 읽습니다.
+
+    파싱 결과는 (경로, 수정 시각, 크기, 열, dtype)을 키로 프로세스 안에 보관하므로
+    같은 파일로 여러 기간을 조회해도 CSV는 한 번만 읽습니다. 돌려받은 데이터프레임은
+    캐시와 공유하므로 고치려면 먼저 copy()하세요.
+
+    Args:
+        data_file (Path): 가격 로그 CSV 경로.
+        columns (Optional[Sequence[str]]): 읽을 숫자 열. 기본은 날짜를 뺀 전체 열입니다.
+        float32 (bool): True면 float32로 읽어 메모리를 절반으로 줄입니다.
+        use_cache (bool): False면 캐시를 거치지 않습니다.
+
+    Raises:
+        FileNotFoundError: 파일이 없을 경우 발생합니다.
+    """
+    path = Path(data_file)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Error: {data_file} not found.")
+    selected = tuple(columns) if columns is not None else NUMERIC_COLUMNS
+    dtype = np.float32 if float32 else np.float64
+    key = (
+        str(path.resolve()),
+        stat.st_mtime_ns,
+        stat.st_size,
+        selected,
+        dtype.__name__,
+    )
+    if use_cache:
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+    df = _parse(path, selected, dtype)
+    if use_cache:
+        with _cache_lock:
+            _cache[key] = df
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return df
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def window_start(months: int, now: Optional[datetime] = None) -> pd.Timestamp:
+    """오늘 0시에서 달력 기준으로 months개월 전 (예: 3월 31일의 1개월 전은 2월 말일)."""
+    today = pd.Timestamp(now or datetime.now()).normalize()
+    return today - pd.DateOffset(months=months)
+
+
+def select_window(
+    df: pd.DataFrame, months: Optional[int], now: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    정렬된 인덱스에서 이진 탐색으로 최근 months개월 구간을 잘라냅니다. None은 전체입니다.
+    불리언 마스크를 만들지 않고 위치로 자르므로 결과는 복사 없는 뷰입니다.
+    """
+    if months is None:
+        return df
+    start = df.index.searchsorted(window_start(months, now), side="left")
+    return df.iloc[start:]
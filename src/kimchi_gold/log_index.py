@@ -0,0 +1,265 @@
+import csv
+import io
+import os
+import struct
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from kimchi_gold.writer import file_lock
+
+LOG_HEADER: List[str] = [
+    "날짜",
+    "국내금(원/g)",
+    "국제금(달러/온스)",
+    "환율(원/달러)",
+    "김치프리미엄(원/g)",
+    "김치프리미엄(%)",
+]
+INDEX_SUFFIX: str = ".idx"
+
+_MAGIC: bytes = b"KGIDX001"
+_HEADER = struct.Struct("<8sQ")  # 매직, 인덱스가 반영한 CSV 크기(바이트)
+_KEY_SIZE: int = 32
+_RECORD = struct.Struct(f"<{_KEY_SIZE}sQI")  # 키(날짜 또는 타임스탬프), 행 오프셋, 행 길이
+_TAIL_BLOCK: int = 4096
+
+
+def read_last_row(filename: Path, block_size: int = _TAIL_BLOCK) -> Optional[List[str]]:
+    """
+    파일 끝에서 블록 단위로 거꾸로 읽어 마지막 행만 파싱합니다.
+    파일 크기와 상관없이 마지막 한두 블록만 읽습니다. 빈 파일이면 None을 반환합니다.
+    """
+    if not filename.exists():
+        return None
+    with filename.open("rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        buffer = b""
+        position = end
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+            stripped = buffer.rstrip(b"\r\n")
+            if b"\n" in stripped or position == 0:
+                break
+    line = buffer.rstrip(b"\r\n").rsplit(b"\n", 1)[-1]
+    if not line:
+        return None
+    return next(csv.reader([line.decode("utf-8")]))
+
+
+def _format_row(row: List[str]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_key(key: str) -> bytes:
+    encoded = key.encode("utf-8")
+    if len(encoded) > _KEY_SIZE:
+        raise ValueError(f"인덱스 키가 너무 깁니다: {key}")
+    return encoded
+
+
+class LogIndex:
+    """
+    가격 로그 CSV의 첫 번째 열(날짜 또는 타임스탬프)을 키로 하는 사이드카 인덱스입니다.
+
+    인덱스 파일(<csv>.idx)은 고정 길이 레코드(키, 바이트 오프셋, 길이)의 배열이라
+    마지막 행 조회는 O(1), 키 조회는 이진 탐색으로 O(log n)입니다.
+    로그는 키 순서(시간 순)로 쌓인다고 가정하며, upsert는 이 순서를 유지합니다.
+
+    인덱스 헤더에는 반영한 CSV 크기를 저장합니다. 다른 도구가 CSV 끝에 행을 덧붙였다면
+    늘어난 부분만 읽어 따라잡고, 파일이 줄었거나 바뀌었으면 처음부터 다시 만듭니다.
+    """
+
+    def __init__(self, csv_path: Path, index_path: Optional[Path] = None) -> None:
+        self.csv_path = Path(csv_path)
+        self.index_path = (
+            Path(index_path)
+            if index_path is not None
+            else self.csv_path.with_name(self.csv_path.name + INDEX_SUFFIX)
+        )
+        with file_lock(self.csv_path, create=False):
+            self.sync()
+
+    # --- 인덱스 파일 입출력 -------------------------------------------------
+
+    def _read_header(self) -> Optional[int]:
+        if not self.index_path.exists():
+            return None
+        with self.index_path.open("rb") as f:
+            data = f.read(_HEADER.size)
+        if len(data) != _HEADER.size:
+            return None
+        magic, csv_size = _HEADER.unpack(data)
+        return csv_size if magic == _MAGIC else None
+
+    def __len__(self) -> int:
+        if not self.index_path.exists():
+            return 0
+        return (self.index_path.stat().st_size - _HEADER.size) // _RECORD.size
+
+    def record(self, position: int) -> Tuple[str, int, int]:
+        """position번째 레코드 (키, 오프셋, 길이)를 반환합니다."""
+        if position < 0:
+            position += len(self)
+        with self.index_path.open("rb") as f:
+            f.seek(_HEADER.size + position * _RECORD.size)
+            key, offset, length = _RECORD.unpack(f.read(_RECORD.size))
+        return key.rstrip(b"\0").decode("utf-8"), offset, length
+
+    def _index_from(self, offset: int, position: int) -> None:
+        """CSV의 offset부터 끝까지 읽어 position번째 레코드 이후를 다시 씁니다."""
+        with self.csv_path.open("rb") as f:
+            f.seek(offset)
+            tail = f.read()
+        if offset == 0:
+            # 첫 줄은 헤더이므로 인덱스에 넣지 않습니다.
+            header_end = tail.find(b"\n") + 1 if b"\n" in tail else len(tail)
+            offset, tail = header_end, tail[header_end:]
+        records = []
+        for line in tail.splitlines(keepends=True):
+            if line.strip():
+                key = line.split(b",", 1)[0].decode("utf-8")
+                records.append(_RECORD.pack(_encode_key(key), offset, len(line)))
+            offset += len(line)
+        with self.index_path.open("r+b") as f:
+            f.truncate(_HEADER.size + position * _RECORD.size)
+            f.seek(0, os.SEEK_END)
+            f.write(b"".join(records))
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, offset))
+
+    def sync(self) -> None:
+        """인덱스를 CSV 파일의 현재 상태에 맞춥니다."""
+        csv_size = self.csv_path.stat().st_size if self.csv_path.exists() else 0
+        indexed_size = self._read_header()
+        if indexed_size is not None and indexed_size <= csv_size:
+            count = len(self)
+            if count == 0 or self._record_matches(count - 1):
+                if indexed_size < csv_size:
+                    self._index_from(indexed_size, count)
+                return
+        self.index_path.write_bytes(_HEADER.pack(_MAGIC, 0))
+        if csv_size:
+            self._index_from(0, 0)
+
+    def _record_matches(self, position: int) -> bool:
+        key, offset, length = self.record(position)
+        with self.csv_path.open("rb") as f:
+            f.seek(offset)
+            line = f.read(length)
+        return line.split(b",", 1)[0] == key.encode("utf-8") and line.endswith(b"\n")
+
+    # --- 조회 ---------------------------------------------------------------
+
+    def _lower_bound(self, key: str) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            mid = (low + high) // 2
+            if self.record(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def find(self, key: str) -> Optional[int]:
+        """키와 정확히 일치하는 레코드 위치를 반환합니다."""
+        position = self._lower_bound(key)
+        if position < len(self) and self.record(position)[0] == key:
+            return position
+        return None
+
+    def has_prefix(self, prefix: str) -> bool:
+        """prefix로 시작하는 키(예: 날짜 'YYYY-MM-DD')가 있으면 True."""
+        position = self._lower_bound(prefix)
+        return position < len(self) and self.record(position)[0].startswith(prefix)
+
+    def latest(self) -> Optional[Tuple[str, int, int]]:
+        """가장 마지막 레코드 (키, 오프셋, 길이)를 반환합니다."""
+        return self.record(-1) if len(self) else None
+
+    def read_row(self, position: int) -> List[str]:
+        _, offset, length = self.record(position)
+        with self.csv_path.open("rb") as f:
+            f.seek(offset)
+            line = f.read(length)
+        return next(csv.reader([line.decode("utf-8")]))
+
+    def latest_row(self) -> Optional[List[str]]:
+        return self.read_row(-1) if len(self) else None
+
+    # --- 쓰기 ---------------------------------------------------------------
+
+    def append(self, row: List[str], header: List[str] = LOG_HEADER) -> None:
+        """행을 CSV 끝에 붙이고 인덱스 레코드를 하나 추가합니다."""
+        with file_lock(self.csv_path) as fd:
+            self._append(fd, row, header)
+
+    def _append(self, fd: int, row: List[str], header: List[str]) -> None:
+        # 호출하는 쪽이 file_lock을 잡고 있어야 합니다.
+        self.sync()
+        data = _format_row(row)
+        size = os.fstat(fd).st_size
+        prefix = _format_row(header) if size == 0 else b""
+        offset = size + len(prefix)
+        os.write(fd, prefix + data)
+        with self.index_path.open("r+b") as f:
+            f.seek(0, os.SEEK_END)
+            f.write(_RECORD.pack(_encode_key(row[0]), offset, len(data)))
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, offset + len(data)))
+
+    def upsert(self, row: List[str], header: List[str] = LOG_HEADER) -> bool:
+        """
+        같은 키의 행이 있으면 교체하고, 없으면 키 순서에 맞는 자리에 넣습니다.
+        마지막 행 교체나 끝에 붙이기는 파일 끝만 다시 쓰고,
+        중간 삽입은 그 지점 이후만 다시 씁니다.
+        다른 writer와 겹치지 않도록 파일 잠금을 잡은 채로 수행합니다.
+
+        Returns:
+            bool: 기존 행을 교체했으면 True, 새로 추가했으면 False.
+        """
+        with file_lock(self.csv_path) as fd:
+            return self._upsert(fd, row, header)
+
+    def merge_latest(
+        self,
+        merge: Callable[[Optional[List[str]]], Optional[List[str]]],
+        header: List[str] = LOG_HEADER,
+    ) -> Optional[bool]:
+        """
+        파일 잠금을 잡은 채 마지막 행(없으면 None)을 merge에 넘기고, 돌려받은 행을 upsert합니다.
+        읽고 고쳐 쓰는 사이에 다른 writer가 끼어들지 않습니다. merge가 None을 돌려주면
+        아무것도 쓰지 않고 None을 반환합니다.
+        """
+        with file_lock(self.csv_path) as fd:
+            self.sync()
+            row = merge(self.latest_row())
+            if row is None:
+                return None
+            return self._upsert(fd, row, header)
+
+    def _upsert(self, fd: int, row: List[str], header: List[str]) -> bool:
+        self.sync()
+        key = row[0]
+        latest = self.latest()
+        if latest is None or latest[0] < key:
+            self._append(fd, row, header)
+            return False
+
+        position = self._lower_bound(key)
+        replaced = self.record(position)[0] == key
+        _, offset, _ = self.record(position)
+        with self.csv_path.open("r+b") as f:
+            f.seek(offset)
+            tail = f.read()
+            lines = tail.splitlines(keepends=True)
+            if replaced:
+                lines = lines[1:]
+            f.seek(offset)
+            f.truncate()
+            f.write(_format_row(row) + b"".join(lines))
+        self._index_from(offset, position)
+        return replaced
@@ -0,0 +1,397 @@
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+METRICS_DIR_ENV: str = "KIMCHI_GOLD_METRICS_DIR"  # 설정하면 수집 후 지표 파일을 씁니다.
+TEXTFILE_NAME: str = "kimchi_gold.prom"
+EVENTS_NAME: str = "kimchi_gold_fetch.jsonl"
+
+# 초 단위 지연 시간 구간 (Prometheus 기본값에 긴 꼬리를 더했습니다)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    body = ",".join(f'{name}="{value}"' for name, value in items)
+    return "{" + body + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = "counter"
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in items]
+
+
+class Gauge(Counter):
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self.kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram:
+    """
+    고정 구간 히스토그램입니다. observe는 구간 이진 탐색과 정수 증가뿐이라 비용이 작습니다.
+    """
+
+    def __init__(
+        self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = "histogram"
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[position] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(_label_key(labels), []))
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """구간 상한으로 근사한 분위수. 관측이 없으면 nan."""
+        counts = self._counts.get(_label_key(labels))
+        if not counts or not sum(counts):
+            return float("nan")
+        target = q * sum(counts)
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._counts.items())
+            sums = dict(self._sums)
+        for key, counts in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', le))} {running}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {sums[key]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {running}")
+        return lines
+
+
+class Registry:
+    """프로세스 안의 지표 모음. Prometheus textfile 형식으로 내보냅니다."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """node_exporter textfile collector가 반쯤 쓴 파일을 읽지 않도록 원자적으로 씁니다."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Registry()
+
+
+# --- 요청 단위 계측 -----------------------------------------------------------
+
+
+@dataclass
+class FetchEvent:
+    """get_price_from_naver 호출 한 번의 측정값 (시간은 초 단위)."""
+
+    url: str
+    instrument: str
+    started_at: float = field(default_factory=time.time)
+    dns: Optional[float] = None  # 새 연결을 맺을 때만 값이 있습니다.
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None  # 요청 시작부터 응답 헤더까지. 캐시 적중이면 None.
+    total: float = 0.0
+    parse: float = 0.0
+    bytes: int = 0
+    retries: int = 0
+    status: Optional[int] = None
+    error: Optional[str] = None
+    cached: bool = False  # TTL 캐시에서 꺼낸 본문이면 True (네트워크 요청 없음).
+    content: Optional[bytes] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.pop("content")
+        return data
+
+
+FetchHook = Callable[[FetchEvent], None]
+FETCH_HOOKS: List[FetchHook] = []
+_current = threading.local()
+
+
+def instrument_name(url: str) -> str:
+    """URL 마지막 경로 조각을 종목 이름으로 씁니다 (예: .../metals/GCcv1 -> GCcv1)."""
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or url
+
+
+def begin_fetch(url: str) -> FetchEvent:
+    """현재 스레드의 측정을 시작합니다. 연결 단계 시간은 TimedHTTPAdapter가 채웁니다."""
+    event = FetchEvent(url=url, instrument=instrument_name(url))
+    _current.event = event
+    return event
+
+
+def bind_event(event: Optional[FetchEvent]) -> None:
+    """다른 스레드(헤지 요청 등)에서 시도한 요청도 같은 FetchEvent에 기록되게 합니다."""
+    _current.event = event
+
+
+def current_event() -> Optional[FetchEvent]:
+    return getattr(_current, "event", None)
+
+
+def add_fetch_hook(hook: FetchHook) -> None:
+    FETCH_HOOKS.append(hook)
+
+
+def remove_fetch_hook(hook: FetchHook) -> None:
+    if hook in FETCH_HOOKS:
+        FETCH_HOOKS.remove(hook)
+
+
+def finish_fetch(event: FetchEvent, registry: Registry = REGISTRY) -> None:
+    """측정을 마치고 지표에 반영한 뒤 등록된 훅을 호출합니다."""
+    _current.event = None
+    latency = registry.histogram("kimchi_gold_fetch_seconds", "Quote fetch latency by phase.")
+    for phase in ("dns", "connect", "tls", "ttfb", "total", "parse"):
+        value = getattr(event, phase)
+        if value is not None:
+            latency.observe(value, instrument=event.instrument, phase=phase)
+    registry.counter(
+        "kimchi_gold_fetch_bytes_total", "Response bytes received."
+    ).inc(event.bytes, instrument=event.instrument)
+    registry.counter(
+        "kimchi_gold_fetch_requests_total", "Quote fetches by outcome."
+    ).inc(instrument=event.instrument, outcome="error" if event.error else "ok")
+    if event.retries:
+        registry.counter(
+            "kimchi_gold_fetch_retries_total", "Retried fetch attempts."
+        ).inc(event.retries, instrument=event.instrument)
+    for hook in list(FETCH_HOOKS):
+        hook(event)
+
+
+class JsonLinesSink:
+    """FetchEvent를 한 줄짜리 JSON으로 파일 끝에 덧붙이는 훅입니다."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: FetchEvent) -> None:
+        line = json.dumps(event.to_dict(), ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+
+# --- 연결 단계 측정 ---------------------------------------------------------
+
+
+class _TimedConnectionMixin:
+    """DNS 조회와 TCP 연결, TLS 협상 시간을 현재 스레드의 FetchEvent에 기록합니다."""
+
+    def _new_conn(self):
+        event = current_event()
+        if event is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        host = self._dns_host
+        try:
+            infos = socket.getaddrinfo(host, self.port, type=socket.SOCK_STREAM)
+        except OSError:
+            # 조회 실패는 원래 경로에서 urllib3 예외로 다시 드러나게 둡니다.
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        event.dns = resolved - start
+        # 이미 조회한 주소로 연결해 DNS를 두 번 묻지 않습니다. TLS SNI는 원래 호스트를 씁니다.
+        # urllib3처럼 조회된 주소를 차례로 시도하므로 첫 주소(예: IPv6)가 막혀도 다음으로 넘어갑니다.
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError:  # NewConnectionError 포함
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        event.connect = time.perf_counter() - resolved
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        event = current_event()
+        if event is not None and event.connect is not None and isinstance(self, HTTPSConnection):
+            event.tls = max(
+                0.0, time.perf_counter() - start - event.connect - (event.dns or 0.0)
+            )
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """연결 단계와 첫 바이트까지의 시간을 재는 requests 어댑터입니다."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        event = current_event()
+        if event is not None:
+            # 본문은 아직 읽지 않았으므로 여기까지가 첫 바이트(헤더)까지의 시간입니다.
+            event.ttfb = time.perf_counter() - start
+            event.status = response.status_code
+        return response
+
+
+# --- 수집기 지표와 내보내기 ---------------------------------------------------
+
+
+def record_collect(duration: float, outcome: str, registry: Registry = REGISTRY) -> None:
+    registry.histogram(
+        "kimchi_gold_collect_seconds", "Duration of one collect_data run."
+    ).observe(duration, outcome=outcome)
+    registry.counter("kimchi_gold_collect_runs_total", "collect_data runs by outcome.").inc(
+        outcome=outcome
+    )
+    if outcome == "ok":
+        registry.gauge(
+            "kimchi_gold_collect_last_success_timestamp_seconds",
+            "Unix time of the last successful collection.",
+        ).set(time.time())
+
+
+def export_from_env(registry: Registry = REGISTRY) -> Optional[Path]:
+    """KIMCHI_GOLD_METRICS_DIR가 설정되어 있으면 Prometheus textfile을 씁니다."""
+    directory = os.environ.get(METRICS_DIR_ENV)
+    if not directory:
+        return None
+    path = Path(directory) / TEXTFILE_NAME
+    registry.write_textfile(path)
+    return path
+
+
+def install_jsonl_from_env() -> Optional[JsonLinesSink]:
+    """KIMCHI_GOLD_METRICS_DIR가 설정되어 있으면 요청별 JSON lines 기록을 켭니다."""
+    directory = os.environ.get(METRICS_DIR_ENV)
+    if not directory:
+        return None
+    for hook in FETCH_HOOKS:
+        if isinstance(hook, JsonLinesSink):
+            return hook
+    sink = JsonLinesSink(Path(directory) / EVENTS_NAME)
+    add_fetch_hook(sink)
+    return sink
@@ -1,7 +1,19 @@
-import re
-from typing import Dict, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, urlsplit
 import requests
-from bs4 import BeautifulSoup
+from kimchi_gold import metrics, profiling
+from kimchi_gold.cache import ResponseCache, cache_from_env
+from kimchi_gold.extract import (
+    DEFAULT_PRICE_REGEX,
+    PRICE_CLASS,
+    extract_price,
+    parse_price,
+)
+from kimchi_gold.policy import DEFAULT_POLICY, Deadline, FetchPolicy, UpstreamError
+from kimchi_gold.premium import compute_premium
 
 HEADERS: Dict[str, str] = {
     "User-Agent": (
@@ -13,46 +25,199 @@ HEADERS: Dict[str, str] = {
     "Referer": "https://m.stock.naver.com/",
 }
 
+DOMESTIC_GOLD_URL: str = "https://m.stock.naver.com/marketindex/metals/M04020000"
+INTERNATIONAL_GOLD_URL: str = "https://m.stock.naver.com/marketindex/metals/GCcv1"
+USD_KRW_URL: str = "https://m.stock.naver.com/marketindex/exchange/FX_USDKRW"
+# calc_kimchi_premium 결과 튜플의 각 값 이름 (JSON 출력, 서버, 알림 규칙에서 씁니다)
+RESULT_FIELDS: Tuple[str, ...] = (
+    "domestic",
+    "international",
+    "international_krw_per_g",
+    "usdkrw",
+    "difference",
+    "premium_percent",
+)
+
+POOL_MAXSIZE: int = 10  # 호스트당 유지할 keep-alive 연결 수
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    프로세스 전체에서 공유하는 keep-alive 세션을 반환합니다.
+    같은 호스트로 가는 요청은 연결 풀을 재사용하므로 TCP/TLS 핸드셰이크를 반복하지 않습니다.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = metrics.TimedHTTPAdapter(
+                pool_connections=4, pool_maxsize=POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
 
 def get_price_from_naver(
-    url: str, error_msg: str, regex: str = r"[\d,]+(?:\.\d+)?"
+    url: str,
+    error_msg: str,
+    regex: str = DEFAULT_PRICE_REGEX,
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+    class_name: str = PRICE_CLASS,
+    policy: Optional[FetchPolicy] = None,
+    deadline: Optional[Deadline] = None,
 ) -> float:
     """
     네이버 금융에서 가격 정보를 추출하는 공통 함수
+    session을 넘기면 해당 세션의 연결 풀을 재사용하고,
+    cache를 넘기면 TTL 안의 응답은 다시 내려받지 않습니다.
+    class_name은 가격이 들어 있는 <strong> 태그의 클래스입니다.
+    요청은 policy(기본 DEFAULT_POLICY)의 제한 시간·재시도·헤지·회로 차단기를 따르며,
+    deadline을 넘기면 그 남은 시간 안에서만 시도합니다.
+    호출마다 단계별 소요 시간과 응답 크기를 metrics에 기록합니다.
     """
-    response = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(response.content, "html.parser")
-    price_tag = soup.find("strong", class_="DetailInfo_price__I_VJn")
+    policy = policy if policy is not None else DEFAULT_POLICY
+    event = metrics.begin_fetch(url)
+    start = time.perf_counter()
+
+    def attempt(timeout) -> bytes:
+        metrics.bind_event(event)
+        if cache is not None:
+            return cache.fetch(url, http, HEADERS, timeout=timeout)
+        response = http.get(url, headers=HEADERS, timeout=timeout)
+        if not response.ok and response.status_code >= 500:
+            message = f"{url}: HTTP {response.status_code}"
+            raise UpstreamError(message, response=response)
+        return response.content
+
+    def on_retry(count: int, error: BaseException) -> None:
+        event.retries = count
+
+    try:
+        http = session if session is not None else requests
+        with profiling.span("fetch.http"):
+            content = policy.call(
+                url, urlparse(url).netloc, attempt, deadline=deadline, on_retry=on_retry
+            )
+        event.bytes = len(content)
+        event.content = content
+        parse_start = time.perf_counter()
+        try:
+            with profiling.span("fetch.parse"):
+                return parse_content(content, error_msg, regex, class_name)
+        finally:
+            event.parse = time.perf_counter() - parse_start
+    except Exception as e:
+        event.error = type(e).__name__
+        raise
+    finally:
+        event.total = time.perf_counter() - start
+        metrics.finish_fetch(event)
+
+
+def parse_content(
+    content: bytes, error_msg: str, regex: str, class_name: str = PRICE_CLASS
+) -> float:
+    price = extract_price(content, regex, class_name)
+    if price is not None:
+        return price
+    # 빠른 추출기가 가격 노드를 찾지 못하면 전체 DOM 파싱으로 다시 시도합니다.
+    # bs4는 이 경로에서만 필요하므로 여기서 불러옵니다.
+    with profiling.span("fetch.parse.bs4"):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser")
+        price_tag = soup.find("strong", class_=class_name)
     if price_tag:
-        text = price_tag.get_text()
-        price = re.search(regex, text)
-        if price:
-            return float(price.group().replace(",", ""))
+        price = parse_price(price_tag.get_text(), regex)
+        if price is not None:
+            return price
     raise ValueError(error_msg)
 
 
+DOMESTIC_GOLD_ERROR: str = "국내 금 가격 정보를 찾을 수 없습니다."
+INTERNATIONAL_GOLD_ERROR: str = "국제 금 가격 정보를 찾을 수 없습니다."
+USD_KRW_ERROR: str = "환율 정보를 찾을 수 없습니다."
+
+
 def get_domestic_gold_price() -> float:
-    url = "https://m.stock.naver.com/marketindex/metals/M04020000"
-    return get_price_from_naver(url, "국내 금 가격 정보를 찾을 수 없습니다.")
+    return get_price_from_naver(DOMESTIC_GOLD_URL, DOMESTIC_GOLD_ERROR)
 
 
 def get_international_gold_price() -> float:
-    url = "https://m.stock.naver.com/marketindex/metals/GCcv1"
-    return get_price_from_naver(url, "국제 금 가격 정보를 찾을 수 없습니다.")
+    return get_price_from_naver(INTERNATIONAL_GOLD_URL, INTERNATIONAL_GOLD_ERROR)
 
 
 def get_usd_krw() -> float:
-    url = "https://m.stock.naver.com/marketindex/exchange/FX_USDKRW"
-    return get_price_from_naver(url, "환율 정보를 찾을 수 없습니다.")
+    return get_price_from_naver(USD_KRW_URL, USD_KRW_ERROR)
+
+
+def rebase(url: str, base_url: str) -> str:
+    """url의 scheme과 호스트를 base_url의 것으로 바꿉니다 (경로와 쿼리는 그대로)."""
+    base = urlsplit(base_url)
+    return urlsplit(url)._replace(scheme=base.scheme, netloc=base.netloc).geturl()
 
 
-def calc_kimchi_premium() -> Tuple[float, float, float, float, float, float]:
-    domestic = get_domestic_gold_price()
-    international = get_international_gold_price()
-    usdkrw = get_usd_krw()
-    international_krw_per_g = (international * usdkrw) / 31.1035
-    difference = domestic - international_krw_per_g
-    premium_percent = (difference / international_krw_per_g) * 100
+def fetch_quotes(
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+    policy: Optional[FetchPolicy] = None,
+    base_url: Optional[str] = None,
+) -> Tuple[float, float, float]:
+    """
+    국내 금, 국제 금, 원/달러 환율 세 시세를 동시에 가져옵니다.
+    세 요청이 하나의 연결 풀을 공유하므로 전체 소요 시간은 가장 느린 요청 하나에 가깝습니다.
+    cache를 넘기지 않으면 KIMCHI_GOLD_CACHE_TTL 환경 변수로 설정한 캐시를 사용합니다.
+    세 요청은 policy.deadline 하나를 함께 나눠 쓰므로 스냅샷 전체가 그 시간을 넘지 않습니다.
+    base_url을 주면 네이버 대신 그 주소(예: archive.ReplayServer)로 같은 경로를 요청합니다.
+
+    Returns:
+        Tuple[float, float, float]: (국내금 원/g, 국제금 달러/온스, 원/달러 환율)
+    """
+    if session is None:
+        session = get_session()
+    if cache is None:
+        cache = cache_from_env()
+    policy = policy if policy is not None else DEFAULT_POLICY
+    deadline = policy.start()
+    targets = [
+        (DOMESTIC_GOLD_URL, DOMESTIC_GOLD_ERROR),
+        (INTERNATIONAL_GOLD_URL, INTERNATIONAL_GOLD_ERROR),
+        (USD_KRW_URL, USD_KRW_ERROR),
+    ]
+    if base_url is not None:
+        targets = [(rebase(url, base_url), error_msg) for url, error_msg in targets]
+    with profiling.span("fetch"), ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = [
+            executor.submit(
+                get_price_from_naver,
+                url,
+                error_msg,
+                session=session,
+                cache=cache,
+                policy=policy,
+                deadline=deadline,
+            )
+            for url, error_msg in targets
+        ]
+        domestic, international, usdkrw = (future.result() for future in futures)
+    return domestic, international, usdkrw
+
+
+def calc_kimchi_premium(
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+    base_url: Optional[str] = None,
+) -> Tuple[float, float, float, float, float, float]:
+    domestic, international, usdkrw = fetch_quotes(session, cache, base_url=base_url)
+    _, international_krw_per_g, difference, premium_percent = compute_premium(
+        domestic, international, usdkrw
+    )
     return (
         domestic,
         international,
@@ -63,15 +228,28 @@ def calc_kimchi_premium() -> Tuple[float, float, float, float, float, float]:
     )
 
 
+async def calc_kimchi_premium_async(
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Tuple[float, float, float, float, float, float]:
+    """asyncio 이벤트 루프를 막지 않도록 calc_kimchi_premium을 워커 스레드에서 실행합니다."""
+    import asyncio  # CLI 시작 시간을 줄이려고 필요할 때만 불러옵니다.
+
+    return await asyncio.to_thread(calc_kimchi_premium, session, cache)
+
+
+def format_premium(result: Tuple[float, float, float, float, float, float]) -> str:
+    """calc_kimchi_premium 결과를 사람이 읽기 좋은 세 줄로 만듭니다."""
+    domestic, _, international_krw_per_g, _, difference, premium_percent = result
+    return "\n".join(
+        [
+            f"국내 금가격         : {domestic:>12,.2f} 원/g",
+            f"국제 금 1g 원화환산 : {international_krw_per_g:>12,.2f} 원/g",
+            f"김치프리미엄        : {difference:>12,.2f} 원/g ({premium_percent:+.2f}%)",
+        ]
+    )
+
+
 if __name__ == "__main__":
-    (
-        domestic,
-        international,
-        international_krw_per_g,
-        usdkrw,
-        difference,
-        premium_percent,
-    ) = calc_kimchi_premium()
-    print(f"국내 금가격         : {domestic:>12,.2f} 원/g")
-    print(f"국제 금 1g 원화환산 : {international_krw_per_g:>12,.2f} 원/g")
-    print(f"김치프리미엄        : {difference:>12,.2f} 원/g ({premium_percent:+.2f}%)")
+    with profiling.session("now"):
+        print(format_premium(calc_kimchi_premium()))
@@ -1,10 +1,16 @@
+import hashlib
+import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from pathlib import Path
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
+from kimchi_gold import profiling
+from kimchi_gold.downsample import downsample_series
+from kimchi_gold.loader import load_log, select_window
+from kimchi_gold.premium import compute_premium
 
 
 class Config:
@@ -13,11 +19,12 @@ class Config:
     여기서는 보고 싶은 데이터 기간과 관련된 설정을 정의합니다.
     """
 
-    MONTHS: int = 12  # 보고 싶은 데이터 기간 (개월 수). 기본값은 12개월입니다.
+    WINDOWS: tuple = (6, 12)  # 한 번에 그릴 기간 목록. None은 전체 기간입니다.
     DATA_FILENAME: str = "kimchi_gold_price_log.csv"  # 사용할 데이터 파일 이름
-    OUTPUT_FILENAME: str = (
-        f"kimchi_gold_price_recent_{MONTHS}months.png"  # 저장할 그래프 파일 이름
-    )
+    FINGERPRINT_FILENAME: str = "plot_fingerprints.json"  # 기간별 데이터 해시 기록
+    RENDER_VERSION: int = 1  # 그래프 모양을 바꾸면 올려서 모든 이미지를 다시 그립니다.
+    DOWNSAMPLE: str = "lttb"  # 점이 Axes 폭보다 많을 때 줄이는 방법 ("lttb", "minmax")
+    MARKER_MAX_DENSITY: float = 0.5  # 픽셀당 점 수가 이보다 많으면 마커를 그리지 않습니다.
 
 
 class FilePaths:
@@ -32,74 +39,125 @@ class FilePaths:
     )  # 프로젝트의 루트 디렉토리 (현재 디렉토리의 두 단계 위)
     DATA_DIR: Path = ROOT_DIR / "data"  # 데이터 폴더 경로
     DATA_FILE: Path = DATA_DIR / Config.DATA_FILENAME  # 실제 데이터 파일 경로
-    OUTPUT_FILE: Path = DATA_DIR / Config.OUTPUT_FILENAME  # 실제 출력 파일 경로
+    FINGERPRINT_FILE: Path = DATA_DIR / Config.FINGERPRINT_FILENAME
+
+
+def output_filename(months: Optional[int]) -> str:
+    """기간에 맞는 그래프 파일 이름을 반환합니다. None은 전체 기간입니다."""
+    if months is None:
+        return "kimchi_gold_price_all.png"
+    return f"kimchi_gold_price_recent_{months}months.png"
 
 
-def load_and_preprocess_data(data_file: Path, months: int) -> pd.DataFrame:
+def period_label(months: Optional[int]) -> str:
+    """그래프 제목에 쓸 기간 문구를 반환합니다."""
+    if months is None:
+        return "All Data"
+    return f"Recent {months} Months"
+
+
+def load_data(data_file: Path, float32: bool = False) -> pd.DataFrame:
     """
-    CSV 파일에서 데이터를 읽어오고, 날짜 형식으로 변환한 뒤,
-    최근 'months' 개월의 데이터만 필터링하는 함수입니다.
+    CSV 파일 전체를 읽어 날짜(DatetimeIndex)를 인덱스로 설정합니다.
+    loader.load_log가 파싱 결과를 캐시하므로 같은 파일을 다시 읽지 않습니다.
 
     Args:
         data_file (Path): 읽어올 CSV 파일의 경로.
-        months (int): 보고 싶은 최근 개월 수.
+        float32 (bool): True면 숫자 열을 float32로 읽습니다.
 
     Returns:
-        pd.DataFrame: 날짜를 인덱스로 가지고 필터링된 데이터프레임.
+        pd.DataFrame: 날짜를 인덱스로 가진 전체 데이터프레임.
 
     Raises:
         FileNotFoundError: 지정된 데이터 파일이 없을 경우 발생합니다.
-        ValueError: 최근 'months' 동안의 데이터가 없을 경우 발생합니다.
     """
-    try:
-        df: pd.DataFrame = pd.read_csv(
-            data_file
-        )  # CSV 파일을 pandas DataFrame으로 읽어옵니다.
-    except FileNotFoundError:
-        raise FileNotFoundError(
-            f"Error: {data_file} not found."
-        )  # 파일이 없으면 에러를 발생시킵니다.
-
-    df["날짜"] = pd.to_datetime(
-        df["날짜"]
-    ).dt.date  # '날짜' 컬럼을 datetime.date 형식으로 변환합니다.
-    df = df.set_index("날짜")  # '날짜' 컬럼을 DataFrame의 인덱스로 설정합니다.
-
-    today: datetime.date = datetime.now().date()  # 현재 날짜를 구합니다.
-    months_ago: datetime.date = today - timedelta(
-        days=months * 30
-    )  # 대략 'months' 개월 전의 날짜를 계산합니다. (정확한 월 계산은 아님)
-    df_period: pd.DataFrame = df[
-        df.index >= months_ago
-    ]  # 인덱스(날짜)를 기준으로 최근 'months' 동안의 데이터를 필터링합니다.
+    return load_log(data_file, float32=float32)
+
 
+def select_recent(df: pd.DataFrame, months: Optional[int]) -> pd.DataFrame:
+    """
+    최근 'months' 개월(달력 기준)의 데이터만 골라냅니다. months가 None이면 전체를 반환합니다.
+
+    Raises:
+        ValueError: 최근 'months' 동안의 데이터가 없을 경우 발생합니다.
+    """
+    df_period = select_window(df, months)  # 정렬된 인덱스를 이진 탐색합니다.
     if df_period.empty:
         raise ValueError(
             f"No data available for the last {months} months."
         )  # 필터링된 데이터가 없으면 에러를 발생시킵니다.
 
-    return df_period  # 필터링된 DataFrame을 반환합니다.
+    return df_period
+
+
+def load_and_preprocess_data(
+    data_file: Path, months: Optional[int], float32: bool = False
+) -> pd.DataFrame:
+    """
+    CSV 파일에서 데이터를 읽어오고, 날짜 형식으로 변환한 뒤,
+    최근 'months' 개월의 데이터만 필터링하는 함수입니다.
+
+    Args:
+        data_file (Path): 읽어올 CSV 파일의 경로.
+        months (Optional[int]): 보고 싶은 최근 개월 수. None은 전체 기간.
+        float32 (bool): True면 숫자 열을 float32로 읽습니다.
+
+    Returns:
+        pd.DataFrame: 날짜를 인덱스로 가지고 필터링된 데이터프레임.
+
+    Raises:
+        FileNotFoundError: 지정된 데이터 파일이 없을 경우 발생합니다.
+        ValueError: 최근 'months' 동안의 데이터가 없을 경우 발생합니다.
+    """
+    return select_recent(load_data(data_file, float32), months)
+
 
+def fingerprint(df: pd.DataFrame, months: Optional[int]) -> str:
+    """
+    그래프에 들어갈 데이터 조각의 해시를 계산합니다.
+    값, 인덱스, 기간, 그래프 버전이 같으면 같은 이미지가 나오므로 다시 그릴 필요가 없습니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"{Config.RENDER_VERSION}:{Config.DOWNSAMPLE}:{months}".encode("utf-8")
+    )
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return digest.hexdigest()
 
-def plot_kimchi_premium(ax: Axes, df: pd.DataFrame, months: int) -> None:
+
+def plot_series(ax: Axes, series: pd.Series, marker: Optional[str], **kwargs) -> None:
+    """
+    시계열을 Axes 폭(픽셀)만큼의 점으로 줄여 그립니다.
+    점이 촘촘해 마커가 서로 겹칠 밀도라면 마커를 끕니다. 그리는 비용이 데이터 크기가
+    아니라 그림 크기에 비례하므로 장중·다년치 데이터도 같은 시간에 그립니다.
+    """
+    width = max(2, int(ax.get_window_extent().width))
+    if len(series) / width > Config.MARKER_MAX_DENSITY:
+        marker = None
+    reduced = downsample_series(series, width, Config.DOWNSAMPLE)
+    ax.plot(reduced.index, reduced.to_numpy(), marker=marker, **kwargs)
+
+
+def plot_kimchi_premium(ax: Axes, df: pd.DataFrame, months: Optional[int]) -> None:
     """
     김치 프리미엄(%) 데이터를 선 그래프로 그리는 함수입니다.
 
     Args:
         ax (Axes): 그래프를 그릴 Matplotlib Axes 객체.
         df (pd.DataFrame): 그래프에 사용할 데이터프레임 (날짜를 인덱스로 가져야 함).
-        months (int): 그래프 제목에 표시할 기간 (개월 수).
+        months (Optional[int]): 그래프 제목에 표시할 기간 (개월 수). None은 전체 기간.
     """
-    ax.plot(
-        df.index,  # x축은 날짜
-        df["김치프리미엄(%)"],  # y축은 김치 프리미엄 (%) 컬럼
+    plot_series(
+        ax,
+        df["김치프리미엄(%)"],  # x축은 날짜, y축은 김치 프리미엄 (%) 컬럼
+        marker="d",  # 데이터 포인트 마커 (diamond)
         label="Kimchi Premium (%)",  # 범례에 표시될 레이블
         color="red",  # 선 색깔
         linestyle="--",  # 선 스타일 (dashed)
-        marker="d",  # 데이터 포인트 마커 (diamond)
     )
     ax.set_ylabel("Kimchi Premium (%)")  # y축 레이블 설정
-    ax.set_title(f"Recent {months} Months: Kimchi Premium (%)")  # 그래프 제목 설정
+    ax.set_title(f"{period_label(months)}: Kimchi Premium (%)")  # 그래프 제목 설정
     ax.legend(loc="upper left")  # 범례 위치 설정 (좌측 상단)
     ax.tick_params(
         axis="x", rotation=45
@@ -113,31 +171,28 @@ def plot_kimchi_premium(ax: Axes, df: pd.DataFrame, months: int) -> None:
     ax.grid(True)  # 격자선 표시
 
 
-def plot_gold_prices(ax: Axes, df: pd.DataFrame, months: int) -> None:
+def plot_gold_prices(ax: Axes, df: pd.DataFrame, months: Optional[int]) -> None:
     """
     국내 금 가격과 국제 금 가격 (환율 조정) 데이터를 선 그래프로 그리는 함수입니다.
 
     Args:
         ax (Axes): 그래프를 그릴 Matplotlib Axes 객체.
         df (pd.DataFrame): 그래프에 사용할 데이터프레임.
-        months (int): 그래프 제목에 표시할 기간 (개월 수).
+        months (Optional[int]): 그래프 제목에 표시할 기간 (개월 수). None은 전체 기간.
     """
-    ax.plot(
-        df.index,
-        df["국내금(원/g)"],
-        label="Domestic Gold (KRW/g)",
-        marker="o",
+    plot_series(ax, df["국내금(원/g)"], marker="o", label="Domestic Gold (KRW/g)")
+    # 국제 금 가격을 원/g 단위로 환산
+    premium = compute_premium(
+        df["국내금(원/g)"], df["국제금(달러/온스)"], df["환율(원/달러)"]
     )
-    ax.plot(
-        df.index,
-        df["국제금(달러/온스)"]
-        * (1 / 31.1035)
-        * df["환율(원/달러)"],  # 국제 금 가격을 원/g 단위로 환산
-        label="International Gold (KRW/g, FX adjusted)",
+    plot_series(
+        ax,
+        premium.international,
         marker="x",
+        label="International Gold (KRW/g, FX adjusted)",
     )
     ax.set_ylabel("Price (KRW/g)")
-    ax.set_title(f"Recent {months} Months: Domestic vs International Gold Price")
+    ax.set_title(f"{period_label(months)}: Domestic vs International Gold Price")
     ax.legend()
     ax.tick_params(axis="x", rotation=45)
     ax.xaxis.set_major_locator(mdates.AutoDateLocator())
@@ -145,24 +200,24 @@ def plot_gold_prices(ax: Axes, df: pd.DataFrame, months: int) -> None:
     ax.grid(True)
 
 
-def plot_exchange_rate(ax: Axes, df: pd.DataFrame, months: int) -> None:
+def plot_exchange_rate(ax: Axes, df: pd.DataFrame, months: Optional[int]) -> None:
     """
     환율(원/달러) 데이터를 선 그래프로 그리는 함수입니다.
 
     Args:
         ax (Axes): 그래프를 그릴 Matplotlib Axes 객체.
         df (pd.DataFrame): 그래프에 사용할 데이터프레임.
-        months (int): 그래프 제목에 표시할 기간 (개월 수).
+        months (Optional[int]): 그래프 제목에 표시할 기간 (개월 수). None은 전체 기간.
     """
-    ax.plot(
-        df.index,
+    plot_series(
+        ax,
         df["환율(원/달러)"],
+        marker="^",
         label="Exchange Rate (KRW/USD)",
         color="purple",
-        marker="^",
     )
     ax.set_ylabel("Exchange Rate (KRW/USD)")
-    ax.set_title(f"Recent {months} Months: Exchange Rate Trend")
+    ax.set_title(f"{period_label(months)}: Exchange Rate Trend")
     ax.legend()
     ax.tick_params(axis="x", rotation=45)
     ax.xaxis.set_major_locator(mdates.AutoDateLocator())
@@ -170,27 +225,10 @@ def plot_exchange_rate(ax: Axes, df: pd.DataFrame, months: int) -> None:
     ax.grid(True)
 
 
-def main():
+def render_figure(df_period: pd.DataFrame, months: Optional[int], output_file: Path) -> None:
     """
-    메인 실행 함수입니다.
-    데이터를 로드하고 전처리한 후, 세 개의 그래프를 생성하고 저장합니다.
+    세 개의 그래프를 하나의 이미지로 그려 저장합니다.
     """
-    FilePaths.DATA_DIR.mkdir(
-        parents=True, exist_ok=True
-    )  # 데이터 폴더가 없으면 만들고, 있으면 무시합니다.
-
-    try:
-        df_period: pd.DataFrame = load_and_preprocess_data(
-            FilePaths.DATA_FILE, Config.MONTHS
-        )
-        # 데이터를 로드하고 최근 'Config.MONTHS' 기간으로 필터링합니다.
-    except FileNotFoundError as e:
-        print(e)  # 파일이 없을 경우 에러 메시지를 출력하고 프로그램을 종료합니다.
-        return
-    except ValueError as e:
-        print(e)  # 데이터가 없을 경우 에러 메시지를 출력하고 프로그램을 종료합니다.
-        return
-
     plt.style.use("seaborn-v0_8-whitegrid")  # Matplotlib 스타일을 설정합니다.
     fig: Figure
     axes: list[Axes]
@@ -199,25 +237,118 @@ def main():
     plt.subplots_adjust(hspace=0.5)  # 서브플롯 간의 수직 간격을 조정합니다.
 
     plot_kimchi_premium(
-        axes[0], df_period, Config.MONTHS
+        axes[0], df_period, months
     )  # 첫 번째 서브플롯에 김치 프리미엄 그래프를 그립니다.
     plot_gold_prices(
-        axes[1], df_period, Config.MONTHS
+        axes[1], df_period, months
     )  # 두 번째 서브플롯에 금 가격 그래프를 그립니다.
     plot_exchange_rate(
-        axes[2], df_period, Config.MONTHS
+        axes[2], df_period, months
     )  # 세 번째 서브플롯에 환율 그래프를 그립니다.
 
     plt.tight_layout()  # 서브플롯들이 겹치지 않도록 레이아웃을 조정합니다.
-    plt.savefig(FilePaths.OUTPUT_FILE)  # 생성된 그래프를 이미지 파일로 저장합니다.
+    with profiling.span("render.savefig"):
+        fig.savefig(output_file)  # 생성된 그래프를 이미지 파일로 저장합니다.
+    plt.close(fig)  # 여러 기간을 연달아 그리므로 Figure 메모리를 바로 해제합니다.
+
+
+def render_windows(
+    windows: Sequence[Optional[int]] = Config.WINDOWS,
+    data_file: Path = FilePaths.DATA_FILE,
+    output_dir: Path = FilePaths.DATA_DIR,
+    fingerprint_file: Optional[Path] = None,
+    force: bool = False,
+) -> Dict[str, Optional[bool]]:
+    """
+    데이터를 한 번만 읽어 여러 기간의 그래프를 그립니다.
+    기간별 데이터 해시가 지난번과 같고 이미지가 남아 있으면 그리지 않고 건너뜁니다.
+
+    Args:
+        windows (Sequence[Optional[int]]): 그릴 기간(개월 수) 목록. None은 전체 기간.
+        data_file (Path): 읽어올 CSV 파일의 경로.
+        output_dir (Path): 이미지를 저장할 폴더.
+        fingerprint_file (Optional[Path]): 해시 기록 파일. 기본은 output_dir 안의 파일입니다.
+        force (bool): True면 해시와 상관없이 모두 다시 그립니다.
+
+    Returns:
+        Dict[str, Optional[bool]]: 이미지 파일 이름별로 새로 그렸으면 True, 변경이 없어
+            건너뛰었으면 False, 그 기간에 데이터가 없어 그리지 못했으면 None.
+
+    Raises:
+        FileNotFoundError: 지정된 데이터 파일이 없을 경우 발생합니다.
+    """
+    if fingerprint_file is None:
+        fingerprint_file = output_dir / Config.FINGERPRINT_FILENAME
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fingerprints: Dict[str, str] = {}
+    if fingerprint_file.exists():
+        fingerprints = json.loads(fingerprint_file.read_text(encoding="utf-8"))
+
+    with profiling.span("load"):
+        df: pd.DataFrame = load_data(data_file)  # 모든 기간이 같은 데이터를 공유합니다.
+    results: Dict[str, Optional[bool]] = {}
+    try:
+        for months in windows:
+            filename = output_filename(months)
+            try:
+                df_period = select_recent(df, months)
+            except ValueError:
+                results[filename] = None  # 이 기간만 건너뛰고 나머지 기간은 그립니다.
+                continue
+            output_file = output_dir / filename
+            digest = fingerprint(df_period, months)
+            if not force and fingerprints.get(filename) == digest and output_file.exists():
+                results[filename] = False
+                continue
+            with profiling.span("render"):
+                render_figure(df_period, months, output_file)
+            fingerprints[filename] = digest
+            results[filename] = True
+    finally:
+        # 중간에 렌더링이 실패해도 이미 그린 기간은 다음 실행에서 다시 그리지 않습니다.
+        if any(results.values()):
+            fingerprint_file.write_text(
+                json.dumps(fingerprints, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+            )
+    return results
+
+
+def status_label(rendered: Optional[bool]) -> str:
+    """render_windows 결과 값을 출력용 문구로 바꿉니다."""
+    if rendered is None:
+        return "데이터 없음, 건너뜀"
+    return "저장" if rendered else "변경 없음, 건너뜀"
+
+
+def main():
+    """
+    메인 실행 함수입니다.
+    데이터를 한 번 로드한 뒤 Config.WINDOWS의 각 기간 그래프를 생성하고 저장합니다.
+    데이터가 바뀌지 않은 기간의 그래프는 다시 그리지 않습니다.
+    KIMCHI_GOLD_PROFILE이 설정되어 있으면 단계별 소요 시간 보고서를 data/profiles에 남깁니다.
+    """
+    with profiling.session("plot"):
+        _main()
+
+
+def _main() -> None:
+    FilePaths.DATA_DIR.mkdir(
+        parents=True, exist_ok=True
+    )  # 데이터 폴더가 없으면 만들고, 있으면 무시합니다.
+
+    try:
+        results = render_windows(Config.WINDOWS)
+    except FileNotFoundError as e:
+        print(e)  # 파일이 없을 경우 에러 메시지를 출력하고 프로그램을 종료합니다.
+        return
+
+    for filename, rendered in results.items():
+        print(f"{FilePaths.DATA_DIR / filename}: {status_label(rendered)}")
 
 
 if __name__ == "__main__":
     try:
         main()  # main 함수를 실행합니다.
-        print(
-            f"{Config.MONTHS}개월 그래프가 성공적으로 {FilePaths.OUTPUT_FILE}에 저장되었습니다"
-        )
     except Exception as e:
         print(
             f"시각화 실패: {e}"
@@ -0,0 +1,294 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional, Tuple, TypeVar, Union
+import requests
+
+T = TypeVar("T")
+Timeout = Union[float, Tuple[float, float]]
+
+HEDGE_MIN_SAMPLES: int = 20  # p95를 믿을 수 있을 만큼 쌓이기 전에는 헤지하지 않습니다.
+LATENCY_WINDOW: int = 200  # 키마다 최근 몇 건으로 p95를 계산할지
+
+
+class DeadlineExceeded(TimeoutError):
+    """스냅샷 전체에 주어진 시간을 다 썼을 때 발생합니다."""
+
+
+class CircuitOpenError(RuntimeError):
+    """상류 서버가 연달아 실패해 회로가 열려 있는 동안 즉시 발생합니다."""
+
+
+class UpstreamError(requests.RequestException):
+    """5xx 응답. 재시도와 회로 차단기 집계 대상입니다."""
+
+
+class Deadline:
+    """스냅샷 하나에 허용된 남은 시간을 추적합니다."""
+
+    def __init__(
+        self, seconds: Optional[float], clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        self.at = None if seconds is None else clock() + seconds
+
+    def remaining(self) -> float:
+        if self.at is None:
+            return float("inf")
+        return self.at - self._clock()
+
+    def check(self) -> float:
+        """남은 시간을 반환합니다. 다 썼으면 DeadlineExceeded."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("스냅샷 제한 시간을 넘었습니다.")
+        return remaining
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 reset_timeout초 동안 호출을 막습니다(open).
+    그 뒤 한 번의 시험 호출(half-open)이 성공하면 다시 닫고, 실패하면 다시 엽니다.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지. half-open에서는 시험 호출 하나만 통과시킵니다."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial = False
+
+
+class LatencyTracker:
+    """키(종목 URL)별 최근 지연 시간으로 p95를 계산합니다."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def quantile(self, key: str, q: float = 0.95) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+        return _hedge_pool
+
+
+def _wait_timeout(deadline: Deadline) -> Optional[float]:
+    """concurrent.futures.wait에 넘길 제한 시간. deadline이 없으면 None(무기한)입니다."""
+    remaining = deadline.remaining()
+    return None if math.isinf(remaining) else remaining
+
+
+@dataclass
+class FetchPolicy:
+    """
+    시세 요청 한 건의 시간 예산과 재시도 규칙입니다.
+
+    Attributes:
+        timeout: 시도마다 적용할 (연결, 읽기) 제한 시간(초).
+            남은 deadline보다 길면 줄입니다.
+        retries (int): 네트워크 오류·5xx에 대한 추가 시도 횟수.
+        backoff (float): 재시도 대기의 기준 시간.
+            대기는 [0, backoff * 2**n] 사이에서 무작위로 고릅니다.
+        max_backoff (float): 한 번 대기의 상한.
+        deadline (Optional[float]): fetch_quotes 한 번(스냅샷)에 허용하는 전체 시간.
+        hedge (bool): 첫 시도가 그 URL의 p95 지연을 넘기면 두 번째 요청을 보내고
+            먼저 끝난 쪽을 씁니다.
+        breaker_threshold / breaker_reset: 호스트별 회로 차단기 설정.
+    """
+
+    timeout: Timeout = (3.05, 10.0)
+    retries: int = 2
+    backoff: float = 0.2
+    max_backoff: float = 2.0
+    deadline: Optional[float] = 30.0
+    hedge: bool = True
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+    sleep: Callable[[float], None] = time.sleep
+    latencies: LatencyTracker = field(default_factory=LatencyTracker)
+    _breakers: Dict[str, CircuitBreaker] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_reset
+                )
+            return breaker
+
+    def start(self) -> Deadline:
+        """스냅샷 하나의 deadline을 시작합니다."""
+        return Deadline(self.deadline)
+
+    def attempt_timeout(self, deadline: Deadline) -> Timeout:
+        remaining = deadline.check()
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return (min(connect, remaining), min(read, remaining))
+        return min(self.timeout, remaining)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """full jitter: 여러 수집기가 같은 순간에 다시 몰리지 않게 대기를 흩뜨립니다."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def call(
+        self,
+        key: str,
+        host: str,
+        func: Callable[[Timeout], T],
+        deadline: Optional[Deadline] = None,
+        on_retry: Optional[Callable[[int, BaseException], None]] = None,
+    ) -> T:
+        """
+        func(timeout)을 정책에 따라 실행합니다.
+
+        네트워크 오류(requests.RequestException)만 재시도하며, 파싱 실패 같은
+        다른 예외는 그대로 올립니다. 회로가 열려 있으면 요청을 보내지 않고
+        CircuitOpenError를 냅니다.
+        """
+        if deadline is None:
+            deadline = self.start()
+        breaker = self.breaker(host)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"{host} 회로가 열려 있어 요청을 건너뜁니다.")
+            timeout = self.attempt_timeout(deadline)
+            start = time.perf_counter()
+            # half-open의 시험 호출은 하나뿐이어야 하므로 회로가 닫혀 있을 때만 헤지합니다.
+            hedge = self.hedge and breaker.state == "closed"
+            try:
+                result = self._hedged(key, func, timeout, deadline, hedge)
+            except requests.RequestException as e:
+                breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                if delay >= deadline.remaining():
+                    raise
+                attempt += 1
+                if on_retry is not None:
+                    on_retry(attempt, e)
+                self.sleep(delay)
+                continue
+            except Exception:
+                # 응답은 받았으므로 상류는 살아 있습니다.
+                breaker.record_success()
+                raise
+            breaker.record_success()
+            self.latencies.observe(key, time.perf_counter() - start)
+            return result
+
+    def _hedged(
+        self,
+        key: str,
+        func: Callable[[Timeout], T],
+        timeout: Timeout,
+        deadline: Deadline,
+        hedge: bool = True,
+    ) -> T:
+        hedge_after = self.latencies.quantile(key) if hedge else None
+        if hedge_after is not None and hedge_after >= deadline.remaining():
+            hedge_after = None
+        if hedge_after is None and deadline.at is None:
+            return func(timeout)
+        # 읽기 제한 시간은 recv 한 번마다 걸리므로, 조금씩 흘려보내는 상류는
+        # 그것만으로 멈추지 않습니다. 요청을 풀에서 돌리고 스냅샷 deadline까지만 기다립니다.
+        pool = _get_hedge_pool()
+        primary: Future = pool.submit(func, timeout)
+        if hedge_after is None:
+            done, _ = wait([primary], timeout=_wait_timeout(deadline))
+            if not done:
+                raise requests.Timeout("요청이 스냅샷 제한 시간 안에 끝나지 않았습니다.")
+            return primary.result()
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+        secondary: Future = pool.submit(func, timeout)
+        pending = {primary, secondary}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending, timeout=_wait_timeout(deadline), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                raise requests.Timeout("헤지한 요청이 스냅샷 제한 시간 안에 끝나지 않았습니다.")
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+
+DEFAULT_POLICY: FetchPolicy = FetchPolicy()
@@ -0,0 +1,88 @@
+from typing import Any, Dict, NamedTuple
+
+TROY_OUNCE_GRAMS: float = 31.1035
+# 단위 이름 -> 그램 수. 국내 시세는 원/g으로 들어온다고 보고 이 단위로 환산해 돌려줍니다.
+UNIT_GRAMS: Dict[str, float] = {
+    "g": 1.0,
+    "don": 3.75,  # 한 돈
+    "kg": 1000.0,
+}
+
+
+class Premium(NamedTuple):
+    """
+    compute_premium 결과. 스칼라를 넣으면 float, 배열을 넣으면 배열(또는 Series)입니다.
+    가격 필드는 모두 요청한 단위(원/unit) 기준입니다.
+    """
+
+    domestic: Any  # 국내 금 (원/unit)
+    international: Any  # 국제 금 원화 환산 (원/unit)
+    difference: Any  # 김치 프리미엄 (원/unit)
+    percent: Any  # 김치 프리미엄 (%), 단위와 무관
+
+
+def _is_array(value: Any) -> bool:
+    return hasattr(value, "__array__")
+
+
+def compute_premium(
+    domestic: Any, international: Any, usdkrw: Any, unit: str = "g"
+) -> Premium:
+    """
+    국내 금(원/g), 국제 금(달러/온스), 원/달러 환율로 김치 프리미엄 관련 값을 계산합니다.
+
+    스칼라는 순수 파이썬으로 계산하므로 numpy를 불러오지 않습니다. NumPy 배열이나
+    pandas Series를 넣으면 전체를 배열 연산 한 번으로 계산하며, 결과 버퍼에 제자리
+    연산을 해서 중간 배열을 만들지 않습니다. Series 입력은 같은 인덱스의 Series로 돌려줍니다.
+
+    Args:
+        domestic: 국내 금 가격 (원/g).
+        international: 국제 금 가격 (달러/트로이온스).
+        usdkrw: 원/달러 환율.
+        unit (str): 결과 가격 단위. UNIT_GRAMS의 키 ("g", "don", "kg").
+
+    Returns:
+        Premium: (국내, 국제 원화 환산, 차이, 퍼센트).
+    """
+    try:
+        grams = UNIT_GRAMS[unit]
+    except KeyError:
+        choices = ", ".join(UNIT_GRAMS)
+        raise ValueError(f"지원하지 않는 단위입니다: {unit!r} ({choices})")
+
+    if not any(_is_array(value) for value in (domestic, international, usdkrw)):
+        international_krw = international * usdkrw * (grams / TROY_OUNCE_GRAMS)
+        domestic_krw = domestic * grams
+        difference = domestic_krw - international_krw
+        percent = difference / international_krw * 100
+        return Premium(domestic_krw, international_krw, difference, percent)
+
+    import numpy as np
+
+    # pandas Series가 섞여 있으면 첫 Series의 인덱스를 결과에 붙입니다.
+    index = next(
+        (
+            value.index
+            for value in (domestic, international, usdkrw)
+            if _is_array(value) and hasattr(value, "index")
+        ),
+        None,
+    )
+    dom = np.asarray(domestic, dtype=np.float64)
+    intl = np.asarray(international, dtype=np.float64)
+    fx = np.asarray(usdkrw, dtype=np.float64)
+
+    international_krw = np.multiply(intl, fx)
+    international_krw *= grams / TROY_OUNCE_GRAMS
+    domestic_krw = dom * grams if grams != 1.0 else np.array(dom, dtype=np.float64)
+    difference = np.subtract(domestic_krw, international_krw)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.divide(difference, international_krw)
+    percent *= 100
+
+    if index is not None:
+        import pandas as pd
+
+        columns = (domestic_krw, international_krw, difference, percent)
+        return Premium(*(pd.Series(values, index=index) for values in columns))
+    return Premium(domestic_krw, international_krw, difference, percent)
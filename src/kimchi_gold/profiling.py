@@ -0,0 +1,361 @@
+"""
+수집·조회·그래프 실행이 어디서 시간을 쓰는지 남기는 선택적 프로파일링 모드입니다.
+
+KIMCHI_GOLD_PROFILE을 설정하면 collect, now, plot 실행 하나마다 보고서(JSON)를
+data/profiles (또는 KIMCHI_GOLD_PROFILE_DIR)에 남깁니다. 값은 쉼표로 구분한 모드입니다.
+
+    spans   이름 붙인 단계(span)별 호출 수·누적·최대 시간 (1, on도 같은 뜻, 항상 켜짐)
+    cpu     cProfile로 함수별 누적 시간 상위 목록과 .prof 파일 (pstats/snakeviz로 열기)
+    mem     tracemalloc으로 최대 할당량, 단계별 최대 할당량, 할당이 가장 많았던 단계
+            경계에서 살아 있던 메모리를 많이 잡은 코드 줄
+    all     위 셋 모두
+
+설정하지 않으면 span()은 아무 일도 하지 않는 컨텍스트 관리자를 돌려주므로 계측 지점을
+코드에 남겨 두어도 비용이 거의 없습니다. cProfile과 tracemalloc은 켤 때만 불러옵니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PROFILE_ENV: str = "KIMCHI_GOLD_PROFILE"  # 설정하면 실행마다 프로파일 보고서를 씁니다.
+PROFILE_DIR_ENV: str = "KIMCHI_GOLD_PROFILE_DIR"
+PROFILE_DIR: Path = Path(__file__).resolve().parent.parent.parent / "data" / "profiles"
+MODES: Tuple[str, ...] = ("spans", "cpu", "mem")
+TOP_N: int = 25  # 보고서에 넣을 함수·할당 위치 수
+KEEP_REPORTS: int = 30  # 실행 이름별로 남겨 둘 보고서 수 (오래된 것부터 지웁니다)
+SNAPSHOT_GROWTH: float = 1.05  # 살아 있는 할당량이 이만큼 늘어야 메모리 스냅샷을 새로 찍습니다.
+
+
+def parse_modes(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """KIMCHI_GOLD_PROFILE 값을 모드 튜플로 바꿉니다. 꺼져 있으면 None."""
+    if value is None or value.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    modes = {"spans"}
+    for token in value.lower().split(","):
+        token = token.strip()
+        if token in ("1", "on", "true", "yes", "spans", ""):
+            continue
+        if token == "all":
+            modes.update(MODES)
+        elif token in MODES:
+            modes.add(token)
+        else:
+            raise ValueError(
+                f"{PROFILE_ENV}는 {', '.join(MODES)}, all 중에서 쉼표로 골라야 합니다: {token!r}"
+            )
+    return tuple(mode for mode in MODES if mode in modes)
+
+
+@dataclass
+class SpanStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    first_start: float = 0.0  # 실행 시작부터 처음 들어온 시각 (초)
+    peak_bytes: Optional[int] = None  # mem 모드에서 단계 안의 최대 추가 할당량
+
+
+class Profiler:
+    """
+    실행 하나의 단계별 시간과 (선택적으로) CPU 프로파일, 메모리 추적을 모읍니다.
+    span은 이름별로 합산하므로 fetch_quotes의 워커 스레드처럼 여러 스레드에서 같은
+    이름으로 들어와도 됩니다. cProfile과 단계별 메모리 최대치는 실행을 시작한 스레드만
+    측정합니다 (cProfile은 스레드별로 동작하고 tracemalloc의 최대치는 프로세스 하나뿐입니다).
+    """
+
+    def __init__(self, name: str, modes: Tuple[str, ...] = ("spans",), top: int = TOP_N):
+        self.name = name
+        self.modes = modes
+        self.top = top
+        self.spans: Dict[str, SpanStats] = {}
+        self.notes: List[str] = []
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread = threading.get_ident()
+        self._cpu = None
+        self._owns_tracemalloc = False  # 이 프로파일러가 켠 추적만 끕니다.
+        self._trace_frames: List[List[int]] = []  # 열린 단계마다 [최대 할당량]
+        self._trace_peak = 0
+        self._snapshot_bytes = -1  # 스냅샷을 찍은 시점의 할당량
+        self._snapshot_at: Optional[str] = None
+        self._started_at = datetime.now()
+        self._start = 0.0
+        self._cpu_start = 0.0
+        self.wall = 0.0
+        self.cpu_time = 0.0
+        self._snapshot = None
+
+    @property
+    def tracing(self) -> bool:
+        return "mem" in self.modes
+
+    def start(self) -> None:
+        self._started_at = datetime.now()
+        if self.tracing:
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                self.notes.append("tracemalloc이 이미 켜져 있어 기존 추적을 이어서 씁니다.")
+            else:
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+        if "cpu" in self.modes:
+            import cProfile
+
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._cpu = profile
+            except ValueError as e:  # 다른 프로파일러(디버거, 커버리지 등)가 이미 켜져 있습니다.
+                self.notes.append(f"cProfile을 켜지 못했습니다: {e}")
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def stop(self) -> None:
+        self.wall = time.perf_counter() - self._start
+        self.cpu_time = time.process_time() - self._cpu_start
+        if self._cpu is not None:
+            self._cpu.disable()
+        if self.tracing:
+            import tracemalloc
+
+            self._fold_peak()
+            self._take_snapshot("(end)")
+            if self._owns_tracemalloc:  # 호출한 쪽(예: python -X tracemalloc)의 추적은 둡니다.
+                tracemalloc.stop()
+
+    # --- 단계 ---------------------------------------------------------------
+
+    def _fold_peak(self) -> None:
+        """지금까지의 tracemalloc 최대치를 열린 단계 모두와 실행 전체에 반영합니다."""
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        self._trace_peak = max(self._trace_peak, peak)
+        for frame in self._trace_frames:
+            frame[0] = max(frame[0], peak)
+
+    def _take_snapshot(self, at: str) -> None:
+        """
+        지금 살아 있는 할당량이 이전 스냅샷보다 SNAPSHOT_GROWTH배 넘게 많을 때만 새
+        스냅샷을 찍습니다 (스냅샷 한 번이 추적 중인 할당 수에 비례해 느리기 때문입니다).
+        실행이 끝날 때는 대부분 해제되어 있으므로, 할당이 가장 많았던 단계 경계의
+        스냅샷이 '누가 메모리를 썼는지'를 더 잘 보여줍니다.
+        """
+        import tracemalloc
+
+        current, _ = tracemalloc.get_traced_memory()
+        if current <= self._snapshot_bytes * SNAPSHOT_GROWTH:
+            return
+        self._snapshot_at = at
+        self._snapshot = tracemalloc.take_snapshot()
+        # 스냅샷 객체 자신도 추적되므로, 그만큼을 포함한 값을 다음 비교 기준으로 씁니다.
+        self._snapshot_bytes = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        trace = self.tracing and threading.get_ident() == self._thread
+        if trace:
+            import tracemalloc
+
+            # 단계마다 최대치를 초기화하므로, 초기화 전 값은 바깥 단계들에 먼저 넘겨 둡니다.
+            self._fold_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            frame = [current]
+            self._trace_frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak_bytes = None
+            if trace:
+                self._fold_peak()
+                self._trace_frames.pop()
+                peak_bytes = frame[0] - current
+                self._take_snapshot(name)
+            with self._lock:
+                stats = self.spans.get(name)
+                if stats is None:
+                    stats = self.spans[name] = SpanStats(first_start=start - self._start)
+                stats.calls += 1
+                stats.total += elapsed
+                stats.max = max(stats.max, elapsed)
+                if peak_bytes is not None:
+                    stats.peak_bytes = max(stats.peak_bytes or 0, peak_bytes)
+
+    # --- 보고서 -------------------------------------------------------------
+
+    def _cpu_top(self) -> List[Dict[str, Any]]:
+        import pstats
+
+        stats = pstats.Stats(self._cpu).stats  # type: ignore[attr-defined]
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{filename}:{line}({func})",
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+            for (filename, line, func), (_, calls, tottime, cumtime, _) in rows[: self.top]
+        ]
+
+    def _memory(self) -> Dict[str, Any]:
+        memory: Dict[str, Any] = {"max_rss_bytes": max_rss_bytes()}
+        if self._snapshot is not None:
+            import tracemalloc
+
+            snapshot = self._snapshot.filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                    tracemalloc.Filter(False, __file__),
+                )
+            )
+            memory["traced_peak_bytes"] = self._trace_peak
+            memory["snapshot_at"] = self._snapshot_at
+            memory["top_allocations"] = [
+                {
+                    "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[: self.top]
+            ]
+        return memory
+
+    def report(self) -> Dict[str, Any]:
+        phases = sorted(self.spans.items(), key=lambda item: item[1].first_start)
+        report: Dict[str, Any] = {
+            "name": self.name,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "modes": list(self.modes),
+            "wall_seconds": round(self.wall, 6),
+            "cpu_seconds": round(self.cpu_time, 6),
+            "error": self.error,
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "phases": [
+                {
+                    "name": name,
+                    "calls": stats.calls,
+                    "total_seconds": round(stats.total, 6),
+                    "max_seconds": round(stats.max, 6),
+                    "first_start_seconds": round(stats.first_start, 6),
+                    **({} if stats.peak_bytes is None else {"peak_bytes": stats.peak_bytes}),
+                }
+                for name, stats in phases
+            ],
+            "memory": self._memory(),
+            "notes": self.notes,
+        }
+        if self._cpu is not None:
+            report["cpu"] = {"top_cumulative": self._cpu_top()}
+        return report
+
+    def write(self, directory: Path) -> Path:
+        """보고서를 directory/<이름>-<시작 시각>.json으로 쓰고 경로를 반환합니다."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.name}-{self._started_at.strftime('%Y%m%dT%H%M%S')}"
+        report = self.report()
+        if self._cpu is not None:
+            profile_file = directory / f"{stem}.prof"
+            self._cpu.dump_stats(profile_file)
+            report["cpu"]["profile_file"] = profile_file.name
+        path = directory / f"{stem}.json"
+        path.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        prune_reports(directory, self.name)
+        return path
+
+
+def max_rss_bytes() -> Optional[int]:
+    """프로세스의 최대 상주 메모리(RSS). resource 모듈이 없는 플랫폼(Windows)에서는 None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # 리눅스는 KiB 단위입니다.
+
+
+def prune_reports(directory: Path, name: str, keep: int = KEEP_REPORTS) -> None:
+    """name 실행의 보고서를 최근 keep개만 남기고 지웁니다 (짝이 되는 .prof 포함)."""
+    reports = sorted(directory.glob(f"{name}-*.json"))
+    for old in reports[: max(0, len(reports) - keep)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+_active: Optional[Profiler] = None
+
+
+def active() -> Optional[Profiler]:
+    return _active
+
+
+@contextmanager
+def _noop() -> Iterator[None]:
+    yield
+
+
+def span(name: str):
+    """프로파일링 중이면 name 단계의 시간을 재고, 아니면 아무 일도 하지 않습니다."""
+    profiler = _active
+    if profiler is None:
+        return _noop()
+    return profiler.span(name)
+
+
+def profile_dir_from_env() -> Path:
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    return Path(directory) if directory else PROFILE_DIR
+
+
+@contextmanager
+def session(name: str, modes: Optional[Tuple[str, ...]] = None) -> Iterator[Optional[Profiler]]:
+    """
+    진입점(collect, now, plot) 하나를 감쌉니다. modes를 주지 않으면 KIMCHI_GOLD_PROFILE을
+    읽고, 꺼져 있으면 아무것도 하지 않습니다. 이미 바깥 실행(예: cli.main)을 프로파일링
+    중이면 새 보고서를 만들지 않고 그 실행의 name 단계가 됩니다.
+    본문이 예외로 끝나도 보고서는 남깁니다 (error에 예외 이름이 들어갑니다).
+    """
+    global _active
+    if _active is not None:
+        with _active.span(name):
+            yield _active
+        return
+    if modes is None:
+        modes = parse_modes(os.environ.get(PROFILE_ENV))
+    if modes is None:
+        yield None
+        return
+    profiler = Profiler(name, modes)
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    except BaseException as e:
+        profiler.error = type(e).__name__
+        raise
+    finally:
+        profiler.stop()
+        _active = None
+        try:
+            path = profiler.write(profile_dir_from_env())
+            print(f"프로파일 보고서: {path}", file=sys.stderr)
+        except OSError as e:  # 보고서를 못 써도 본 작업의 결과는 바꾸지 않습니다.
+            print(f"프로파일 보고서 저장 실패: {e}", file=sys.stderr)
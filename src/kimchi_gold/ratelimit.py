@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    초당 rate회로 호출을 제한하는 스레드 안전 토큰 버킷입니다.
+    burst개까지는 연달아 통과시키고, 그 이후 호출은 자기 차례가 올 때까지 기다립니다.
+    대기는 잠금 밖에서 하므로 여러 스레드가 동시에 acquire를 불러도 서로 막지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # 토큰이 모자라면 음수로 빌려 쓰고, 빚을 갚을 시간만큼 기다립니다.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,184 @@
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from kimchi_gold.log_index import INDEX_SUFFIX, LOG_HEADER, LogIndex
+from kimchi_gold.writer import file_lock, format_rows
+
+PERIODS: Tuple[str, ...] = ("weekly", "monthly")
+# 집계할 로그 열과 API에서 쓰는 이름
+ROLLUP_FIELDS: Dict[str, str] = {
+    "김치프리미엄(%)": "premium_percent",
+    "국내금(원/g)": "domestic",
+    "국제금(달러/온스)": "international",
+    "환율(원/달러)": "usdkrw",
+}
+ROLLUP_STATS: Tuple[str, ...] = ("평균", "저가", "고가", "종가")
+STAT_KEYS: Dict[str, str] = dict(zip(ROLLUP_STATS, ("mean", "low", "high", "last")))
+ROLLUP_HEADER: List[str] = ["기간", "마지막날짜", "일수"] + [
+    f"{column}_{stat}" for column in ROLLUP_FIELDS for stat in ROLLUP_STATS
+]
+
+_FIELD_POSITIONS: List[int] = [LOG_HEADER.index(column) for column in ROLLUP_FIELDS]
+
+
+def rollup_path(period: str, data_file: Path) -> Path:
+    """가격 로그 옆의 집계 파일 경로 (예: kimchi_gold_rollup_weekly.csv)."""
+    if period not in PERIODS:
+        raise ValueError(f"period는 {', '.join(PERIODS)} 중 하나여야 합니다: {period!r}")
+    return data_file.with_name(f"kimchi_gold_rollup_{period}.csv")
+
+
+def bucket_start(day: date, period: str) -> date:
+    """day가 속한 구간의 첫날. 주는 월요일, 달은 1일에 시작합니다."""
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _format(value: float) -> str:
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+def merge_row(
+    bucket: Optional[List[str]], row: List[str], period: str
+) -> Optional[List[str]]:
+    """
+    가격 로그 행 하나를 집계 행 bucket에 더한 새 집계 행을 반환합니다.
+    bucket이 다른 구간이거나 None이면 새 구간을 시작합니다. 이미 반영한 날짜(마지막날짜
+    이하)의 행이면 None을 반환해 같은 행을 두 번 세지 않습니다.
+    """
+    key = row[0]
+    start = bucket_start(date.fromisoformat(key[:10]), period).isoformat()
+    values = [float(row[position]) for position in _FIELD_POSITIONS]
+    if bucket is not None and bucket[1] >= key:
+        return None
+    if bucket is None or bucket[0] != start:
+        stats = [_format(value) for value in values for _ in ROLLUP_STATS]
+        return [start, key, "1"] + stats
+    count = int(bucket[2])
+    merged = [start, key, str(count + 1)]
+    for i, value in enumerate(values):
+        mean, low, high, _ = (float(x) for x in bucket[3 + 4 * i : 7 + 4 * i])
+        merged += [
+            _format(mean + (value - mean) / (count + 1)),
+            _format(min(low, value)),
+            _format(max(high, value)),
+            _format(value),
+        ]
+    return merged
+
+
+def update_rollups(row: List[str], data_file: Path) -> None:
+    """
+    collect_data가 로그에 행을 붙인 뒤 부르는 증분 갱신입니다. 구간마다 집계 파일의
+    마지막 행(현재 구간)만 읽고 고쳐 씁니다. 집계 파일이 아직 없으면 로그 전체로
+    한 번 만듭니다 (그 로그에는 방금 붙인 행이 이미 들어 있습니다).
+    """
+    for period in PERIODS:
+        path = rollup_path(period, data_file)
+        if not path.exists():
+            rebuild_rollup(period, data_file)
+            continue
+        LogIndex(path).merge_latest(
+            lambda bucket, period=period: merge_row(bucket, row, period),
+            header=ROLLUP_HEADER,
+        )
+
+
+def compute_rollup(df, period: str):
+    """
+    load_log 형식의 데이터프레임을 구간별 평균·저가·고가·종가로 한 번에 집계합니다.
+    반환하는 데이터프레임의 열은 ROLLUP_HEADER[1:], 인덱스는 구간 첫날입니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    days = df.index.to_numpy().astype("datetime64[D]")
+    if period == "weekly":
+        # 1970-01-01은 목요일이므로 (일수 + 3) % 7이 월요일부터 센 요일입니다.
+        starts = days - (days.astype(np.int64) + 3) % 7
+    else:
+        starts = days.astype("datetime64[M]").astype("datetime64[D]")
+    keys = pd.DatetimeIndex(starts, name=ROLLUP_HEADER[0])
+    grouped = df[list(ROLLUP_FIELDS)].groupby(keys, sort=True)
+    stats = grouped.agg(["mean", "min", "max", "last"])
+    stats.columns = [f"{column}_{stat}" for column in ROLLUP_FIELDS for stat in ROLLUP_STATS]
+    dates = pd.Series(df.index, index=keys).groupby(level=0).max()
+    result = pd.concat(
+        [dates.rename(ROLLUP_HEADER[1]), grouped.size().rename(ROLLUP_HEADER[2]), stats],
+        axis=1,
+    )
+    return result
+
+
+def rebuild_rollup(period: str, data_file: Path) -> int:
+    """가격 로그 전체에서 집계 파일을 새로 만듭니다. 쓴 구간 수를 반환합니다."""
+    from kimchi_gold.loader import load_log
+
+    path = rollup_path(period, data_file)
+    table = compute_rollup(load_log(data_file, columns=list(ROLLUP_FIELDS)), period)
+    rows = [ROLLUP_HEADER]
+    for start, values in zip(table.index, table.itertuples(index=False)):
+        last_day, count, *stats = values
+        daily = last_day == last_day.normalize()
+        last_key = last_day.strftime("%Y-%m-%d" if daily else "%Y-%m-%dT%H:%M:%S")
+        rows.append(
+            [start.strftime("%Y-%m-%d"), last_key, str(count)] + [_format(x) for x in stats]
+        )
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(format_rows(rows))
+    with file_lock(path):
+        os.replace(tmp, path)
+        # 내용이 통째로 바뀌었으므로 사이드카 인덱스는 다음에 처음부터 다시 만듭니다.
+        path.with_name(path.name + INDEX_SUFFIX).unlink(missing_ok=True)
+    return len(rows) - 1
+
+
+def rebuild_rollups(data_file: Path) -> Dict[str, int]:
+    return {period: rebuild_rollup(period, data_file) for period in PERIODS}
+
+
+def load_rollup(period: str, data_file: Path):
+    """
+    집계 파일을 구간 첫날 DatetimeIndex의 데이터프레임으로 읽습니다. 파일이 없으면 만듭니다.
+    몇 년치 기록도 주 단위 수백 행, 달 단위 수십 행이라 원본 로그 전체를 읽지 않습니다.
+    """
+    import pandas as pd
+
+    path = rollup_path(period, data_file)
+    if not path.exists():
+        if not data_file.exists():
+            raise FileNotFoundError(f"Error: {data_file} not found.")
+        rebuild_rollup(period, data_file)
+    df = pd.read_csv(
+        path,
+        dtype={ROLLUP_HEADER[0]: str, ROLLUP_HEADER[1]: str, ROLLUP_HEADER[2]: "int64"},
+    )
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(ROLLUP_HEADER[0]))).rename(
+        ROLLUP_HEADER[0]
+    )
+    return df
+
+
+def rollup_records(df) -> List[Dict[str, object]]:
+    """load_rollup 결과를 JSON으로 내보내기 좋은 dict 목록으로 바꿉니다."""
+    keys = [
+        f"{ROLLUP_FIELDS[column]}_{STAT_KEYS[stat]}"
+        for column in ROLLUP_FIELDS
+        for stat in ROLLUP_STATS
+    ]
+    return [
+        {
+            "date": stamp.date().isoformat(),
+            "until": last,
+            "days": int(days),
+            **dict(zip(keys, values)),
+        }
+        for stamp, last, days, values in zip(
+            df.index,
+            df[ROLLUP_HEADER[1]],
+            df[ROLLUP_HEADER[2]],
+            df[ROLLUP_HEADER[3:]].to_numpy().tolist(),
+        )
+    ]
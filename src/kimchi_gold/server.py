@@ -0,0 +1,303 @@
+import asyncio
+import json
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+from kimchi_gold.collect_price import DATA_FILE
+from kimchi_gold.now_price import RESULT_FIELDS, calc_kimchi_premium
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+DEFAULT_INTERVAL: float = 60.0
+KEEPALIVE_INTERVAL: float = 15.0  # /stream 연결 유지용 주석을 보내는 간격(초)
+MAX_HEADER_BYTES: int = 16 * 1024
+MAX_BODY_BYTES: int = 64 * 1024  # 이보다 큰 요청 본문은 읽어 버리지 않고 연결을 닫습니다.
+HISTORY_KEYS: Tuple[str, ...] = (
+    "domestic",
+    "international",
+    "usdkrw",
+    "difference",
+    "premium_percent",
+)
+
+_REASONS: Dict[int, str] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+def _response(status: int, body: bytes, content_type: str = "application/json") -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Cache-Control: no-store\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+def _finite(value):
+    """JSON에는 NaN/Infinity가 없으므로 비어 있는 로그 값(NaN)은 null로 바꿉니다."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _json(body) -> bytes:
+    return json.dumps(_finite(body), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _error(status: int, message: str) -> bytes:
+    return _response(status, _json({"error": message}))
+
+
+class QuoteServer:
+    """
+    시세를 interval마다 한 번 가져와 메모리에 두고 여러 클라이언트에 나눠 주는 HTTP 서버입니다.
+
+        GET /latest            최신 김치 프리미엄 (JSON)
+        GET /history?window=N  가격 로그의 최근 N개월 (생략하거나 'all'이면 전체)
+            &resolution=weekly|monthly를 붙이면 미리 집계한 주/월 행을 돌려줍니다.
+        GET /stream            갱신될 때마다 최신 값을 보내는 Server-Sent Events
+        GET /health            상태 확인
+
+    클라이언트 수와 상관없이 상류 요청은 갱신 작업 하나만 보냅니다. /latest는 갱신할 때
+    미리 만들어 둔 응답 바이트를 그대로 보내므로 조회할 때 계산이 없습니다.
+
+    Args:
+        host / port: 들을 주소. port 0이면 빈 포트를 고릅니다 (시작 후 self.port).
+        interval (float): 상류 시세를 다시 가져오는 간격(초).
+        fetch: calc_kimchi_premium과 같은 6개 값 튜플을 돌려주는 함수. 워커 스레드에서 부릅니다.
+        data_file (Path): /history가 읽을 가격 로그.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        interval: float = DEFAULT_INTERVAL,
+        fetch: Callable[[], Tuple[float, ...]] = calc_kimchi_premium,
+        data_file: Path = DATA_FILE,
+        keepalive: float = KEEPALIVE_INTERVAL,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.fetch = fetch
+        self.data_file = data_file
+        self.keepalive = keepalive
+        self.latest: Optional[Tuple[float, ...]] = None
+        self.updated_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self._latest_response: bytes = _error(503, "아직 시세를 가져오지 못했습니다.")
+        self._latest_event: Optional[bytes] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    # --- 상류 갱신 -----------------------------------------------------------
+
+    def publish(self, result: Tuple[float, ...], at: Optional[float] = None) -> None:
+        """새 값을 저장하고 /latest 응답을 미리 만들어 둔 뒤 구독자에게 보냅니다."""
+        self.latest = tuple(result)
+        self.updated_at = time.time() if at is None else at
+        payload = dict(zip(RESULT_FIELDS, self.latest))
+        payload["updated_at"] = self.updated_at
+        body = _json(payload)
+        self._latest_response = _response(200, body)
+        self._latest_event = b"data: " + body + b"\n\n"
+        for queue in list(self._subscribers):
+            if queue.full():  # 느린 구독자는 오래된 값을 버리고 최신 값만 받습니다.
+                queue.get_nowait()
+            queue.put_nowait(self._latest_event)
+
+    async def refresh_once(self) -> bool:
+        try:
+            result = await asyncio.to_thread(self.fetch)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"갱신 실패: {self.last_error}")
+            return False
+        self.last_error = None
+        self.refreshes += 1
+        self.publish(result)
+        return True
+
+    async def _refresh_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await self.refresh_once()
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    # --- HTTP ---------------------------------------------------------------
+
+    def _history(self, query: Dict[str, list]) -> bytes:
+        from kimchi_gold.loader import load_log, select_window
+        from kimchi_gold.rollup import PERIODS, load_rollup, rollup_records
+
+        window = query.get("window", ["all"])[0]
+        resolution = query.get("resolution", ["daily"])[0]
+        if resolution != "daily" and resolution not in PERIODS:
+            return _error(400, "resolution은 daily, weekly, monthly 중 하나여야 합니다.")
+        try:
+            months = None if window == "all" else int(window)
+        except ValueError:
+            return _error(400, "window는 개월 수 또는 'all'이어야 합니다.")
+        if months is not None and months <= 0:
+            return _error(400, "window는 1 이상이어야 합니다.")
+        try:
+            if resolution == "daily":
+                df = select_window(load_log(self.data_file), months)
+                rows = [
+                    {"date": stamp.isoformat(), **dict(zip(HISTORY_KEYS, values))}
+                    for stamp, values in zip(df.index, df.to_numpy().tolist())
+                ]
+            else:
+                df = select_window(load_rollup(resolution, self.data_file), months)
+                rows = rollup_records(df)
+        except FileNotFoundError:
+            return _error(404, "가격 로그가 없습니다.")
+        body = {"window": window, "resolution": resolution, "rows": rows}
+        return _response(200, _json(body))
+
+    def _health(self) -> bytes:
+        body = {
+            "ok": self.latest is not None and self.last_error is None,
+            "updated_at": self.updated_at,
+            "refreshes": self.refreshes,
+            "subscribers": len(self._subscribers),
+            "last_error": self.last_error,
+        }
+        return _response(200, _json(body))
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-store\r\n"
+            b"Connection: close\r\n"
+            b"\r\n"
+        )
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        if self._latest_event is not None:
+            queue.put_nowait(self._latest_event)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    event = b": keepalive\n\n"
+                writer.write(event)
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(_error(400, "잘못된 요청입니다."))
+                    return
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (line.partition(":") for line in lines[1:] if line)
+                }
+                keep_alive = (
+                    version != "HTTP/1.0" and headers.get("connection", "").lower() != "close"
+                )
+                # 본문은 쓰지 않지만 남겨 두면 다음 요청 줄로 읽히므로 버립니다.
+                # 길이를 미리 알 수 없거나(chunked) 너무 크면 응답한 뒤 연결을 닫습니다.
+                if "transfer-encoding" in headers:
+                    keep_alive = False
+                elif "content-length" in headers:
+                    try:
+                        length = int(headers["content-length"])
+                    except ValueError:
+                        length = -1
+                    if 0 <= length <= MAX_BODY_BYTES:
+                        try:
+                            await reader.readexactly(length)
+                        except asyncio.IncompleteReadError:
+                            return
+                    else:
+                        keep_alive = False
+                url = urlsplit(target)
+                if method != "GET":
+                    response = _error(405, "GET만 지원합니다.")
+                elif url.path == "/latest":
+                    response = self._latest_response
+                elif url.path == "/history":
+                    response = await asyncio.to_thread(self._history, parse_qs(url.query))
+                elif url.path == "/health":
+                    response = self._health()
+                elif url.path == "/stream":
+                    await self._stream(writer)
+                    return
+                else:
+                    response = _error(404, "없는 경로입니다.")
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    # --- 수명 주기 -----------------------------------------------------------
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"http://{self.host}:{self.port} 에서 시세를 제공합니다. (갱신 간격 {self.interval:g}초)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+
+def serve(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, interval: float = DEFAULT_INTERVAL
+) -> None:
+    """서버를 실행합니다. Ctrl+C로 멈춥니다."""
+    try:
+        asyncio.run(QuoteServer(host, port, interval).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    serve()
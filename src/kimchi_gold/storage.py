@@ -0,0 +1,176 @@
+import csv
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.writer import file_lock
+
+# 파티션 배열의 행 순서. 0번 행은 UTC 기준 epoch 초입니다.
+COLUMNS: Tuple[str, ...] = (
+    "timestamp",
+    "domestic",
+    "international",
+    "usdkrw",
+    "premium_krw",
+    "premium_pct",
+)
+COLUMN_TO_HEADER: Dict[str, str] = dict(zip(COLUMNS, LOG_HEADER))
+PARTITION_PREFIX: str = "kimchi_gold_price_"
+
+
+def _parse_timestamp(text: str) -> float:
+    """'YYYY-MM-DD' 또는 ISO 타임스탬프를 epoch 초로 바꿉니다."""
+    return datetime.fromisoformat(text.strip()).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _format_timestamp(seconds: float) -> str:
+    moment = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    if moment.hour == moment.minute == moment.second == 0:
+        return moment.strftime("%Y-%m-%d")
+    return moment.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _year_of(seconds: np.ndarray) -> np.ndarray:
+    return seconds.astype("datetime64[s]").astype("datetime64[Y]").astype(int) + 1970
+
+
+class ColumnStore:
+    """
+    가격 기록을 연도별 파티션으로 나눠 저장하는 열 지향 바이너리 저장소입니다.
+
+    파티션 하나는 (열 개수, 행 개수) 모양의 float64 .npy 파일입니다.
+    C 순서로 저장되므로 각 열이 연속된 메모리 블록이고, np.load(mmap_mode="r")로
+    텍스트 파싱이나 복사 없이 바로 읽을 수 있습니다. .npy 헤더가 dtype과 모양을 기록합니다.
+
+    새 행을 추가하면 해당 연도의 파티션만 다시 쓰며, 교체는 임시 파일과 os.replace로
+    원자적으로 이루어집니다. CSV는 가져오기/내보내기 형식으로 계속 지원합니다.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def partition_path(self, year: int) -> Path:
+        return self.root / f"{PARTITION_PREFIX}{year}.npy"
+
+    def years(self) -> List[int]:
+        years = []
+        for path in self.root.glob(f"{PARTITION_PREFIX}*.npy"):
+            suffix = path.stem[len(PARTITION_PREFIX) :]
+            if suffix.isdigit():
+                years.append(int(suffix))
+        return sorted(years)
+
+    def read_partition(self, year: int, mmap: bool = True) -> np.ndarray:
+        """연도 파티션을 (열, 행) 배열로 읽습니다. 기본은 읽기 전용 메모리 맵입니다."""
+        return np.load(self.partition_path(year), mmap_mode="r" if mmap else None)
+
+    def partitions(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """(연도, 메모리 맵 배열)을 연도 순으로 돌려줍니다. 데이터를 복사하지 않습니다."""
+        for year in self.years():
+            yield year, self.read_partition(year)
+
+    def load(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        [start, end) 구간의 데이터를 열 이름별 배열로 반환합니다.
+        구간이 파티션 하나에 들어가면 메모리 맵의 슬라이스(뷰)를 그대로 돌려줍니다.
+        """
+        start_ts = start.replace(tzinfo=timezone.utc).timestamp() if start else -np.inf
+        end_ts = end.replace(tzinfo=timezone.utc).timestamp() if end else np.inf
+        pieces = []
+        for year, data in self.partitions():
+            if start is not None and year < start.year:
+                continue
+            if end is not None and year > end.year:
+                continue
+            # 파티션 안의 타임스탬프는 정렬되어 있으므로 이진 탐색으로 자릅니다.
+            low, high = np.searchsorted(data[0], [start_ts, end_ts], side="left")
+            if high > low:
+                pieces.append(data[:, low:high])
+        if not pieces:
+            merged = np.empty((len(COLUMNS), 0))
+        elif len(pieces) == 1:
+            merged = pieces[0]
+        else:
+            merged = np.concatenate(pieces, axis=1)
+        return {name: merged[i] for i, name in enumerate(COLUMNS)}
+
+    def _write_partition(self, year: int, data: np.ndarray) -> None:
+        path = self.partition_path(year)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.save(f, np.ascontiguousarray(data, dtype=np.float64))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def append(self, data: np.ndarray) -> List[int]:
+        """
+        (열, 행) 배열을 추가합니다. 같은 타임스탬프는 새 값으로 덮어씁니다.
+
+        Returns:
+            List[int]: 다시 쓴 파티션 연도 목록.
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[0] != len(COLUMNS):
+            raise ValueError(f"데이터는 ({len(COLUMNS)}, n) 모양이어야 합니다.")
+        years = _year_of(data[0])
+        touched = sorted(set(years.tolist()))
+        for year in touched:
+            path = self.partition_path(year)
+            # 읽고 고쳐 쓰는 동안 다른 수집기가 끼어들면 그쪽 행이 사라지므로 잠급니다.
+            # 파티션은 os.replace로 바뀌므로 파티션 자체가 아니라 옆의 잠금 파일을 잠급니다.
+            with file_lock(path.with_name(path.name + ".lock")):
+                new = data[:, years == year]
+                if path.exists():
+                    new = np.concatenate([self.read_partition(year, mmap=False), new], axis=1)
+                # 타임스탬프 기준으로 정렬하고, 중복은 마지막(새) 값을 남깁니다.
+                order = np.argsort(new[0], kind="stable")
+                new = new[:, order]
+                keep = np.append(new[0, 1:] != new[0, :-1], True)
+                self._write_partition(year, new[:, keep])
+        return touched
+
+    def append_rows(self, rows: List[List[str]]) -> List[int]:
+        """로그 CSV 형식의 문자열 행들을 추가합니다."""
+        if not rows:
+            return []
+        data = np.empty((len(COLUMNS), len(rows)))
+        for j, row in enumerate(rows):
+            data[0, j] = _parse_timestamp(row[0])
+            # 환율 열의 '1323.88 '처럼 공백이 붙은 값도 float()이 처리합니다.
+            data[1:, j] = [float(value) for value in row[1 : len(COLUMNS)]]
+        return self.append(data)
+
+    def import_csv(self, csv_path: Path) -> List[int]:
+        with Path(csv_path).open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 헤더 스킵
+            return self.append_rows([row for row in reader if row])
+
+    def export_csv(self, csv_path: Path) -> None:
+        with Path(csv_path).open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(LOG_HEADER)
+            for _, data in self.partitions():
+                for column in np.asarray(data).T:
+                    writer.writerow(
+                        [_format_timestamp(column[0])]
+                        + [f"{value:.2f}" for value in column[1:]]
+                    )
+
+    def to_frame(self, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """CSV와 같은 열 이름을 가진 pandas DataFrame(DatetimeIndex)으로 반환합니다."""
+        import pandas as pd
+
+        columns = self.load(start, end)
+        index = pd.DatetimeIndex(
+            columns["timestamp"].astype("datetime64[s]"), name=LOG_HEADER[0]
+        )
+        return pd.DataFrame(
+            {COLUMN_TO_HEADER[name]: columns[name] for name in COLUMNS[1:]}, index=index
+        )
@@ -0,0 +1,170 @@
+import csv
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 씁니다.
+    fcntl = None
+
+FSYNC_POLICIES = ("never", "batch", "always")
+DEFAULT_MAX_ROWS: int = 100
+DEFAULT_MAX_DELAY: float = 5.0  # 초. 버퍼에 이보다 오래된 행이 있으면 내보냅니다.
+
+_thread_locks: "dict[str, threading.Lock]" = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    key = str(path.resolve())
+    with _thread_locks_guard:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = _thread_locks[key] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def file_lock(path: Path, create: bool = True) -> Iterator[int]:
+    """
+    path에 대한 배타 잠금을 잡고, 덧붙이기 모드(O_APPEND) 파일 기술자를 넘겨줍니다.
+    같은 프로세스의 스레드는 threading.Lock으로, 다른 프로세스는 flock으로 직렬화합니다.
+    create가 False이고 파일이 없으면 스레드 잠금만 잡고 -1을 넘겨줍니다.
+    """
+    with _thread_lock(path):
+        if not create and not path.exists():
+            yield -1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            os.close(fd)  # 닫으면 flock도 풀립니다.
+
+
+def format_rows(rows: Sequence[Sequence[str]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class LogWriter:
+    """
+    CSV 로그에 행을 모아 두었다가 한꺼번에 덧붙이는 writer입니다.
+
+    flush는 파일 잠금을 잡은 채 파일 크기를 보고 헤더가 필요한지 정한 뒤, 모은 행을
+    write 한 번으로 붙입니다. 그래서 여러 스레드·프로세스가 같은 파일에 써도 줄이
+    섞이거나 헤더가 두 번 들어가지 않습니다.
+
+    Args:
+        path (Path): 기록할 CSV 경로.
+        header (Optional[Sequence[str]]): 빈 파일에 처음 쓸 헤더.
+        max_rows (int): 버퍼가 이만큼 차면 바로 내보냅니다.
+        max_delay (float): 버퍼의 가장 오래된 행이 이 시간(초)보다 오래되면 내보냅니다.
+            다음 write가 오지 않아도 백그라운드 타이머가 그 시간 뒤에 내보냅니다.
+        fsync (str): "never"는 OS에 맡기고, "batch"는 flush마다, "always"는 행마다
+            디스크에 동기화합니다 ("always"는 버퍼링을 끕니다).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        header: Optional[Sequence[str]] = None,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        fsync: str = "batch",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync는 {', '.join(FSYNC_POLICIES)} 중 하나여야 합니다.")
+        self.path = Path(path)
+        self.header = list(header) if header is not None else None
+        self.max_rows = 1 if fsync == "always" else max(1, max_rows)
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 배치가 쓰인 순서를 버퍼 순서와 맞춥니다.
+        self._rows: List[Sequence[str]] = []
+        self._oldest: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def write(self, row: Sequence[str]) -> None:
+        with self._lock:
+            if not self._rows:
+                self._oldest = self._clock()
+            self._rows.append(list(row))
+            due = (
+                len(self._rows) >= self.max_rows
+                or self._clock() - self._oldest >= self.max_delay
+            )
+            if not due and self._timer is None:
+                # 쓰기가 끊겨도 버퍼의 행이 max_delay보다 오래 남지 않게 합니다.
+                self._timer = threading.Timer(self.max_delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def write_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except OSError as e:  # 타이머 스레드에서 난 오류는 호출한 쪽으로 올라가지 않습니다.
+            print(f"로그 쓰기 실패 ({self.path}): {e}")
+
+    def flush(self) -> int:
+        """버퍼의 행을 파일에 붙이고, 붙인 행 수를 반환합니다."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                oldest, self._oldest = self._oldest, None
+                timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+            if not rows:
+                return 0
+            data = format_rows(rows)
+            written = 0
+            try:
+                with file_lock(self.path) as fd:
+                    if self.header is not None and os.fstat(fd).st_size == 0:
+                        data = format_rows([self.header]) + data
+                    view = memoryview(data)
+                    while view:
+                        count = os.write(fd, view)
+                        written += count
+                        view = view[count:]
+                    if self.fsync != "never":
+                        os.fsync(fd)
+            except OSError:
+                if not written:
+                    # 한 바이트도 쓰지 못했으면 행을 버퍼 앞에 되돌려 다음 flush에서 다시 씁니다.
+                    with self._lock:
+                        self._rows[:0] = rows
+                        self._oldest = oldest
+                raise
+            return len(rows)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "LogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
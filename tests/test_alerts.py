@@ -0,0 +1,183 @@
+import json
+import math
+import statistics
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from kimchi_gold import alerts
+from kimchi_gold.alerts import (
+    AlertEngine,
+    FileSink,
+    Rule,
+    WebhookSink,
+    WindowStats,
+    evaluate_from_env,
+    tick_from_result,
+)
+from kimchi_gold.log_index import LOG_HEADER
+
+QUOTE = (150000.0, 3345.0, 150452.5, 1399.0, -452.5, -0.3)
+
+
+def tick(premium=0.0, fx=1400.0):
+    return {"premium_percent": premium, "usdkrw": fx}
+
+
+def test_rule_parses_fields_functions_and_windows():
+    rule = Rule("z", "zscore(premium, 30d) > 2")
+    assert (rule.func, rule.target, rule.window) == ("zscore", "premium_percent", 30 * 86400)
+    assert (rule.op, rule.threshold) == (">", 2.0)
+    plain = Rule("p", "premium_percent >= 3%")
+    assert plain.func is None and plain.threshold == 3.0
+    assert Rule("fx", "move(fx, 1h) > 1%").window == 3600
+    for bad in ("premium ~ 3", "median(premium, 1h) > 1", "gold > 1", "change(fx, 1y) > 1"):
+        with pytest.raises(ValueError):
+            Rule("bad", bad)
+
+
+def test_window_stats_match_direct_computation():
+    stats = WindowStats(10)
+    values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0, 3.0, 5.0, 8.0, 9.0, 7.0]
+    for t, x in enumerate(values):
+        stats.push(float(t), x)
+        window = values[max(0, t - 10) : t + 1]
+        assert len(stats) == len(window)
+        assert stats.mean() == pytest.approx(statistics.mean(window))
+        assert stats.min() == min(window)
+        assert stats.max() == max(window)
+        assert stats.change() == pytest.approx((window[-1] - window[0]) / window[0] * 100)
+        if len(window) > 1:
+            assert stats.std() == pytest.approx(statistics.stdev(window))
+    stats.push(100.0, math.nan)
+    assert len(stats) == 11
+
+
+def test_alert_fires_once_until_condition_clears():
+    sink = []
+    engine = AlertEngine([Rule("high", "premium > 3")], [sink.append])
+    fired = [
+        len(engine.update(tick(p), at=float(t)))
+        for t, p in enumerate([1.0, 3.5, 4.0, 5.0, 2.0, 3.2])
+    ]
+    assert fired == [0, 1, 0, 0, 0, 1]
+    assert [alert.value for alert in sink] == [3.5, 3.2]
+
+
+def test_confirm_and_cooldown_debounce_flapping():
+    engine = AlertEngine([Rule("high", "premium > 3", confirm=2, cooldown=10)])
+    fired = [
+        bool(engine.update(tick(p), at=float(t)))
+        for t, p in enumerate([4.0, 1.0, 4.0, 4.0, 1.0, 4.0, 4.0, 1.0] + [4.0] * 8)
+    ]
+    # 2번 연속에서 처음 알리고(t=3), 10초 안의 재발(t=6)은 거른 뒤 t=13에 다시 알립니다.
+    assert [t for t, hit in enumerate(fired) if hit] == [3, 13]
+
+
+def test_state_file_is_written_only_when_state_changes(tmp_path, monkeypatch):
+    state_file = tmp_path / "state.json"
+    engine = AlertEngine(
+        [Rule("high", "premium > 3", confirm=2), Rule("fx", "fx > 1500")],
+        state_file=state_file,
+    )
+    saves = []
+    save = engine._save_state
+    monkeypatch.setattr(engine, "_save_state", lambda: saves.append(1) or save())
+    for t, p in enumerate([1.0, 1.0, 4.0, 4.0, 4.0, 4.0, 1.0, 1.0]):
+        engine.update(tick(p), at=float(t))
+    # 조건이 처음 맞을 때, 알릴 때, 풀릴 때만 씁니다.
+    assert len(saves) == 3
+    assert json.loads(state_file.read_text())["high"] == {
+        "streak": 0,
+        "active": False,
+        "last_fired": 3.0,
+    }
+
+
+def test_zscore_and_fx_move_rules_use_shared_windows():
+    engine = AlertEngine(
+        [
+            Rule("z", "zscore(premium, 1h) > 2"),
+            Rule("z-mean", "mean(premium, 1h) > 100"),
+            Rule("fx", "move(fx, 1h) > 1%"),
+        ]
+    )
+    assert len(engine._windows) == 2
+    engine.warm((float(t * 60), tick(1.0 + 0.1 * (t % 2))) for t in range(30))
+    fired = engine.update(tick(5.0, 1420.0), at=30 * 60.0)
+    assert sorted(alert.rule for alert in fired) == ["fx", "z"]
+
+
+def test_sinks_receive_alerts_and_failures_are_isolated(tmp_path, capsys):
+    def broken(alert):
+        raise RuntimeError("down")
+
+    path = tmp_path / "alerts.jsonl"
+    engine = AlertEngine([Rule("high", "premium > 3")], [broken, FileSink(path)])
+    engine.update(tick_from_result(QUOTE[:5] + (3.5,)), at=0.0)
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["rule"] == "high"
+    assert record["tick"]["domestic"] == 150000.0
+    assert "알림 전달 실패" in capsys.readouterr().out
+
+
+def test_webhook_sink_posts_in_background():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            received.append(json.loads(self.rfile.read(length)))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        sink = WebhookSink(f"http://127.0.0.1:{server.server_address[1]}/hook")
+        engine = AlertEngine([Rule("high", "premium > 3")], [sink])
+        engine.update(tick(4.0), at=0.0)
+        engine.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert received[0]["rule"] == "high"
+    assert received[0]["text"].startswith("[high]")
+
+
+def test_hundreds_of_rules_stay_cheap_per_tick():
+    rules = [Rule(f"r{i}", f"zscore(premium, {1 + i % 5}h) > {2 + i % 7}") for i in range(300)]
+    rules += [Rule(f"v{i}", f"premium > {10 + i}") for i in range(200)]
+    engine = AlertEngine(rules)
+    start = time.perf_counter()
+    for t in range(1000):
+        engine.update(tick(math.sin(t / 10)), at=t * 60.0)
+    per_tick = (time.perf_counter() - start) / 1000
+    assert per_tick < 0.005
+
+
+def test_evaluate_from_env_warms_from_log_and_persists_state(tmp_path, monkeypatch):
+    rules = tmp_path / "rules.json"
+    rules.write_text(
+        json.dumps([{"name": "z", "when": "zscore(premium, 30d) > 2"}]), encoding="utf-8"
+    )
+    log = tmp_path / "log.csv"
+    lines = [",".join(LOG_HEADER)]
+    for day in range(1, 21):
+        lines.append(f"2025-05-{day:02d},1,1,1400,0,{1.0 + 0.1 * (day % 2):.2f}")
+    log.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.setenv(alerts.ALERT_RULES_ENV, str(rules))
+    monkeypatch.delenv(alerts.ALERT_WEBHOOK_ENV, raising=False)
+
+    result = QUOTE[:5] + (5.0,)
+    fired = evaluate_from_env(result, log, at=datetime(2025, 5, 21, 9, 0))
+    assert [alert.rule for alert in fired] == ["z"]
+    assert (tmp_path / alerts.ALERTS_NAME).exists()
+    # 다음 실행에서도 조건이 그대로면 상태 파일 덕분에 다시 알리지 않습니다.
+    assert evaluate_from_env(result, log, at=datetime(2025, 5, 21, 10, 0)) == []
+    monkeypatch.delenv(alerts.ALERT_RULES_ENV)
+    assert evaluate_from_env(result, log) == []
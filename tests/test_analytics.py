@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold.analytics import (
+    ANALYTICS_COLUMNS,
+    FX_COL,
+    PREMIUM_COL,
+    IncrementalAnalytics,
+    compute_analytics,
+)
+
+
+def make_frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    premium = np.round(np.cumsum(rng.normal(0, 0.3, n)), 2)
+    premium[10:14] = premium[9]  # 동률 처리 확인용
+    fx = 1350 + np.cumsum(rng.normal(0, 3, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame({PREMIUM_COL: premium, FX_COL: fx}, index=index)
+
+
+def test_compute_analytics_basic():
+    df = make_frame()
+    result = compute_analytics(df, window=20)
+    assert list(result.columns) == ANALYTICS_COLUMNS
+    assert result["rolling_mean"].iloc[:19].isna().all()
+    last = df[PREMIUM_COL].iloc[-20:]
+    assert result["rolling_mean"].iloc[-1] == pytest.approx(last.mean())
+    assert result["rolling_std"].iloc[-1] == pytest.approx(last.std())
+    assert result["max_drawdown"].iloc[-1] == pytest.approx(
+        (df[PREMIUM_COL] - df[PREMIUM_COL].cummax()).min()
+    )
+
+
+def test_incremental_matches_vectorized():
+    df = make_frame()
+    expected = compute_analytics(df, window=20)
+    state = IncrementalAnalytics(window=20)
+    for i, (premium, fx) in enumerate(zip(df[PREMIUM_COL], df[FX_COL])):
+        stats = state.update(premium, fx)
+        for column in ANALYTICS_COLUMNS:
+            assert stats[column] == pytest.approx(
+                expected[column].iloc[i], nan_ok=True, abs=1e-9
+            ), (i, column)
+
+
+def test_from_frame_continues_history():
+    df = make_frame()
+    expected = compute_analytics(df, window=20).iloc[-1]
+    state = IncrementalAnalytics.from_frame(df.iloc[:-1], window=20)
+    stats = state.update(df[PREMIUM_COL].iloc[-1], df[FX_COL].iloc[-1])
+    for column in ANALYTICS_COLUMNS:
+        assert stats[column] == pytest.approx(expected[column], abs=1e-9), column
+
+
+def test_incremental_skips_missing_values_like_rolling():
+    df = make_frame()
+    df.loc[df.index[50], FX_COL] = np.nan  # 환율이 빠진 날
+    df.loc[df.index[80], PREMIUM_COL] = np.nan
+    expected = compute_analytics(df, window=20)
+    state = IncrementalAnalytics(window=20)
+    for i, (premium, fx) in enumerate(zip(df[PREMIUM_COL], df[FX_COL])):
+        stats = state.update(premium, fx)
+        for column in ANALYTICS_COLUMNS:
+            value = expected[column].iloc[i]
+            if np.isnan(value):
+                assert np.isnan(stats[column]), (i, column)
+            else:
+                assert stats[column] == pytest.approx(value, rel=1e-9, abs=1e-9), (i, column)
+    # NaN이 창을 벗어난 뒤에는 다시 값이 나옵니다.
+    assert not np.isnan(stats["fx_corr"]) and not np.isnan(stats["rolling_mean"])
+
+    resumed = IncrementalAnalytics.from_frame(df.iloc[:-1], window=20)
+    last = resumed.update(df[PREMIUM_COL].iloc[-1], df[FX_COL].iloc[-1])
+    assert last["max_drawdown"] == pytest.approx(expected["max_drawdown"].iloc[-1])
@@ -0,0 +1,170 @@
+import csv
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+import pytest
+import requests
+from kimchi_gold import metrics, now_price
+from kimchi_gold.archive import (
+    ArchiveRecorder,
+    ReplayServer,
+    ResponseArchive,
+    load_test,
+    rebuild_log,
+    replay,
+)
+from kimchi_gold.cache import ResponseCache
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.policy import FetchPolicy
+
+
+def page(price, class_name="DetailInfo_price__I_VJn"):
+    return f'<html><strong class="{class_name}">{price}</strong></html>'.encode()
+
+
+def ts(*args):
+    return datetime(*args).timestamp()
+
+
+def fill_archive(archive, days=3, class_name="DetailInfo_price__I_VJn"):
+    for day in range(1, days + 1):
+        at = ts(2025, 5, day, 9, 0)
+        archive.append(now_price.DOMESTIC_GOLD_URL, page("150,000", class_name), at, 200)
+        archive.append(now_price.INTERNATIONAL_GOLD_URL, page("3,345.00", class_name), at, 200)
+        archive.append(now_price.USD_KRW_URL, page(f"1,{390 + day}.00", class_name), at, 200)
+        # 같은 날 늦게 받은 응답은 로그 재생성에 쓰지 않습니다.
+        archive.append(now_price.USD_KRW_URL, page("9,999.00", class_name), at + 3600, 200)
+
+
+def test_append_and_read_round_trip_with_index(tmp_path):
+    archive = ResponseArchive(tmp_path)
+    body = page("1,234.5") * 100
+    record = archive.append("https://example.com/a", body, ts(2025, 5, 1), 200)
+    archive.append("https://example.com/b", b"other", ts(2025, 6, 1), None)
+    assert record.size == len(body)
+    assert record.length < len(body)  # 압축되어 저장됩니다.
+    assert archive.segments() == ["responses-2025-05", "responses-2025-06"]
+    records = list(archive.records())
+    assert [r.url for r in records] == ["https://example.com/a", "https://example.com/b"]
+    assert archive.read(records[0]) == body
+    assert records[1].status is None
+    june = list(archive.records(start=ts(2025, 5, 15)))
+    assert [r.url for r in june] == ["https://example.com/b"]
+    assert list(archive.records(urls=["https://example.com/a"])) == records[:1]
+
+
+def test_concurrent_appends_keep_frames_intact(tmp_path):
+    archive = ResponseArchive(tmp_path)
+    at = ts(2025, 5, 1)
+
+    def append_many(worker):
+        for i in range(50):
+            archive.append(f"https://example.com/{worker}/{i}", page(f"{worker}{i}"), at)
+
+    threads = [threading.Thread(target=append_many, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    records = list(archive.records())
+    assert len(records) == 200
+    for record in records:
+        worker, i = record.url.rsplit("/", 2)[-2:]
+        assert archive.read(record) == page(f"{worker}{i}")
+
+
+def test_recorder_hook_archives_fetched_responses(tmp_path):
+    archive = ResponseArchive(tmp_path)
+    recorder = ArchiveRecorder(archive)
+    metrics.add_fetch_hook(recorder)
+    try:
+        event = metrics.begin_fetch("https://example.com/metals/GCcv1")
+        event.content = page("3,345.00")
+        event.status = 200
+        metrics.finish_fetch(event, metrics.Registry())
+        failed = metrics.begin_fetch("https://example.com/metals/GCcv1")
+        metrics.finish_fetch(failed, metrics.Registry())  # 본문이 없으면 남기지 않습니다.
+        cached = metrics.begin_fetch("https://example.com/metals/GCcv1")
+        cached.content = page("3,345.00")
+        cached.cached = True
+        metrics.finish_fetch(cached, metrics.Registry())  # 캐시 적중도 남기지 않습니다.
+    finally:
+        metrics.remove_fetch_hook(recorder)
+    (record,) = archive.records()
+    assert record.status == 200
+    assert archive.read(record) == page("3,345.00")
+
+
+def test_recorder_skips_cache_hits(tmp_path):
+    archive = ResponseArchive(tmp_path / "archive")
+    recorder = ArchiveRecorder(archive)
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60)
+    session = Mock()
+    session.get.return_value = Mock(status_code=200, content=page("3,345.00"), headers={})
+    policy = FetchPolicy(hedge=False)
+    url = now_price.INTERNATIONAL_GOLD_URL
+    metrics.add_fetch_hook(recorder)
+    try:
+        for _ in range(2):
+            now_price.get_price_from_naver(
+                url, "err", session=session, cache=cache, policy=policy
+            )
+    finally:
+        metrics.remove_fetch_hook(recorder)
+    assert session.get.call_count == 1
+    assert len(list(archive.records())) == 1
+
+
+def test_replay_matches_across_process_pool(tmp_path, monkeypatch):
+    archive = ResponseArchive(tmp_path)
+    fill_archive(archive)
+    archive.append("https://example.com/broken", b"<html></html>", ts(2025, 5, 2))
+    monkeypatch.setattr("kimchi_gold.archive.REPLAY_CHUNK", 4)
+    serial = replay(archive, workers=1)
+    parallel = replay(archive, workers=2)
+    assert serial == parallel
+    assert len(serial) == 13
+    assert [price for record, price in serial if "broken" in record.url] == [None]
+
+
+def test_rebuild_log_with_changed_class_name(tmp_path):
+    archive = ResponseArchive(tmp_path / "archive")
+    fill_archive(archive, class_name="NewPrice_value__X1")
+    output = tmp_path / "rebuilt.csv"
+    assert rebuild_log(archive, output, workers=1) == 0
+    assert not output.exists()
+    assert rebuild_log(archive, output, workers=1, class_name="NewPrice_value__X1") == 3
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == LOG_HEADER
+    assert [row[0] for row in rows[1:]] == ["2025-05-01", "2025-05-02", "2025-05-03"]
+    assert rows[1][1:4] == ["150000.00", "3345.00", "1391.00"]
+    with pytest.raises(FileExistsError):
+        rebuild_log(archive, output, workers=1)
+
+
+def test_replay_server_stands_in_for_upstream(tmp_path):
+    archive = ResponseArchive(tmp_path)
+    fill_archive(archive, days=1)
+    server = ReplayServer(archive)
+    server.start()
+    try:
+        assert server.paths == [
+            "/marketindex/exchange/FX_USDKRW",
+            "/marketindex/metals/GCcv1",
+            "/marketindex/metals/M04020000",
+        ]
+        policy = FetchPolicy(hedge=False)
+        quotes = [
+            now_price.fetch_quotes(requests.Session(), policy=policy, base_url=server.url)
+            for _ in range(2)
+        ]
+        # 경로마다 보관한 응답을 차례로 돌려줍니다.
+        assert quotes == [(150000.0, 3345.0, 1391.0), (150000.0, 3345.0, 9999.0)]
+        assert requests.get(f"{server.url}/nope").status_code == 404
+        result = load_test(server.url, snapshots=30, concurrency=4)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result["errors"] == 0
+    assert result["snapshots_per_second"] > 0
@@ -0,0 +1,165 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold import cli, collect_price
+from kimchi_gold.backtest import (
+    RESULT_COLUMNS,
+    Params,
+    equity_curve,
+    grid,
+    positions,
+    prepare,
+    simulate,
+    sweep,
+)
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.writer import LogWriter
+
+
+def make_history(premium, freq="D"):
+    premium = np.asarray(premium, dtype=np.float64)
+    index = pd.date_range("2024-01-01", periods=len(premium), freq=freq)
+    international, usdkrw = 3000.0, 1400.0
+    domestic = international * usdkrw / 31.1035 * (1 + premium / 100)
+    df = pd.DataFrame(
+        {LOG_HEADER[1]: domestic, LOG_HEADER[2]: international, LOG_HEADER[3]: usdkrw},
+        index=index,
+    )
+    return prepare(df)
+
+
+def naive(premium, params):
+    """시점마다 상태를 따라가는 느린 기준 구현: (포지션, 구간별 순수익)."""
+    position, held = 0, []
+    for value in premium:
+        if position == -1 and value <= params.exit or position == 1 and value >= -params.exit:
+            position = 0
+        if position == 0:
+            if value >= params.entry:
+                position = -1
+            elif value <= -params.entry:
+                position = 1
+        held.append(position)
+    held[-1] = 0
+    held = np.array(held, dtype=np.float64)
+    log_ratio = np.log1p(np.asarray(premium) / 100)
+    turnover = np.abs(np.diff(held, prepend=0.0))
+    turnover[-2] += turnover[-1]
+    return held, held[:-1] * np.diff(log_ratio) - params.cost * turnover[:-1]
+
+
+def test_positions_follow_hysteresis():
+    premium = [0.0, 1.2, 0.8, 0.4, 0.0, -1.5, -0.2, 0.5, 2.0, 2.5]
+    assert positions(np.array(premium), 1.0, 0.5).tolist() == [0, -1, -1, 0, 0, 1, 0, 0, -1, 0]
+    # 청산 조건과 반대쪽 진입 조건이 같은 종가에 맞으면 바로 뒤집습니다.
+    assert positions(np.array([1.5, -1.5, 0.0]), 1.0, 0.0).tolist() == [-1, 1, 0]
+
+
+def test_matches_naive_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        premium = rng.integers(-4, 5, int(rng.integers(2, 40))) * 0.5
+        entry = float(rng.choice([0.5, 1.0, 1.5]))
+        exit = float(rng.choice([x for x in np.arange(-1.5, 1.6, 0.5) if -entry < x < entry]))
+        params = Params(entry, exit, fee=0.1, fx_spread=0.2)
+        history = make_history(premium)
+        held, net = naive(history.premium, params)
+        result = simulate(history, params)
+
+        assert positions(history.premium, entry, exit).tolist() == held.tolist()
+        assert result.total_return == pytest.approx(math.expm1(net.sum()) * 100, abs=1e-9)
+        assert result.exposure == pytest.approx(np.count_nonzero(held) / len(held))
+        previous = np.concatenate([[0.0], held[:-1]])
+        assert result.trades == np.count_nonzero((held != 0) & (held != previous))
+        if len(net) > 1 and net.std(ddof=1) > 1e-9:
+            expected = net.mean() / net.std(ddof=1) * math.sqrt(history.steps_per_year)
+            assert result.sharpe == pytest.approx(expected, rel=1e-6)
+        curve = equity_curve(history, params)
+        assert curve["equity"].iloc[-1] == pytest.approx(result.total_return, abs=1e-9)
+
+
+def test_costs_and_drawdown():
+    history = make_history([0.0, 2.0, 1.0, 3.0, 0.0, 0.0])
+    free = simulate(history, Params(1.5, 0.5))
+    costly = simulate(history, Params(1.5, 0.5, fee=0.05, fx_spread=0.1))
+    assert free.trades == costly.trades == 1
+    assert costly.total_return == pytest.approx(
+        (math.exp(math.log1p(free.total_return / 100) - 2 * 0.002) - 1) * 100
+    )
+    assert free.max_drawdown == 0.0
+    assert costly.max_drawdown == pytest.approx(math.expm1(-0.002) * 100)
+
+
+def test_validation_and_grid():
+    history = make_history([0.0, 1.0])
+    for entry, exit in ((0.0, 0.0), (1.0, 1.0), (1.0, -1.0)):
+        with pytest.raises(ValueError):
+            simulate(history, Params(entry, exit))
+    assert grid([-1.0, 0.5, 1.0], [-0.5, 0.0, 0.5]) == [
+        (0.5, 0.0),
+        (1.0, -0.5),
+        (1.0, 0.0),
+        (1.0, 0.5),
+    ]
+
+
+def test_prepare_drops_missing_prices():
+    history = make_history([0.0, 1.0, 2.0, 3.0])
+    df = pd.DataFrame(
+        {
+            LOG_HEADER[1]: [100.0, np.nan, 110.0, 120.0],
+            LOG_HEADER[2]: [1.0, 1.0, 1.0, 1.0],
+            LOG_HEADER[3]: [3110.35, 3110.35, 0.0, 3110.35],
+        },
+        index=history.index,
+    )
+    prepared = prepare(df)
+    assert list(prepared.index) == [history.index[0], history.index[3]]
+    assert prepared.premium == pytest.approx([0.0, 20.0])
+    with pytest.raises(ValueError):
+        prepare(df.iloc[:2])
+
+
+def test_sweep_workers_match_serial():
+    rng = np.random.default_rng(1)
+    history = make_history(np.cumsum(rng.normal(0, 0.3, 2000)) * 0.1, freq="min")
+    kwargs = dict(
+        entries=[0.5, 1.0, 1.5],
+        exits=[-0.5, 0.0, 0.5, 1.0],
+        fees=(0.0, 0.01),
+        fx_spreads=(0.1,),
+    )
+    serial = sweep(history, workers=1, **kwargs)
+    parallel = sweep(history, workers=2, **kwargs)
+    assert list(serial.columns) == RESULT_COLUMNS
+    assert len(serial) == len(grid(kwargs["entries"], kwargs["exits"])) * 2
+    pd.testing.assert_frame_equal(serial, parallel)
+    first = serial.iloc[0]
+    expected = simulate(history, Params(first.entry, first.exit, first.fee, first.fx_spread))
+    assert tuple(first) == pytest.approx(tuple(expected), nan_ok=True)
+
+
+def test_cli_backtest(tmp_path, monkeypatch, capsys):
+    data_file = tmp_path / "log.csv"
+    premium = [0.0, 1.2, 0.8, 0.4, 0.0, -1.5, -0.2, 0.5, 2.0, 0.0]
+    with LogWriter(data_file, header=LOG_HEADER, max_rows=len(premium)) as writer:
+        for i, value in enumerate(premium):
+            domestic = 1000.0 * (1 + value / 100)
+            day = f"2024-01-{i + 1:02d}"
+            writer.write([day, f"{domestic:.2f}", "31.1035", "1000.00", "0", "0"])
+    monkeypatch.setattr(collect_price, "DATA_FILE", data_file)
+
+    assert cli.main(["backtest", "--entry", "1", "--exit", "0.5", "--fee", "0.01"]) == 0
+    out = capsys.readouterr().out
+    assert "trades        3" in out
+
+    output = tmp_path / "sweep.csv"
+    argv = ["backtest", "--entries", "0.5:1.5:0.5", "--exits=-0.5:0.5:0.5", "--workers", "1"]
+    assert cli.main(argv + ["--output", str(output), "--top", "2"]) == 0
+    saved = pd.read_csv(output)
+    assert len(saved) == len(grid([0.5, 1.0, 1.5], [-0.5, 0.0, 0.5]))
+    assert saved["exit"].tolist()[:2] == [0.0, -0.5]  # entry=0.5에서는 exit ±0.5가 빠집니다.
+
+    assert cli.main(["backtest", "--entry", "1", "--exit", "1"]) == 1
+    assert "exit" in capsys.readouterr().out
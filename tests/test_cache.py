@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+import pytest
+from kimchi_gold import cache as cache_module
+from kimchi_gold.cache import ResponseCache
+from kimchi_gold.now_price import get_price_from_naver
+from kimchi_gold.policy import FetchPolicy, UpstreamError
+
+URL = "https://m.stock.naver.com/marketindex/metals/M04020000"
+BODY = b'<strong class="DetailInfo_price__I_VJn">149,560</strong>'
+
+
+def make_response(status_code=200, content=BODY, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+def test_fetch_within_ttl_hits_cache(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60)
+    http = MagicMock()
+    http.get.return_value = make_response()
+
+    assert cache.fetch(URL, http, {"User-Agent": "test"}) == BODY
+    assert cache.fetch(URL, http, {"User-Agent": "test"}) == BODY
+    http.get.assert_called_once_with(URL, headers={"User-Agent": "test"})
+
+
+def test_fetch_revalidates_with_etag_after_ttl(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=0)
+    http = MagicMock()
+    http.get.side_effect = [
+        make_response(
+            headers={"ETag": '"v1"', "Last-Modified": "Fri, 09 May 2025 01:00:00 GMT"}
+        ),
+        make_response(status_code=304, content=b""),
+    ]
+
+    assert cache.fetch(URL, http, {}) == BODY
+    assert cache.fetch(URL, http, {}) == BODY
+    second_headers = http.get.call_args_list[1].kwargs["headers"]
+    assert second_headers["If-None-Match"] == '"v1"'
+    assert second_headers["If-Modified-Since"] == "Fri, 09 May 2025 01:00:00 GMT"
+
+
+def test_fetch_does_not_store_errors(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60)
+    http = MagicMock()
+    http.get.return_value = make_response(status_code=404, content=b"missing")
+
+    assert cache.fetch(URL, http, {}) == b"missing"
+    assert cache.get(URL) is None
+
+
+def test_fetch_raises_upstream_error_on_5xx(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60)
+    http = MagicMock()
+    http.get.return_value = make_response(status_code=503, content=b"busy")
+    policy = FetchPolicy(
+        retries=2, backoff=0.0, breaker_threshold=3, sleep=lambda s: None, hedge=False
+    )
+
+    with pytest.raises(UpstreamError):
+        get_price_from_naver(URL, "err", session=http, cache=cache, policy=policy)
+    assert http.get.call_count == 3
+    assert policy.breaker(urlparse(URL).netloc).state == "open"
+    assert cache.get(URL) is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60, max_entries=2)
+    with patch("kimchi_gold.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0, 5.0]):
+        cache.put("a", b"a")  # t=1
+        cache.put("b", b"b")  # t=2
+        cache._touch("a", revalidated=False)  # t=3, 'a'가 더 최근에 쓰임
+        cache.put("c", b"c")  # t=4, 가장 오래 안 쓰인 'b'가 지워짐
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_cache_is_shared_between_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    ResponseCache(path).put(URL, BODY)
+    http = MagicMock()
+    assert ResponseCache(path, ttl=60).fetch(URL, http, {}) == BODY
+    http.get.assert_not_called()
+
+
+def test_cache_from_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "_env_cache", None)
+    monkeypatch.delenv(cache_module.CACHE_TTL_ENV, raising=False)
+    assert cache_module.cache_from_env() is None
+
+    monkeypatch.setenv(cache_module.CACHE_TTL_ENV, "30")
+    monkeypatch.setenv(cache_module.CACHE_PATH_ENV, str(tmp_path / "env.sqlite3"))
+    cache = cache_module.cache_from_env()
+    assert cache is not None and cache.ttl == 30.0
+    assert cache_module.cache_from_env() is cache
@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from kimchi_gold import cli
+
+HEAVY_MODULES = ("pandas", "matplotlib", "bs4", "numpy")
+IMPORT_BUDGET_SECONDS = 0.5  # requests 포함. 느린 CI를 고려한 넉넉한 상한입니다.
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import kimchi_gold.cli, kimchi_gold.now_price, kimchi_gold.collect_price
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def test_now_path_does_not_import_heavy_modules():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    elapsed = float(output[0])
+    heavy = output[1] if len(output) > 1 else ""
+    assert heavy == ""
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+@patch("kimchi_gold.now_price.calc_kimchi_premium")
+def test_now_json(mock_premium, capsys):
+    mock_premium.return_value = (150000.0, 3345.0, 150452.5, 1399.0, -452.5, -0.3)
+    assert cli.main(["now", "--json"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["domestic"] == 150000.0
+    assert data["premium_percent"] == -0.3
+
+
+@patch("kimchi_gold.now_price.calc_kimchi_premium")
+def test_now_text(mock_premium, capsys):
+    mock_premium.return_value = (150000.0, 3345.0, 150452.5, 1399.0, -452.5, -0.3)
+    assert cli.main(["now"]) == 0
+    assert "김치프리미엄" in capsys.readouterr().out
+
+
+@patch("kimchi_gold.collect_price.collect_data")
+def test_collect(mock_collect):
+    assert cli.main(["collect"]) == 0
+    mock_collect.assert_called_once_with()
+
+
+@patch("kimchi_gold.plot.render_windows", return_value={"a.png": True})
+def test_plot_windows(mock_render, capsys):
+    assert cli.main(["plot", "--windows", "1", "6", "all", "--force"]) == 0
+    mock_render.assert_called_once_with([1, 6, None], force=True)
+    assert "a.png: 저장" in capsys.readouterr().out
+
+
+def test_plot_rejects_bad_window():
+    with pytest.raises(SystemExit):
+        cli.main(["plot", "--windows", "0"])
+
+
+def test_join_reports_missing_ecos_file(tmp_path, capsys):
+    missing = tmp_path / "ecos.csv"
+    assert cli.main(["join", "--ecos", str(missing)]) == 1
+    assert "backfill" in capsys.readouterr().out
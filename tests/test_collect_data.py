@@ -101,3 +101,38 @@ def test_collect_data_failure(mock_logged, mock_premium, capsys):
     assert "수집 실패: API Error" in captured.out
     mock_logged.assert_called_once()
     mock_premium.assert_called_once()
+
+
+@patch("kimchi_gold.alerts.evaluate_from_env", return_value=[])
+@patch("kimchi_gold.storage.ColumnStore.append_rows", side_effect=OSError("disk full"))
+@patch("kimchi_gold.rollup.update_rollups")
+@patch("kimchi_gold.collect_price.write_to_csv")
+@patch("kimchi_gold.collect_price.calc_kimchi_premium")
+@patch("kimchi_gold.collect_price.is_today_logged", return_value=False)
+def test_collect_data_survives_store_failure(
+    mock_logged,
+    mock_premium,
+    mock_write,
+    mock_rollup,
+    mock_append,
+    mock_alerts,
+    tmp_path,
+    capsys,
+):
+    mock_premium.return_value = (
+        MOCK_DOMESTIC_PRICE,
+        MOCK_INTERNATIONAL_PRICE,
+        MOCK_INTERNATIONAL_KRW_PER_G,
+        MOCK_USD_KRW,
+        MOCK_DIFFERENCE,
+        MOCK_PREMIUM_PERCENT,
+    )
+    with patch("kimchi_gold.collect_price.STORE_DIR", tmp_path):
+        collect_data()
+    out = capsys.readouterr().out
+    assert "컬럼 저장소 갱신 실패: disk full" in out
+    assert "수집 완료" in out
+    assert "수집 실패" not in out
+    mock_write.assert_called_once()
+    mock_append.assert_called_once()
+    mock_alerts.assert_called_once()
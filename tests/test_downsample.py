@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold.downsample import downsample_index, downsample_series, lttb, minmax
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(size=n))
+
+
+def test_lttb_keeps_endpoints_and_size():
+    y = random_walk(10_000)
+    index = lttb(np.arange(len(y)), y, 500)
+    assert len(index) == 500
+    assert index[0] == 0 and index[-1] == len(y) - 1
+    assert np.all(np.diff(index) > 0)
+
+
+def test_lttb_picks_spike():
+    y = np.zeros(1000)
+    y[437] = 50.0
+    index = lttb(np.arange(1000), y, 50)
+    assert 437 in index
+
+
+def test_lttb_returns_all_points_when_small():
+    assert lttb(np.arange(10), np.arange(10.0), 100).tolist() == list(range(10))
+
+
+def test_minmax_preserves_extremes_with_nan():
+    y = random_walk(100_003)
+    y[500] = np.nan
+    index = minmax(y, 300)
+    assert len(index) <= 2 * 300 + 2
+    assert np.nanmax(y[index]) == np.nanmax(y)
+    assert np.nanmin(y[index]) == np.nanmin(y)
+
+
+def test_downsample_series_keeps_datetime_index():
+    index = pd.date_range("2024-01-01", periods=50_000, freq="min")
+    series = pd.Series(random_walk(50_000), index=index)
+    reduced = downsample_series(series, 800)
+    assert len(reduced) == 800
+    assert reduced.index[0] == index[0] and reduced.index[-1] == index[-1]
+    assert len(downsample_series(series.iloc[:100], 800)) == 100
+    with pytest.raises(ValueError):
+        downsample_index(index.to_numpy(), series.to_numpy(), 10, method="bogus")
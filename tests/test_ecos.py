@@ -0,0 +1,166 @@
+import csv
+import json
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from kimchi_gold.ecos import (
+    EcosClient,
+    backfill,
+    merge_series,
+    read_series,
+    split_date_range,
+)
+from kimchi_gold.ratelimit import RateLimiter
+
+
+class StubEcosHandler(BaseHTTPRequestHandler):
+    """ECOS StatisticSearch를 흉내 내는 처리기. 평일마다 값 하나를 돌려줍니다."""
+
+    requests_seen = []
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        # StatisticSearch/KEY/json/kr/first/last/stat/cycle/begin/end/item
+        first, last = int(parts[4]), int(parts[5])
+        begin = datetime.strptime(parts[8], "%Y%m%d").date()
+        end = datetime.strptime(parts[9], "%Y%m%d").date()
+        type(self).requests_seen.append((parts[8], parts[9], first, last))
+        days = [
+            begin + timedelta(days=i)
+            for i in range((end - begin).days + 1)
+            if (begin + timedelta(days=i)).weekday() < 5
+        ]
+        if not days:
+            body = {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+        else:
+            rows = [
+                {
+                    "ITEM_NAME1": "원/미국달러(매매기준율)",
+                    "TIME": day.strftime("%Y%m%d"),
+                    "DATA_VALUE": f"{1200 + day.toordinal() % 300}.5",
+                }
+                for day in days[first - 1 : last]
+            ]
+            body = {"StatisticSearch": {"list_total_count": len(days), "row": rows}}
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubEcosHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubEcosHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(base_url, page_size=100):
+    return EcosClient(
+        "TESTKEY",
+        base_url=base_url,
+        rate_limiter=RateLimiter(rate=1000, burst=100),
+        page_size=page_size,
+    )
+
+
+def weekdays_between(begin, end):
+    return sum(
+        1
+        for i in range((end - begin).days + 1)
+        if (begin + timedelta(days=i)).weekday() < 5
+    )
+
+
+def test_split_date_range():
+    chunks = split_date_range(date(2024, 1, 1), date(2024, 1, 10), 4)
+    assert chunks == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 5), date(2024, 1, 8)),
+        (date(2024, 1, 9), date(2024, 1, 10)),
+    ]
+
+
+def test_backfill_paginates_and_merges(stub_server, tmp_path):
+    output = tmp_path / "ecos.csv"
+    begin, end = date(2022, 1, 1), date(2024, 12, 31)
+    added = backfill(
+        make_client(stub_server, page_size=100),
+        begin,
+        end,
+        output_file=output,
+        chunk_days=180,
+    )
+    expected = weekdays_between(begin, end)
+    assert added == expected
+    series = read_series(output)
+    assert len(series) == expected
+    assert list(series) == sorted(series)
+    # 180일 조각에는 평일이 100개보다 많으므로 두 번째 페이지 요청이 있어야 합니다.
+    assert any(first == 101 for _, _, first, _ in StubEcosHandler.requests_seen)
+    assert not (tmp_path / "ecos.csv.checkpoint.json").exists()
+
+    # 같은 구간을 다시 받아도 날짜 기준으로 중복 없이 합쳐집니다.
+    assert backfill(make_client(stub_server), begin, end, output_file=output) == 0
+    assert len(read_series(output)) == expected
+
+
+def test_backfill_resumes_from_checkpoint(stub_server, tmp_path):
+    output = tmp_path / "ecos.csv"
+    checkpoint = tmp_path / "ecos.csv.checkpoint.json"
+    checkpoint.write_text(json.dumps(["20240101-20240131"]), encoding="utf-8")
+
+    backfill(
+        make_client(stub_server),
+        date(2024, 1, 1),
+        date(2024, 3, 31),
+        output_file=output,
+        chunk_days=31,
+    )
+    requested = {(begin, end) for begin, end, _, _ in StubEcosHandler.requests_seen}
+    assert ("20240101", "20240131") not in requested
+    assert ("20240201", "20240302") in requested
+
+
+def test_merge_series_overwrites_same_date(tmp_path):
+    output = tmp_path / "ecos.csv"
+    merge_series(output, [{"ITEM_NAME1": "USD", "TIME": "20240102", "DATA_VALUE": "1300"}])
+    added = merge_series(
+        output,
+        [
+            {"ITEM_NAME1": "USD", "TIME": "20240102", "DATA_VALUE": "1301"},
+            {"ITEM_NAME1": "USD", "TIME": "20240101", "DATA_VALUE": "1299"},
+        ],
+    )
+    assert added == 1
+    with open(output, "r", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["Name", "Date", "Value"],
+        ["USD", "20240101", "1299"],
+        ["USD", "20240102", "1301"],
+    ]
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    waits = []
+
+    def fake_sleep(seconds):
+        waits.append(seconds)
+
+    limiter = RateLimiter(rate=2.0, burst=1, clock=lambda: now[0], sleep=fake_sleep)
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+    assert waits == [0.5, 1.0]
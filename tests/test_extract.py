@@ -0,0 +1,43 @@
+from pathlib import Path
+import pytest
+from bs4 import BeautifulSoup
+from kimchi_gold.extract import PRICE_CLASS, extract_price, extract_price_text
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.mark.parametrize(
+    "fixture, expected",
+    [
+        ("naver_domestic_gold.html", 149560.0),
+        ("naver_international_gold.html", 3284.0),
+        ("naver_usd_krw.html", 1409.1),
+    ],
+)
+def test_extract_price_from_fixture(fixture, expected):
+    content = (FIXTURES_DIR / fixture).read_bytes()
+    assert extract_price(content) == expected
+
+
+@pytest.mark.parametrize("fixture", sorted(p.name for p in FIXTURES_DIR.glob("*.html")))
+def test_extract_price_text_matches_beautifulsoup(fixture):
+    content = (FIXTURES_DIR / fixture).read_bytes()
+    soup = BeautifulSoup(content, "html.parser")
+    expected = soup.find("strong", class_=PRICE_CLASS).get_text()
+    assert extract_price_text(content) == expected
+
+
+def test_extract_price_skips_css_and_similar_classes():
+    content = (
+        b"<style>.DetailInfo_price__I_VJn{color:red}</style>"
+        b'<strong class="DetailInfo_price__I_VJn_old">1</strong>'
+        b'<span class="DetailInfo_price__I_VJn">2</span>'
+        b'<strong class="big DetailInfo_price__I_VJn">1,234.5&nbsp;<em>USD</em></strong>'
+    )
+    assert extract_price_text(content) == "1,234.5\xa0USD"
+    assert extract_price(content) == 1234.5
+
+
+def test_extract_price_missing_returns_none():
+    assert extract_price(b"<html><body><strong>100</strong></body></html>") is None
+    assert extract_price(b'<strong class="DetailInfo_price__I_VJn">-</strong>') is None
@@ -0,0 +1,139 @@
+import csv
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from kimchi_gold import instruments
+from kimchi_gold.instruments import (
+    INSTRUMENTS,
+    INSTRUMENTS_HEADER,
+    HostLimiter,
+    Instrument,
+    collect_instruments,
+    fetch_instruments,
+    krw_value,
+    resolve,
+    snapshot_rows,
+)
+
+PRICES = {
+    "M04020000": "150,000",
+    "GCcv1": "3,345.00",
+    "SIcv1": "33.50",
+    "PLcv1": "1,000.00",
+    "FX_USDKRW": "1,399.00",
+    "FX_JPYKRW": "950.00",
+    "FX_CNYKRW": "192.50",
+}
+
+
+class StubNaverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.active -= 1
+        code = self.path.rstrip("/").rsplit("/", 1)[-1]
+        price = PRICES.get(code, "1.00")
+        body = f'<strong class="DetailInfo_price__I_VJn">{price}</strong>'.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_base():
+    StubNaverHandler.delay = 0.0
+    StubNaverHandler.peak = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNaverHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_resolve_adds_fx_and_reference_dependencies():
+    names = [instrument.name for instrument in resolve(["krx_gold", "silver"])]
+    assert names[:2] == ["krx_gold", "silver"]
+    assert set(names) == {"krx_gold", "silver", "gold", "usdkrw"}
+    with pytest.raises(KeyError):
+        resolve(["copper"])
+
+
+def test_krw_value_converts_units_and_quote_size():
+    prices = {"usdkrw": 1399.0, "jpykrw": 950.0}
+    assert krw_value(INSTRUMENTS["gold"], 3345.0, prices) == pytest.approx(
+        3345.0 * 1399.0 / 31.1035
+    )
+    assert krw_value(INSTRUMENTS["krx_gold"], 150000.0, prices) == 150000.0
+    assert krw_value(INSTRUMENTS["jpykrw"], 950.0, prices) == pytest.approx(9.5)
+    assert krw_value(INSTRUMENTS["silver"], 33.5, {}) is None
+
+
+def test_snapshot_rows_one_row_per_instrument_with_premium():
+    prices = {"krx_gold": 150000.0, "gold": 3345.0, "usdkrw": 1399.0}
+    rows = snapshot_rows(resolve(["krx_gold"]), prices, datetime(2025, 5, 10, 10, 0))
+    assert [row[1] for row in rows] == ["krx_gold", "gold", "usdkrw"]
+    assert all(row[0] == "2025-05-10T10:00:00" for row in rows)
+    international = 3345.0 * 1399.0 / 31.1035
+    assert rows[0][5] == f"{(150000.0 - international) / international * 100:.2f}"
+    assert rows[1][5] == ""
+
+
+def test_fetch_instruments_limits_per_host_concurrency(stub_base):
+    StubNaverHandler.delay = 0.1
+    many = [
+        Instrument(f"metal{i}", f"{stub_base}/metals/X{i}", "oz", "USD") for i in range(20)
+    ]
+    session = requests.Session()
+    start = time.perf_counter()
+    prices, errors = fetch_instruments(
+        many, session=session, cache=None, limiter=HostLimiter(connections=4, rate=1000)
+    )
+    elapsed = time.perf_counter() - start
+    session.close()
+
+    assert not errors
+    assert len(prices) == 20
+    assert StubNaverHandler.peak <= 4
+    assert elapsed < 20 * 0.1 / 2  # 순차 실행보다 확실히 빠릅니다.
+
+
+def test_collect_instruments_writes_rows_and_reports_failures(stub_base, tmp_path, monkeypatch):
+    for name in ("krx_gold", "gold", "usdkrw", "jpykrw"):
+        code = INSTRUMENTS[name].url.rsplit("/", 1)[-1]
+        monkeypatch.setitem(
+            INSTRUMENTS, name, replace(INSTRUMENTS[name], url=f"{stub_base}/x/{code}")
+        )
+    broken = Instrument("broken", f"{stub_base}/x/NONE", "oz", "USD", class_name="nope")
+    monkeypatch.setitem(INSTRUMENTS, "broken", broken)
+    monkeypatch.setattr(instruments, "cache_from_env", lambda: None)
+    output = tmp_path / "instruments.csv"
+
+    rows, errors = collect_instruments(
+        ["krx_gold", "jpykrw", "broken"], output, session=requests.Session()
+    )
+
+    assert set(errors) == {"broken"}
+    with output.open(encoding="utf-8") as f:
+        written = list(csv.reader(f))
+    assert written[0] == INSTRUMENTS_HEADER
+    assert [row[1] for row in written[1:]] == ["krx_gold", "jpykrw", "gold", "usdkrw"]
+    assert written[2][4] == "9.50"
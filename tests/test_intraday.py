@@ -0,0 +1,120 @@
+import csv
+from datetime import datetime
+import numpy as np
+from kimchi_gold.intraday import (
+    KST,
+    OHLC_HEADER,
+    IntradayCollector,
+    MarketHours,
+    TickRing,
+    rollup_daily,
+)
+
+
+def kst_timestamp(*args):
+    return datetime(*args, tzinfo=KST).timestamp()
+
+
+def test_tick_ring_wraps_and_keeps_order():
+    ring = TickRing(3)
+    for i in range(5):
+        ring.push(float(i), i, i, i, i)
+    assert len(ring) == 3
+    assert ring.view()[0].tolist() == [2.0, 3.0, 4.0]
+    assert ring.latest()[0] == 4.0
+
+
+def test_rollup_daily_groups_by_kst_day():
+    ticks = np.array(
+        [
+            # 23:50 KST는 UTC 기준 같은 날이 아니지만 KST 날짜로 묶여야 합니다.
+            [kst_timestamp(2025, 5, 9, 9, 0), kst_timestamp(2025, 5, 9, 12, 0),
+             kst_timestamp(2025, 5, 9, 23, 50), kst_timestamp(2025, 5, 10, 9, 0)],
+            [0.5, 0.9, 0.1, 0.3],
+            [100, 110, 90, 95],
+            [3300, 3310, 3290, 3320],
+            [1400, 1401, 1399, 1398],
+        ]
+    )
+    rows = rollup_daily(ticks)
+    assert [row[0] for row in rows] == ["2025-05-09", "2025-05-10"]
+    first = dict(zip(OHLC_HEADER, rows[0]))
+    assert first["김치프리미엄(%)_시가"] == "0.50"
+    assert first["김치프리미엄(%)_고가"] == "0.90"
+    assert first["김치프리미엄(%)_저가"] == "0.10"
+    assert first["김치프리미엄(%)_종가"] == "0.10"
+    assert first["틱수"] == "3"
+    assert rows[1][-1] == "1"
+
+
+def test_market_hours():
+    hours = MarketHours()
+    assert hours.is_open(datetime(2025, 5, 9, 10, 0, tzinfo=KST))  # 금요일
+    assert not hours.is_open(datetime(2025, 5, 9, 16, 0, tzinfo=KST))
+    assert not hours.is_open(datetime(2025, 5, 10, 10, 0, tzinfo=KST))  # 토요일
+
+
+def test_collector_writes_ohlc_on_day_change(tmp_path):
+    ohlc_file = tmp_path / "ohlc.csv"
+    clock_values = iter(
+        [
+            kst_timestamp(2025, 5, 9, 9, 0),
+            kst_timestamp(2025, 5, 9, 15, 0),
+            kst_timestamp(2025, 5, 12, 9, 0),
+        ]
+    )
+    quotes = iter(
+        [
+            (150000.0, 3300.0, 0.0, 1400.0, 0.0, 0.4),
+            (151000.0, 3310.0, 0.0, 1401.0, 0.0, 0.6),
+            (152000.0, 3320.0, 0.0, 1402.0, 0.0, 0.2),
+        ]
+    )
+    collector = IntradayCollector(
+        interval=60,
+        ohlc_file=ohlc_file,
+        fetch=lambda: next(quotes),
+        clock=lambda: next(clock_values),
+        flush_every=0,
+    )
+    for _ in range(3):
+        assert collector.sample()
+    collector.flush()
+
+    with open(ohlc_file, "r", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == OHLC_HEADER
+    assert [row[0] for row in rows[1:]] == ["2025-05-09", "2025-05-12"]
+    first = dict(zip(OHLC_HEADER, rows[1]))
+    assert first["국내금(원/g)_시가"] == "150000.00"
+    assert first["국내금(원/g)_종가"] == "151000.00"
+    assert first["틱수"] == "2"
+
+
+def test_collector_survives_fetch_failure(tmp_path, capsys):
+    def failing_fetch():
+        raise ValueError("API Error")
+
+    collector = IntradayCollector(
+        ohlc_file=tmp_path / "ohlc.csv", fetch=failing_fetch, clock=lambda: 0.0
+    )
+    assert not collector.sample()
+    assert "수집 실패: API Error" in capsys.readouterr().out
+    assert len(collector.ring) == 0
+
+
+def test_collector_evaluates_alert_rules_per_sample(tmp_path):
+    from kimchi_gold.alerts import AlertEngine, Rule
+
+    sink = []
+    premiums = iter([1.0, 4.0, 5.0])
+    collector = IntradayCollector(
+        market_hours=None,
+        ohlc_file=tmp_path / "ohlc.csv",
+        fetch=lambda: (150000.0, 3345.0, 150452.5, 1399.0, -452.5, next(premiums)),
+        clock=lambda: kst_timestamp(2025, 5, 9, 10, 0),
+        alerts=AlertEngine([Rule("high", "premium > 3")], [sink.append]),
+    )
+    for _ in range(3):
+        assert collector.sample()
+    assert [alert.value for alert in sink] == [4.0]
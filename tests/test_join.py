@@ -0,0 +1,72 @@
+import csv
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold.join import (
+    FX_COL,
+    PREMIUM_COL,
+    asof_join,
+    join_ecos,
+    load_ecos_series,
+    load_log,
+)
+from kimchi_gold.log_index import LOG_HEADER
+
+
+def write_csv(filepath, header, rows):
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_load_ecos_series_dedupes_and_sorts(tmp_path):
+    path = tmp_path / "ecos.csv"
+    write_csv(
+        path,
+        ["Name", "Date", "Value"],
+        [["USD", "20240103", "1310"], ["USD", "20240102", "1300"], ["USD", "20240103", "1311"]],
+    )
+    series = load_ecos_series(path)
+    assert series.index.tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert series.tolist() == [1300.0, 1311.0]
+
+
+def test_asof_join_uses_prior_observation_within_tolerance():
+    log = pd.DataFrame(
+        {"x": [1, 2, 3, 4]},
+        index=pd.to_datetime(
+            ["2024-01-02 09:00", "2024-01-03 15:00", "2024-01-06 10:00", "2024-01-20 00:00"]
+        ),
+    )
+    fx = pd.Series(
+        [1300.0, 1305.0, 1310.0],
+        index=pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-05"]),
+    )
+    result = asof_join(log, {"fx": fx}, tolerance=pd.Timedelta(days=3))
+    assert result["fx"].iloc[:3].tolist() == [1300.0, 1305.0, 1310.0]
+    assert np.isnan(result["fx"].iloc[3])  # 15일 전 값은 허용 간격을 넘습니다.
+
+
+def test_join_ecos_recomputes_premium(tmp_path):
+    log_file = tmp_path / "log.csv"
+    ecos_file = tmp_path / "ecos.csv"
+    write_csv(
+        log_file,
+        LOG_HEADER,
+        [
+            ["2024-01-02", "86400", "2024.5", "1323.88 ", "230", "0.27"],
+            ["2024-01-03", "86460", "2030.7", "1324.74 ", "-30", "-0.03"],
+        ],
+    )
+    write_csv(ecos_file, ["Name", "Date", "Value"], [["USD", "20240102", "1300.0"]])
+
+    log = load_log(log_file)
+    assert log[FX_COL].tolist() == [1323.88, 1324.74]
+
+    result = join_ecos(log_file, ecos_file)
+    assert result[f"{FX_COL}_ECOS"].tolist() == [1300.0, 1300.0]
+    international = 2024.5 * 1300.0 / 31.1035
+    assert result[f"{PREMIUM_COL}_ECOS"].iloc[0] == pytest.approx(
+        (86400 - international) / international * 100
+    )
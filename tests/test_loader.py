@@ -0,0 +1,72 @@
+import csv
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold import loader
+from kimchi_gold.loader import load_log, select_window, window_start
+from kimchi_gold.log_index import LOG_HEADER
+
+ROWS = [
+    ["2024-01-03", "86460", "2030.7", "1324.74 ", "-30", "-0.03"],
+    ["2024-01-02", "86400", "2024.5", "1323.88 ", "230", "0.27"],
+    ["2024-02-29T10:00:00", "87000", "2040.0", "1330.00", "100", "0.10"],
+    ["2024-03-31", "88000", "2100.0", "1340.00", "50", "0.05"],
+]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "log.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        writer.writerows(ROWS)
+    loader.clear_cache()
+    return path
+
+
+def test_load_log_types_and_sorted_index(log_file):
+    df = load_log(log_file)
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index.is_monotonic_increasing
+    assert df.index[0] == pd.Timestamp("2024-01-02")
+    assert list(df.columns) == LOG_HEADER[1:]
+    assert (df.dtypes == np.float64).all()
+    assert df[LOG_HEADER[3]].tolist()[:2] == [1323.88, 1324.74]
+
+
+def test_load_log_projection_and_float32(log_file):
+    df = load_log(log_file, columns=[LOG_HEADER[5]], float32=True)
+    assert list(df.columns) == [LOG_HEADER[5]]
+    assert df[LOG_HEADER[5]].dtype == np.float32
+
+
+def test_load_log_caches_until_file_changes(log_file):
+    first = load_log(log_file)
+    assert load_log(log_file) is first
+    with open(log_file, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerow(["2024-04-01", "1", "1", "1", "1", "1"])
+    reloaded = load_log(log_file)
+    assert reloaded is not first
+    assert len(reloaded) == len(first) + 1
+
+
+def test_load_log_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_log(tmp_path / "missing.csv")
+
+
+def test_window_start_uses_calendar_months():
+    assert window_start(1, datetime(2024, 3, 31, 15, 0)) == pd.Timestamp("2024-02-29")
+    assert window_start(12, datetime(2024, 2, 29)) == pd.Timestamp("2023-02-28")
+
+
+def test_select_window_binary_search(log_file):
+    df = load_log(log_file)
+    recent = select_window(df, 1, now=datetime(2024, 3, 31))
+    assert recent.index.tolist() == [
+        pd.Timestamp("2024-02-29 10:00:00"),
+        pd.Timestamp("2024-03-31"),
+    ]
+    assert select_window(df, None) is df
@@ -0,0 +1,91 @@
+import csv
+from kimchi_gold.collect_price import upsert_row
+from kimchi_gold.log_index import LOG_HEADER, LogIndex, read_last_row
+
+
+def make_row(key, premium="0.50"):
+    return [key, "150000.00", "3345.00", "1399.00", "750.00", premium]
+
+
+def read_rows(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_read_last_row_reads_only_tail(tmp_path):
+    filepath = tmp_path / "log.csv"
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        for day in range(1, 29):
+            writer.writerow(make_row(f"2025-02-{day:02d}"))
+    assert read_last_row(filepath, block_size=16) == make_row("2025-02-28")
+    assert read_last_row(tmp_path / "missing.csv") is None
+
+
+def test_index_append_latest_and_lookup(tmp_path):
+    filepath = tmp_path / "log.csv"
+    index = LogIndex(filepath)
+    for day in ("2025-05-08", "2025-05-09", "2025-05-10"):
+        index.append(make_row(day))
+
+    assert len(index) == 3
+    assert index.latest()[0] == "2025-05-10"
+    assert index.latest_row() == make_row("2025-05-10")
+    assert index.find("2025-05-09") == 1
+    assert index.find("2025-05-11") is None
+    assert index.has_prefix("2025-05-09")
+    assert not index.has_prefix("2025-05-07")
+    assert read_rows(filepath) == [LOG_HEADER] + [
+        make_row(day) for day in ("2025-05-08", "2025-05-09", "2025-05-10")
+    ]
+
+
+def test_index_catches_up_with_external_appends(tmp_path):
+    filepath = tmp_path / "log.csv"
+    LogIndex(filepath).append(make_row("2025-05-09"))
+    with open(filepath, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerow(make_row("2025-05-10"))
+
+    index = LogIndex(filepath)
+    assert len(index) == 2
+    assert index.latest_row() == make_row("2025-05-10")
+
+
+def test_index_rebuilds_after_rewrite(tmp_path):
+    filepath = tmp_path / "log.csv"
+    index = LogIndex(filepath)
+    index.append(make_row("2025-05-09"))
+    index.append(make_row("2025-05-10"))
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        writer.writerow(make_row("2024-01-01"))
+
+    index = LogIndex(filepath)
+    assert len(index) == 1
+    assert index.latest()[0] == "2024-01-01"
+
+
+def test_upsert_replaces_and_inserts_in_order(tmp_path):
+    filepath = tmp_path / "log.csv"
+    assert upsert_row(make_row("2025-05-10T10:00"), filepath) is False
+    assert upsert_row(make_row("2025-05-10T11:00"), filepath) is False
+    # 마지막 스냅샷 교체
+    assert upsert_row(make_row("2025-05-10T11:00", "0.70"), filepath) is True
+    # 중간 스냅샷 교체와 순서에 맞는 삽입
+    assert upsert_row(make_row("2025-05-10T10:00", "0.60"), filepath) is True
+    assert upsert_row(make_row("2025-05-10T10:30"), filepath) is False
+
+    assert read_rows(filepath) == [
+        LOG_HEADER,
+        make_row("2025-05-10T10:00", "0.60"),
+        make_row("2025-05-10T10:30"),
+        make_row("2025-05-10T11:00", "0.70"),
+    ]
+    index = LogIndex(filepath)
+    assert [index.record(i)[0] for i in range(len(index))] == [
+        "2025-05-10T10:00",
+        "2025-05-10T10:30",
+        "2025-05-10T11:00",
+    ]
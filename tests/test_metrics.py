@@ -0,0 +1,169 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+import requests
+from kimchi_gold import metrics, now_price
+from kimchi_gold.metrics import (
+    FetchEvent,
+    JsonLinesSink,
+    Registry,
+    TimedHTTPAdapter,
+    add_fetch_hook,
+    finish_fetch,
+    remove_fetch_hook,
+)
+
+PAGE = b'<html><strong class="DetailInfo_price__I_VJn">1,234.50<span>USD</span></strong></html>'
+
+
+class StubQuoteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubQuoteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}/marketindex/metals/GCcv1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_histogram_buckets_and_prometheus_text():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "help", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, phase="total")
+    registry.counter("requests_total", "help").inc(outcome="ok")
+
+    text = registry.to_prometheus()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{phase="total",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{phase="total",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{phase="total",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{phase="total"} 4' in text
+    assert 'requests_total{outcome="ok"} 1.0' in text
+    assert histogram.quantile(0.5, phase="total") == 1.0
+
+
+def test_write_textfile_is_atomic(tmp_path):
+    registry = Registry()
+    registry.gauge("up", "help").set(1)
+    path = tmp_path / "out" / "kimchi_gold.prom"
+    registry.write_textfile(path)
+    assert "up 1" in path.read_text(encoding="utf-8")
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def test_finish_fetch_records_and_calls_hooks(tmp_path):
+    registry = Registry()
+    sink = JsonLinesSink(tmp_path / "events.jsonl")
+    add_fetch_hook(sink)
+    try:
+        event = FetchEvent(url="https://x/metals/GCcv1", instrument="GCcv1", total=0.2, bytes=10)
+        event.content = b"raw"
+        finish_fetch(event, registry)
+    finally:
+        remove_fetch_hook(sink)
+
+    counter = registry.counter("kimchi_gold_fetch_requests_total", "")
+    assert counter.value(instrument="GCcv1", outcome="ok") == 1
+    record = json.loads((tmp_path / "events.jsonl").read_text(encoding="utf-8"))
+    assert record["instrument"] == "GCcv1"
+    assert "content" not in record
+
+
+def test_get_price_from_naver_measures_phases(stub_url):
+    events = []
+    add_fetch_hook(events.append)
+    session = requests.Session()
+    session.mount("http://", TimedHTTPAdapter())
+    try:
+        price = now_price.get_price_from_naver(stub_url, "err", session=session)
+        again = now_price.get_price_from_naver(stub_url, "err", session=session)
+    finally:
+        remove_fetch_hook(events.append)
+        session.close()
+
+    assert price == again == 1234.5
+    first, second = events
+    assert first.instrument == "GCcv1"
+    assert first.status == 200
+    assert first.bytes == len(PAGE)
+    assert first.dns is not None and first.connect is not None
+    assert first.tls is None  # 평문 HTTP
+    assert 0 < first.ttfb <= first.total
+    # 두 번째 요청은 keep-alive 연결을 재사용하므로 연결 단계가 없습니다.
+    assert second.dns is None and second.connect is None
+
+
+def test_connection_falls_back_to_next_address(stub_url):
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != "localhost":
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        # 첫 주소에는 아무도 듣지 않으므로 연결이 거부됩니다.
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+            for address in ("127.0.0.2", "127.0.0.1")
+        ]
+
+    events = []
+    add_fetch_hook(events.append)
+    session = requests.Session()
+    session.mount("http://", TimedHTTPAdapter())
+    try:
+        with patch("kimchi_gold.metrics.socket.getaddrinfo", side_effect=getaddrinfo):
+            price = now_price.get_price_from_naver(stub_url, "err", session=session)
+    finally:
+        remove_fetch_hook(events.append)
+        session.close()
+    assert price == 1234.5
+    assert events[0].dns is not None and events[0].connect is not None
+
+
+def test_get_price_from_naver_counts_failures():
+    events = []
+    add_fetch_hook(events.append)
+    try:
+        with patch("kimchi_gold.now_price.requests.get", side_effect=requests.ConnectionError):
+            with pytest.raises(requests.ConnectionError):
+                now_price.get_price_from_naver("https://x/exchange/FX_USDKRW", "err")
+    finally:
+        remove_fetch_hook(events.append)
+    assert events[0].error == "ConnectionError"
+    assert events[0].ttfb is None
+
+
+def test_collect_data_exports_textfile(tmp_path, monkeypatch):
+    monkeypatch.setenv(metrics.METRICS_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(metrics, "FETCH_HOOKS", [])
+    from kimchi_gold import collect_price
+
+    monkeypatch.setattr(collect_price, "DATA_FILE", tmp_path / "log.csv")
+    quotes = (150000.0, 3345.0, 150000.0 * 31.1035 / 3345.0, 1399.0, 0.0, 0.0)
+    with patch.object(collect_price, "is_today_logged", return_value=False), patch.object(
+        collect_price, "calc_kimchi_premium", return_value=quotes
+    ), patch.object(collect_price, "write_to_csv") as write:
+        collect_price.collect_data()
+    write.assert_called_once()
+
+    text = (tmp_path / metrics.TEXTFILE_NAME).read_text(encoding="utf-8")
+    assert 'kimchi_gold_collect_runs_total{outcome="ok"}' in text
+    assert "kimchi_gold_collect_last_success_timestamp_seconds" in text
+    assert any(isinstance(hook, JsonLinesSink) for hook in metrics.FETCH_HOOKS)
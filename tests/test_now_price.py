@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest.mock import patch
 from kimchi_gold import now_price
@@ -13,7 +14,7 @@ def test_get_price_from_naver_success():
 
     with (
         patch("requests.get") as mock_get,
-        patch("kimchi_gold.now_price.BeautifulSoup") as mock_bs,
+        patch("bs4.BeautifulSoup") as mock_bs,
     ):
         mock_get.return_value.content = f"""
             <html>
@@ -22,18 +23,13 @@ def test_get_price_from_naver_success():
                 </body>
             </html>
         """.encode("utf-8")
-        mock_soup_instance = mock_bs.return_value
-        mock_soup_instance.find.return_value.get_text.return_value = (
-            MOCK_DOMESTIC_PRICE_TEXT
-        )
-
         price = now_price.get_price_from_naver(url, error_msg)
         assert price == float(MOCK_DOMESTIC_PRICE_TEXT.replace(",", ""))
-        mock_get.assert_called_once_with(url, headers=now_price.HEADERS)
-        mock_bs.assert_called_once_with(mock_get.return_value.content, "html.parser")
-        mock_soup_instance.find.assert_called_once_with(
-            "strong", class_="DetailInfo_price__I_VJn"
+        mock_get.assert_called_once_with(
+            url, headers=now_price.HEADERS, timeout=now_price.DEFAULT_POLICY.timeout
         )
+        # 빠른 추출기가 가격을 찾았으므로 BeautifulSoup 경로는 쓰이지 않습니다.
+        mock_bs.assert_not_called()
 
 
 def test_get_price_from_naver_no_price_tag():
@@ -42,7 +38,7 @@ def test_get_price_from_naver_no_price_tag():
 
     with (
         patch("requests.get") as mock_get,
-        patch("kimchi_gold.now_price.BeautifulSoup") as mock_bs,
+        patch("bs4.BeautifulSoup") as mock_bs,
     ):
         mock_get.return_value.content = """
             <html>
@@ -57,7 +53,9 @@ def test_get_price_from_naver_no_price_tag():
         with pytest.raises(ValueError) as excinfo:
             now_price.get_price_from_naver(url, error_msg)
         assert str(excinfo.value) == error_msg
-        mock_get.assert_called_once_with(url, headers=now_price.HEADERS)
+        mock_get.assert_called_once_with(
+            url, headers=now_price.HEADERS, timeout=now_price.DEFAULT_POLICY.timeout
+        )
         mock_bs.assert_called_once_with(mock_get.return_value.content, "html.parser")
         mock_soup_instance.find.assert_called_once_with(
             "strong", class_="DetailInfo_price__I_VJn"
@@ -70,7 +68,7 @@ def test_get_price_from_naver_no_price_in_text():
 
     with (
         patch("requests.get") as mock_get,
-        patch("kimchi_gold.now_price.BeautifulSoup") as mock_bs,
+        patch("bs4.BeautifulSoup") as mock_bs,
     ):
         mock_get.return_value.content = """
             <html>
@@ -85,7 +83,9 @@ def test_get_price_from_naver_no_price_in_text():
         with pytest.raises(ValueError) as excinfo:
             now_price.get_price_from_naver(url, error_msg)
         assert str(excinfo.value) == error_msg
-        mock_get.assert_called_once_with(url, headers=now_price.HEADERS)
+        mock_get.assert_called_once_with(
+            url, headers=now_price.HEADERS, timeout=now_price.DEFAULT_POLICY.timeout
+        )
         mock_bs.assert_called_once_with(mock_get.return_value.content, "html.parser")
         mock_soup_instance.find.assert_called_once_with(
             "strong", class_="DetailInfo_price__I_VJn"
@@ -123,3 +123,39 @@ def test_get_usd_krw_success(mock_get_price):
         "https://m.stock.naver.com/marketindex/exchange/FX_USDKRW",
         "환율 정보를 찾을 수 없습니다.",
     )
+
+
+def test_calc_kimchi_premium_fetches_concurrently():
+    delay = 0.2
+    prices = {
+        now_price.DOMESTIC_GOLD_URL: 150000.0,
+        now_price.INTERNATIONAL_GOLD_URL: 3345.0,
+        now_price.USD_KRW_URL: 1399.0,
+    }
+
+    def slow_price(url, error_msg, session=None, cache=None, **kwargs):
+        time.sleep(delay)
+        return prices[url]
+
+    session = object()
+    with patch(
+        "kimchi_gold.now_price.get_price_from_naver", side_effect=slow_price
+    ) as mock_get_price:
+        start = time.perf_counter()
+        result = now_price.calc_kimchi_premium(session)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < delay * 2  # 순차 실행이라면 delay * 3 이상 걸립니다.
+    assert mock_get_price.call_count == 3
+    for call in mock_get_price.call_args_list:
+        assert call.kwargs["session"] is session
+    international_krw_per_g = 3345.0 * 1399.0 / 31.1035
+    assert result[0] == 150000.0
+    assert result[2] == pytest.approx(international_krw_per_g)
+    assert result[5] == pytest.approx(
+        (150000.0 - international_krw_per_g) / international_krw_per_g * 100
+    )
+
+
+def test_get_session_is_shared():
+    assert now_price.get_session() is now_price.get_session()
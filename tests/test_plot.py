@@ -0,0 +1,106 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import matplotlib
+import pytest
+
+matplotlib.use("Agg")
+
+from kimchi_gold import plot  # noqa: E402
+from kimchi_gold.log_index import LOG_HEADER  # noqa: E402
+from kimchi_gold.plot import output_filename, render_windows, status_label  # noqa: E402
+
+
+def write_log(filepath, days, last_premium="0.50"):
+    today = datetime.now().date()
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        for offset in range(days, 0, -1):
+            day = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+            writer.writerow([day, "150000", "3300", "1400.00 ", "500", "0.30"])
+        writer.writerow([today.strftime("%Y-%m-%d"), "150000", "3300", "1400", "500", last_premium])
+
+
+def test_render_windows_skips_unchanged(tmp_path):
+    data_file = tmp_path / "log.csv"
+    write_log(data_file, days=100)
+
+    results = render_windows([1, 12, None], data_file=data_file, output_dir=tmp_path)
+    assert results == {
+        output_filename(1): True,
+        output_filename(12): True,
+        output_filename(None): True,
+    }
+    assert (tmp_path / "kimchi_gold_price_all.png").exists()
+    mtime = (tmp_path / output_filename(12)).stat().st_mtime_ns
+
+    results = render_windows([1, 12, None], data_file=data_file, output_dir=tmp_path)
+    assert not any(results.values())
+    assert (tmp_path / output_filename(12)).stat().st_mtime_ns == mtime
+
+    write_log(data_file, days=100, last_premium="0.90")
+    results = render_windows([1, 12], data_file=data_file, output_dir=tmp_path)
+    assert all(results.values())
+
+
+def test_render_windows_redraws_missing_image(tmp_path):
+    data_file = tmp_path / "log.csv"
+    write_log(data_file, days=10)
+    render_windows([1], data_file=data_file, output_dir=tmp_path)
+    (tmp_path / output_filename(1)).unlink()
+    assert render_windows([1], data_file=data_file, output_dir=tmp_path) == {
+        output_filename(1): True
+    }
+
+
+def test_render_windows_skips_empty_window(tmp_path):
+    data_file = tmp_path / "log.csv"
+    old = (datetime.now() - timedelta(days=400)).strftime("%Y-%m-%d")
+    with open(data_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        writer.writerow([old, "150000", "3300", "1400", "500", "0.30"])
+
+    results = render_windows([1, None], data_file=data_file, output_dir=tmp_path)
+    assert results == {output_filename(1): None, output_filename(None): True}
+    assert status_label(None) == "데이터 없음, 건너뜀"
+    assert output_filename(None) in json.loads((tmp_path / "plot_fingerprints.json").read_text())
+
+
+def test_render_windows_keeps_fingerprints_of_rendered_windows_on_error(tmp_path):
+    data_file = tmp_path / "log.csv"
+    write_log(data_file, days=100)
+    original = plot.render_figure
+
+    def fail_on_all(df, months, output_file):
+        if months is None:
+            raise RuntimeError("렌더링 실패")
+        original(df, months, output_file)
+
+    with patch.object(plot, "render_figure", side_effect=fail_on_all):
+        with pytest.raises(RuntimeError):
+            render_windows([1, None], data_file=data_file, output_dir=tmp_path)
+    assert render_windows([1, None], data_file=data_file, output_dir=tmp_path) == {
+        output_filename(1): False,
+        output_filename(None): True,
+    }
+
+
+def test_plot_series_downsamples_and_drops_markers():
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+    from kimchi_gold.plot import plot_series
+
+    fig, ax = plt.subplots(figsize=(6, 2), dpi=100)
+    index = pd.date_range("2024-01-01", periods=100_000, freq="min")
+    plot_series(ax, pd.Series(np.arange(100_000.0), index=index), marker="o")
+    line = ax.get_lines()[0]
+    assert len(line.get_xdata()) <= int(ax.get_window_extent().width)
+    assert line.get_marker() in (None, "None", "")
+
+    plot_series(ax, pd.Series([1.0, 2.0, 3.0], index=index[:3]), marker="o")
+    assert ax.get_lines()[1].get_marker() == "o"
+    plt.close(fig)
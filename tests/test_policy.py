@@ -0,0 +1,207 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+import pytest
+import requests
+from kimchi_gold import now_price
+from kimchi_gold.policy import (
+    HEDGE_MIN_SAMPLES,
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    FetchPolicy,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuit_breaker_opens_then_half_opens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()  # 시험 호출 하나
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_policy_retries_network_errors_with_jitter():
+    waits = []
+    policy = FetchPolicy(retries=2, backoff=0.1, sleep=waits.append, hedge=False)
+    calls = []
+
+    def flaky(timeout):
+        calls.append(timeout)
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+
+    retries = []
+    result = policy.call("k", "host", flaky, on_retry=lambda n, e: retries.append(n))
+    assert result == "ok"
+    assert retries == [1, 2]
+    assert len(waits) == 2
+    assert 0 <= waits[0] <= 0.1 and 0 <= waits[1] <= 0.2
+    assert calls[0] == policy.timeout
+
+
+def test_policy_does_not_retry_parse_errors():
+    policy = FetchPolicy(sleep=lambda s: None, hedge=False)
+    calls = []
+
+    def broken(timeout):
+        calls.append(timeout)
+        raise ValueError("가격 없음")
+
+    with pytest.raises(ValueError):
+        policy.call("k", "host", broken)
+    assert len(calls) == 1
+    assert policy.breaker("host").state == "closed"
+
+
+def test_policy_fails_fast_when_circuit_open():
+    policy = FetchPolicy(retries=0, breaker_threshold=2, sleep=lambda s: None, hedge=False)
+
+    def down(timeout):
+        raise requests.ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            policy.call("k", "host", down)
+    with pytest.raises(CircuitOpenError):
+        policy.call("k", "host", down)
+
+
+def test_deadline_caps_attempt_timeout():
+    clock = FakeClock()
+    deadline = Deadline(2.0, clock=clock)
+    policy = FetchPolicy(timeout=(3.05, 10.0))
+    assert policy.attempt_timeout(deadline) == (2.0, 2.0)
+    clock.now = 2.5
+    with pytest.raises(DeadlineExceeded):
+        policy.attempt_timeout(deadline)
+
+
+def test_hedged_request_bounds_tail_latency():
+    policy = FetchPolicy(hedge=True)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        policy.latencies.observe("k", 0.01)
+    calls = []
+    lock = threading.Lock()
+
+    def sometimes_stalls(timeout):
+        with lock:
+            calls.append(timeout)
+            first = len(calls) == 1
+        if first:
+            time.sleep(1.0)  # 드문 지연
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert policy.call("k", "host", sometimes_stalls) == "fast"
+    assert time.perf_counter() - start < 0.5
+    assert len(calls) == 2
+
+
+def test_hedged_request_respects_snapshot_deadline():
+    policy = FetchPolicy(hedge=True, retries=0, deadline=0.3)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        policy.latencies.observe("k", 0.01)
+
+    def drips(timeout):
+        time.sleep(1.0)  # 읽기마다 조금씩 와서 읽기 제한 시간에 걸리지 않는 상류
+        return "late"
+
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        policy.call("k", "host", drips)
+    assert time.perf_counter() - start < 0.8
+
+
+def test_unhedged_request_respects_snapshot_deadline():
+    policy = FetchPolicy(hedge=False, retries=0, deadline=0.3)
+
+    def drips(timeout):
+        time.sleep(1.0)
+        return "late"
+
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        policy.call("k", "host", drips)
+    assert time.perf_counter() - start < 0.8
+
+
+def test_hedged_request_without_deadline():
+    policy = FetchPolicy(hedge=True, deadline=None)
+    for _ in range(HEDGE_MIN_SAMPLES + 5):
+        policy.latencies.observe("k", 0.01)
+
+    def slow(timeout):
+        time.sleep(0.1)
+        return "ok"
+
+    assert policy.call("k", "host", slow) == "ok"
+
+
+def test_half_open_trial_is_not_hedged():
+    policy = FetchPolicy(hedge=True, retries=0, breaker_threshold=1, breaker_reset=0.0)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        policy.latencies.observe("k", 0.01)
+    with pytest.raises(requests.ConnectionError):
+        policy.call("k", "host", Mock(side_effect=requests.ConnectionError))
+    assert policy.breaker("host").state == "half-open"
+    calls = []
+
+    def slow(timeout):
+        calls.append(timeout)
+        time.sleep(0.2)
+        return "ok"
+
+    assert policy.call("k", "host", slow) == "ok"
+    assert len(calls) == 1
+    assert policy.breaker("host").state == "closed"
+
+
+class HangingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(2.0)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_get_price_from_naver_times_out_on_hung_upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HangingHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/marketindex/metals/GCcv1"
+    policy = FetchPolicy(timeout=(0.2, 0.2), retries=1, backoff=0.01, hedge=False)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            now_price.get_price_from_naver(url, "err", policy=policy)
+        assert time.perf_counter() - start < 1.5
+    finally:
+        server.shutdown()
+        server.server_close()
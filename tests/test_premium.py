@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kimchi_gold.premium import TROY_OUNCE_GRAMS, compute_premium
+
+
+def test_compute_premium_scalar_matches_formula():
+    domestic, international, usdkrw = 150000.0, 3345.0, 1399.0
+    result = compute_premium(domestic, international, usdkrw)
+    expected_international = international * usdkrw / TROY_OUNCE_GRAMS
+    assert result.international == pytest.approx(expected_international)
+    assert result.difference == pytest.approx(domestic - expected_international)
+    assert result.percent == pytest.approx(
+        (domestic - expected_international) / expected_international * 100
+    )
+    assert isinstance(result.percent, float)
+
+
+def test_compute_premium_units_scale_prices_not_percent():
+    per_gram = compute_premium(150000.0, 3345.0, 1399.0)
+    per_don = compute_premium(150000.0, 3345.0, 1399.0, unit="don")
+    per_kg = compute_premium(150000.0, 3345.0, 1399.0, unit="kg")
+    assert per_don.domestic == pytest.approx(150000.0 * 3.75)
+    assert per_don.difference == pytest.approx(per_gram.difference * 3.75)
+    assert per_kg.international == pytest.approx(per_gram.international * 1000)
+    assert per_kg.percent == pytest.approx(per_gram.percent)
+
+
+def test_compute_premium_arrays_match_scalar():
+    rng = np.random.default_rng(0)
+    domestic = rng.uniform(80000, 160000, 1000)
+    international = rng.uniform(1800, 3500, 1000)
+    usdkrw = rng.uniform(1100, 1500, 1000)
+    result = compute_premium(domestic, international, usdkrw, unit="don")
+    for i in (0, 500, 999):
+        scalar = compute_premium(
+            float(domestic[i]), float(international[i]), float(usdkrw[i]), unit="don"
+        )
+        assert result.percent[i] == pytest.approx(scalar.percent)
+        assert result.difference[i] == pytest.approx(scalar.difference)
+
+
+def test_compute_premium_series_keeps_index():
+    index = pd.date_range("2024-01-01", periods=3)
+    domestic = pd.Series([86400.0, 86460.0, 87000.0], index=index)
+    result = compute_premium(domestic, np.array([2024.5, 2030.7, 2040.0]), 1300.0)
+    assert isinstance(result.percent, pd.Series)
+    assert result.percent.index.equals(index)
+    assert domestic.tolist() == [86400.0, 86460.0, 87000.0]  # 입력은 그대로입니다.
+
+
+def test_compute_premium_rejects_unknown_unit():
+    with pytest.raises(ValueError):
+        compute_premium(1.0, 1.0, 1.0, unit="oz")
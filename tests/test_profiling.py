@@ -0,0 +1,163 @@
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from unittest.mock import patch
+import pytest
+from kimchi_gold import cli, profiling
+from kimchi_gold.profiling import Profiler, parse_modes, prune_reports
+
+QUOTE = (150000.0, 3345.0, 150452.5, 1399.0, -452.5, -0.3)
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "profiles"
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(directory))
+    return directory
+
+
+def only_report(directory):
+    (path,) = directory.glob("*.json")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_parse_modes():
+    assert parse_modes(None) is None
+    assert parse_modes("0") is None
+    assert parse_modes("1") == ("spans",)
+    assert parse_modes("mem,cpu") == ("spans", "cpu", "mem")
+    assert parse_modes("all") == profiling.MODES
+    with pytest.raises(ValueError):
+        parse_modes("gpu")
+
+
+def test_span_is_a_no_op_without_session(profile_dir, monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    with profiling.session("now") as profiler:
+        with profiling.span("fetch"):
+            pass
+    assert profiler is None
+    assert profiling.active() is None
+    assert not profile_dir.exists()
+
+
+def test_spans_aggregate_across_threads(profile_dir):
+    with profiling.session("collect", modes=("spans",)):
+        with profiling.span("fetch"):
+
+            def work():
+                with profiling.span("fetch.http"):
+                    time.sleep(0.01)
+
+            threads = [threading.Thread(target=work) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        with profiling.span("write"):
+            pass
+    report = only_report(profile_dir)
+    assert report["name"] == "collect"
+    assert [phase["name"] for phase in report["phases"]] == ["fetch", "fetch.http", "write"]
+    http = report["phases"][1]
+    assert http["calls"] == 3
+    assert http["max_seconds"] >= 0.01
+    assert report["phases"][0]["total_seconds"] >= http["max_seconds"]
+    assert report["wall_seconds"] >= report["phases"][0]["total_seconds"]
+    assert "cpu" not in report
+    assert "traced_peak_bytes" not in report["memory"]
+
+
+def test_cpu_and_memory_modes_record_hotspots(profile_dir):
+    def allocate():
+        return [bytearray(1024) for _ in range(2000)]
+
+    with profiling.session("plot", modes=("spans", "cpu", "mem")):
+        with profiling.span("outer"):
+            with profiling.span("load"):
+                kept = allocate()
+            with profiling.span("render"):
+                pass
+        del kept
+    report = only_report(profile_dir)
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    assert phases["load"]["peak_bytes"] >= 2000 * 1024
+    assert phases["outer"]["peak_bytes"] >= phases["load"]["peak_bytes"]
+    assert phases["render"]["peak_bytes"] < 2000 * 1024
+    assert report["memory"]["traced_peak_bytes"] >= 2000 * 1024
+    # 할당이 가장 많았던 'load' 끝의 스냅샷에서 allocate가 가장 많은 메모리를 잡고 있습니다.
+    assert report["memory"]["snapshot_at"] == "load"
+    top = report["memory"]["top_allocations"]
+    assert top[0]["where"].endswith("test_profiling.py:" + str(allocate.__code__.co_firstlineno + 1))
+    assert all("kimchi_gold/profiling.py" not in entry["where"] for entry in top)
+    functions = [entry["function"] for entry in report["cpu"]["top_cumulative"]]
+    assert any("allocate" in name for name in functions)
+    stats = pstats.Stats(str(profile_dir / report["cpu"]["profile_file"]))
+    assert stats.total_calls > 0
+
+
+def test_memory_mode_leaves_existing_tracing_running(profile_dir):
+    already = tracemalloc.is_tracing()
+    if not already:
+        tracemalloc.start()
+    try:
+        with profiling.session("collect", modes=("spans", "mem")):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        if not already:
+            tracemalloc.stop()
+    with profiling.session("collect", modes=("spans", "mem")):
+        pass
+    assert tracemalloc.is_tracing() == already
+
+
+def test_report_is_written_when_run_fails(profile_dir):
+    with pytest.raises(RuntimeError):
+        with profiling.session("collect", modes=("spans",)):
+            with profiling.span("fetch"):
+                raise RuntimeError("upstream down")
+    report = only_report(profile_dir)
+    assert report["error"] == "RuntimeError"
+    assert report["phases"][0]["name"] == "fetch"
+
+
+def test_nested_session_becomes_a_span(profile_dir):
+    with profiling.session("cli", modes=("spans",)):
+        with profiling.session("collect"):
+            with profiling.span("write"):
+                pass
+    report = only_report(profile_dir)
+    assert report["name"] == "cli"
+    assert [phase["name"] for phase in report["phases"]] == ["collect", "write"]
+
+
+def test_prune_keeps_latest_reports(tmp_path):
+    for day in range(1, 6):
+        (tmp_path / f"collect-202505{day:02d}T090000.json").write_text("{}")
+        (tmp_path / f"collect-202505{day:02d}T090000.prof").write_text("")
+    (tmp_path / "plot-20250501T090000.json").write_text("{}")
+    prune_reports(tmp_path, "collect", keep=2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "collect-20250504T090000.json",
+        "collect-20250504T090000.prof",
+        "collect-20250505T090000.json",
+        "collect-20250505T090000.prof",
+        "plot-20250501T090000.json",
+    ]
+
+
+@patch("kimchi_gold.now_price.calc_kimchi_premium")
+def test_cli_profiles_from_env(mock_premium, profile_dir, monkeypatch, capsys):
+    mock_premium.return_value = QUOTE
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    assert cli.main(["now", "--json"]) == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["premium_percent"] == -0.3  # stdout은 그대로입니다.
+    assert "프로파일 보고서" in captured.err
+    report = only_report(profile_dir)
+    assert report["name"] == "now"
+    assert report["phases"][0]["name"] == "import"
+    assert isinstance(Profiler("x").report()["memory"]["max_rss_bytes"], (int, type(None)))
@@ -0,0 +1,144 @@
+import csv
+import threading
+from datetime import date, timedelta
+import pandas as pd
+import pytest
+from kimchi_gold import loader
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.rollup import (
+    ROLLUP_HEADER,
+    bucket_start,
+    load_rollup,
+    merge_row,
+    rebuild_rollup,
+    rebuild_rollups,
+    rollup_path,
+    rollup_records,
+    update_rollups,
+)
+from kimchi_gold.writer import LogWriter
+
+
+def make_rows(start, days):
+    rows = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        rows.append(
+            [
+                day.isoformat(),
+                f"{150000 + 100 * i:.2f}",
+                f"{3300 + (i * 7) % 50:.2f}",
+                f"{1390 + (i * 3) % 20:.2f}",
+                f"{i - 20:.2f}",
+                f"{((i * 13) % 17 - 8) / 10:.2f}",
+            ]
+        )
+    return rows
+
+
+def write_log(path, rows):
+    with LogWriter(path, header=LOG_HEADER, max_rows=len(rows)) as writer:
+        writer.write_rows(rows)
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_bucket_start_weeks_begin_on_monday():
+    assert bucket_start(date(2025, 5, 11), "weekly") == date(2025, 5, 5)  # 일요일
+    assert bucket_start(date(2025, 5, 5), "weekly") == date(2025, 5, 5)
+    assert bucket_start(date(2025, 5, 31), "monthly") == date(2025, 5, 1)
+    with pytest.raises(ValueError):
+        rollup_path("daily", loader.Path("log.csv"))
+
+
+def test_merge_row_updates_stats_and_skips_seen_rows():
+    first = make_rows(date(2025, 5, 5), 1)[0]
+    second = ["2025-05-06", "200", "3000", "1400", "0", "2.5"]
+    bucket = merge_row(None, first, "weekly")
+    assert bucket[:3] == ["2025-05-05", "2025-05-05", "1"]
+    bucket = merge_row(bucket, second, "weekly")
+    stats = dict(zip(ROLLUP_HEADER, bucket))
+    assert stats["일수"] == "2"
+    assert float(stats["김치프리미엄(%)_평균"]) == pytest.approx((-0.8 + 2.5) / 2)
+    assert stats["김치프리미엄(%)_저가"] == "-0.8"
+    assert stats["김치프리미엄(%)_고가"] == "2.5"
+    assert stats["김치프리미엄(%)_종가"] == "2.5"
+    assert merge_row(bucket, second, "weekly") is None
+    next_week = merge_row(bucket, ["2025-05-12"] + second[1:], "weekly")
+    assert next_week[:3] == ["2025-05-12", "2025-05-12", "1"]
+
+
+def test_incremental_updates_match_full_rebuild(tmp_path):
+    log = tmp_path / "log.csv"
+    rows = make_rows(date(2025, 1, 20), 90)
+    write_log(log, rows[:30])
+    rebuild_rollups(log)
+    for row in rows[30:]:
+        write_log(log, [row])
+        update_rollups(row, log)
+    incremental = {p: read_rows(rollup_path(p, log)) for p in ("weekly", "monthly")}
+
+    loader.clear_cache()
+    rebuild_rollups(log)
+    for period, rows_inc in incremental.items():
+        rebuilt = read_rows(rollup_path(period, log))
+        assert len(rebuilt) == len(rows_inc)
+        for a, b in zip(rebuilt[1:], rows_inc[1:]):
+            assert a[:3] == b[:3]
+            # 집계 파일은 소수 6자리까지 저장하므로 그 반올림 차이만큼은 허용합니다.
+            expected = [float(x) for x in a[3:]]
+            assert [float(x) for x in b[3:]] == pytest.approx(expected, abs=1e-4)
+    assert len(incremental["monthly"]) == 1 + 4  # 1월~4월
+
+
+def test_rebuild_matches_pandas_resample(tmp_path):
+    log = tmp_path / "log.csv"
+    write_log(log, make_rows(date(2024, 11, 1), 200))
+    rebuild_rollup("monthly", log)
+    table = load_rollup("monthly", log)
+    df = loader.load_log(log)
+    expected = df["김치프리미엄(%)"].resample("MS").agg(["mean", "min", "max", "last"])
+    assert table.index.equals(pd.DatetimeIndex(expected.index, name="기간"))
+    assert table["김치프리미엄(%)_평균"].to_numpy() == pytest.approx(
+        expected["mean"].to_numpy(), abs=1e-6
+    )
+    assert table["김치프리미엄(%)_종가"].to_numpy() == pytest.approx(expected["last"].to_numpy())
+    assert table["일수"].sum() == 200
+    record = rollup_records(table)[0]
+    assert record["date"] == "2024-11-01"
+    assert record["until"] == "2024-11-30"
+    assert record["days"] == 30
+
+
+def test_update_creates_missing_rollups_from_log(tmp_path):
+    log = tmp_path / "log.csv"
+    rows = make_rows(date(2025, 5, 1), 10)
+    write_log(log, rows)
+    update_rollups(rows[-1], log)
+    weekly = read_rows(rollup_path("weekly", log))
+    assert weekly[0] == ROLLUP_HEADER
+    assert sum(int(row[2]) for row in weekly[1:]) == 10
+
+
+def test_concurrent_updates_do_not_lose_rows(tmp_path):
+    log = tmp_path / "log.csv"
+    rows = make_rows(date(2025, 5, 5), 1)
+    write_log(log, rows)
+    rebuild_rollups(log)
+    stamps = [f"2025-05-05T09:{minute:02d}:00" for minute in range(40)]
+
+    def update(stamp):
+        update_rollups([stamp] + rows[0][1:], log)
+
+    threads = [threading.Thread(target=update, args=(stamp,)) for stamp in stamps]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    (bucket,) = read_rows(rollup_path("weekly", log))[1:]
+    # 스레드 순서에 따라 일부는 '이미 반영한 시각'으로 걸러지지만, 겹쳐 쓰여 깨지지는 않습니다.
+    assert 1 < int(bucket[2]) <= 41
+    assert bucket[1] <= stamps[-1]
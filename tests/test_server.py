@@ -0,0 +1,295 @@
+import asyncio
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from kimchi_gold import now_price
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.server import QuoteServer
+
+PRICES = {"M04020000": "150,000", "GCcv1": "3,345.00", "FX_USDKRW": "1,399.00"}
+QUOTE = (150000.0, 3345.0, 150452.5, 1399.0, -452.5, -0.3)
+
+
+class StubNaverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with type(self).lock:
+            type(self).hits += 1
+        price = PRICES[self.path.rsplit("/", 1)[-1]]
+        body = f'<strong class="DetailInfo_price__I_VJn">{price}</strong>'.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_upstream(monkeypatch):
+    StubNaverHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNaverHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(now_price, "DOMESTIC_GOLD_URL", f"{base}/metals/M04020000")
+    monkeypatch.setattr(now_price, "INTERNATIONAL_GOLD_URL", f"{base}/metals/GCcv1")
+    monkeypatch.setattr(now_price, "USD_KRW_URL", f"{base}/exchange/FX_USDKRW")
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+async def get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+async def wait_for_refresh(server, count=1):
+    while server.refreshes < count:
+        await asyncio.sleep(0.01)
+
+
+def test_latest_serves_cached_quote_without_extra_upstream_requests(stub_upstream):
+    session = requests.Session()
+
+    async def scenario():
+        server = QuoteServer(
+            port=0,
+            interval=60.0,
+            fetch=lambda: now_price.calc_kimchi_premium(session=session),
+        )
+        await server.start()
+        try:
+            await asyncio.wait_for(wait_for_refresh(server), 5)
+            responses = await asyncio.gather(*(get(server.port, "/latest") for _ in range(50)))
+        finally:
+            await server.stop()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert StubNaverHandler.hits == 3
+    assert {status for status, _ in responses} == {200}
+    data = json.loads(responses[0][1])
+    assert data["domestic"] == 150000.0
+    assert data["usdkrw"] == 1399.0
+    assert "updated_at" in data
+
+
+def test_latest_is_unavailable_until_first_refresh():
+    async def scenario():
+        server = QuoteServer(port=0, fetch=lambda: (_ for _ in ()).throw(RuntimeError("x")))
+        await server.start()
+        try:
+            await asyncio.sleep(0.05)
+            latest = await get(server.port, "/latest")
+            health = await get(server.port, "/health")
+            missing = await get(server.port, "/nope")
+        finally:
+            await server.stop()
+        return latest, health, missing
+
+    latest, health, missing = asyncio.run(scenario())
+    assert latest[0] == 503
+    assert json.loads(health[1])["last_error"] == "RuntimeError: x"
+    assert missing[0] == 404
+
+
+def test_keep_alive_serves_several_requests_on_one_connection():
+    async def scenario():
+        server = QuoteServer(port=0, fetch=lambda: QUOTE)
+        await server.start()
+        try:
+            await asyncio.wait_for(wait_for_refresh(server), 5)
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            bodies = []
+            for _ in range(3):
+                writer.write(b"GET /latest HTTP/1.1\r\nHost: x\r\n\r\n")
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                bodies.append(await reader.readexactly(length))
+            writer.close()
+        finally:
+            await server.stop()
+        return bodies
+
+    bodies = asyncio.run(scenario())
+    assert len(set(bodies)) == 1
+    assert json.loads(bodies[0])["premium_percent"] == -0.3
+
+
+def test_request_body_is_not_read_as_next_request():
+    async def scenario():
+        server = QuoteServer(port=0, fetch=lambda: QUOTE)
+        await server.start()
+        try:
+            await asyncio.wait_for(wait_for_refresh(server), 5)
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(
+                b"POST /latest HTTP/1.1\r\nHost: x\r\nContent-Length: 18\r\n\r\n"
+                b"GET /nowhere HTTP/"  # 요청 줄처럼 보이는 18바이트 본문
+                b"GET /latest HTTP/1.1\r\nHost: x\r\n\r\n"
+            )
+            statuses = []
+            for _ in range(2):
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+                statuses.append(int(head.split()[1]))
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+            writer.close()
+
+            # 길이를 모르는 chunked 본문은 읽어 버리지 못하므로 응답 뒤에 연결을 닫습니다.
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(
+                b"POST /latest HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5\r\nhello\r\n0\r\n\r\n"
+            )
+            chunked = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+        finally:
+            await server.stop()
+        return statuses, chunked
+
+    statuses, chunked = asyncio.run(scenario())
+    assert statuses == [405, 200]
+    assert chunked.startswith(b"HTTP/1.1 405") and chunked.count(b"HTTP/1.1") == 1
+
+
+def test_missing_values_are_served_as_null(tmp_path):
+    data_file = tmp_path / "log.csv"
+    data_file.write_text(
+        ",".join(LOG_HEADER) + "\n2099-01-02,200,2000,,,\n", encoding="utf-8"
+    )
+
+    async def scenario():
+        quote = QUOTE[:5] + (float("nan"),)
+        server = QuoteServer(port=0, fetch=lambda: quote, data_file=data_file)
+        await server.start()
+        try:
+            await asyncio.wait_for(wait_for_refresh(server), 5)
+            return await get(server.port, "/latest"), await get(server.port, "/history")
+        finally:
+            await server.stop()
+
+    latest, history = asyncio.run(scenario())
+    for _, body in (latest, history):
+        assert b"NaN" not in body
+    assert json.loads(latest[1])["premium_percent"] is None
+    row = json.loads(history[1])["rows"][0]
+    assert row["usdkrw"] is None and row["domestic"] == 200.0
+
+
+def test_history_window_reads_price_log(tmp_path):
+    data_file = tmp_path / "log.csv"
+    data_file.write_text(
+        ",".join(LOG_HEADER)
+        + "\n2000-01-03,100,1000,1100,-10,-1.0\n2099-01-02,200,2000,1300,10,1.5\n",
+        encoding="utf-8",
+    )
+
+    async def scenario():
+        server = QuoteServer(port=0, fetch=lambda: QUOTE, data_file=data_file)
+        await server.start()
+        try:
+            return (
+                await get(server.port, "/history"),
+                await get(server.port, "/history?window=12"),
+                await get(server.port, "/history?window=abc"),
+            )
+        finally:
+            await server.stop()
+
+    everything, recent, bad = asyncio.run(scenario())
+    assert len(json.loads(everything[1])["rows"]) == 2
+    rows = json.loads(recent[1])["rows"]
+    assert rows == [
+        {
+            "date": "2099-01-02T00:00:00",
+            "domestic": 200.0,
+            "international": 2000.0,
+            "usdkrw": 1300.0,
+            "difference": 10.0,
+            "premium_percent": 1.5,
+        }
+    ]
+    assert bad[0] == 400
+
+
+def test_history_resolution_serves_rollups(tmp_path):
+    data_file = tmp_path / "log.csv"
+    data_file.write_text(
+        ",".join(LOG_HEADER)
+        + "\n2025-05-01,100,1000,1100,-10,-1.0"
+        + "\n2025-05-02,200,2000,1300,10,2.0"
+        + "\n2025-06-02,300,3000,1200,20,0.5\n",
+        encoding="utf-8",
+    )
+
+    async def scenario():
+        server = QuoteServer(port=0, fetch=lambda: QUOTE, data_file=data_file)
+        await server.start()
+        try:
+            return (
+                await get(server.port, "/history?resolution=monthly"),
+                await get(server.port, "/history?resolution=weekly"),
+                await get(server.port, "/history?resolution=hourly"),
+            )
+        finally:
+            await server.stop()
+
+    monthly, weekly, bad = asyncio.run(scenario())
+    body = json.loads(monthly[1])
+    assert body["resolution"] == "monthly"
+    may, june = body["rows"]
+    assert (may["date"], may["until"], may["days"]) == ("2025-05-01", "2025-05-02", 2)
+    assert may["premium_percent_mean"] == 0.5
+    assert (may["premium_percent_low"], may["premium_percent_high"]) == (-1.0, 2.0)
+    assert june["premium_percent_last"] == 0.5
+    assert [row["date"] for row in json.loads(weekly[1])["rows"]] == [
+        "2025-04-28",
+        "2025-06-02",
+    ]
+    assert bad[0] == 400
+
+
+def test_stream_pushes_each_refresh_to_every_subscriber():
+    quotes = (QUOTE[:5] + (float(i),) for i in itertools.count())
+
+    async def subscribe(port, count):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /stream HTTP/1.1\r\nHost: x\r\n\r\n")
+        await reader.readuntil(b"\r\n\r\n")
+        events = []
+        while len(events) < count:
+            line = await reader.readuntil(b"\n\n")
+            if line.startswith(b"data: "):
+                events.append(json.loads(line[6:]))
+        writer.close()
+        return events
+
+    async def scenario():
+        server = QuoteServer(port=0, interval=0.1, fetch=lambda: next(quotes))
+        await server.start()
+        try:
+            await asyncio.wait_for(wait_for_refresh(server), 5)
+            return await asyncio.wait_for(
+                asyncio.gather(*(subscribe(server.port, 2) for _ in range(5))), 5
+            )
+        finally:
+            await server.stop()
+
+    for events in asyncio.run(scenario()):
+        assert len(events) == 2
+        assert events[1]["premium_percent"] > events[0]["premium_percent"]
@@ -0,0 +1,104 @@
+import csv
+import threading
+from datetime import datetime
+import numpy as np
+import pytest
+from kimchi_gold.log_index import LOG_HEADER
+from kimchi_gold.storage import COLUMNS, ColumnStore
+
+ROWS = [
+    ["2024-12-30", "120000", "2600.5", "1470.10 ", "-1000", "-0.83"],
+    ["2024-12-31", "121000.00", "2610.00", "1472.50", "-500.00", "-0.41"],
+    ["2025-01-02", "122000.00", "2620.00", "1465.00", "250.00", "0.21"],
+]
+
+
+def write_csv(filepath, rows):
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_HEADER)
+        writer.writerows(rows)
+
+
+def test_import_creates_year_partitions(tmp_path):
+    csv_path = tmp_path / "log.csv"
+    write_csv(csv_path, ROWS)
+    store = ColumnStore(tmp_path / "store")
+
+    assert store.import_csv(csv_path) == [2024, 2025]
+    assert store.years() == [2024, 2025]
+    partition = store.read_partition(2024)
+    assert isinstance(partition, np.memmap)
+    assert partition.shape == (len(COLUMNS), 2)
+    assert partition[3].tolist() == [1470.10, 1472.50]
+
+
+def test_load_single_partition_is_a_view(tmp_path):
+    store = ColumnStore(tmp_path)
+    store.append_rows(ROWS)
+    columns = store.load(start=datetime(2025, 1, 1))
+    assert columns["domestic"].tolist() == [122000.0]
+    assert isinstance(columns["domestic"].base, np.memmap)
+
+    columns = store.load()
+    assert columns["premium_pct"].tolist() == [-0.83, -0.41, 0.21]
+
+
+def test_append_rewrites_only_touched_partition(tmp_path):
+    store = ColumnStore(tmp_path)
+    store.append_rows(ROWS)
+    old_mtime = store.partition_path(2024).stat().st_mtime_ns
+
+    touched = store.append_rows(
+        [
+            ["2025-01-02", "123000.00", "2620.00", "1465.00", "250.00", "0.30"],
+            ["2025-01-03T10:30:00", "124000.00", "2630.00", "1466.00", "300.00", "0.40"],
+        ]
+    )
+    assert touched == [2025]
+    assert store.partition_path(2024).stat().st_mtime_ns == old_mtime
+    columns = store.load(start=datetime(2025, 1, 1))
+    # 같은 타임스탬프는 새 값으로 교체됩니다.
+    assert columns["domestic"].tolist() == [123000.0, 124000.0]
+
+
+def test_concurrent_appends_keep_every_row(tmp_path):
+    store = ColumnStore(tmp_path)
+
+    def append(worker):
+        for i in range(20):
+            stamp = f"2025-01-{worker + 1:02d}T00:{i:02d}:00"
+            store.append_rows([[stamp, "120000", "2600", "1470", "0", "0.1"]])
+
+    threads = [threading.Thread(target=append, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.load()["timestamp"]) == 8 * 20
+
+
+def test_export_csv_round_trip(tmp_path):
+    store = ColumnStore(tmp_path / "store")
+    store.append_rows(ROWS + [["2025-01-03T10:30:00", "1", "2", "3", "4", "5"]])
+    out = tmp_path / "out.csv"
+    store.export_csv(out)
+    with open(out, "r", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == LOG_HEADER
+    assert rows[1] == ["2024-12-30", "120000.00", "2600.50", "1470.10", "-1000.00", "-0.83"]
+    assert rows[-1][0] == "2025-01-03T10:30:00"
+
+
+def test_to_frame_uses_log_headers(tmp_path):
+    store = ColumnStore(tmp_path)
+    store.append_rows(ROWS)
+    df = store.to_frame()
+    assert list(df.columns) == LOG_HEADER[1:]
+    assert df.index.is_monotonic_increasing
+    assert df["환율(원/달러)"].iloc[0] == pytest.approx(1470.10)
+
+
+def test_append_rejects_wrong_shape(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnStore(tmp_path).append(np.zeros((3, 2)))
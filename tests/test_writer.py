@@ -0,0 +1,126 @@
+import csv
+import errno
+import multiprocessing
+import threading
+import time
+import pytest
+from kimchi_gold.log_index import LOG_HEADER, LogIndex
+from kimchi_gold import writer as writer_module
+from kimchi_gold.writer import LogWriter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_log_writer_buffers_until_batch_size(tmp_path):
+    path = tmp_path / "log.csv"
+    writer = LogWriter(path, header=LOG_HEADER, max_rows=3)
+    writer.write(["2024-01-01", "1", "1", "1", "1", "1"])
+    writer.write(["2024-01-02", "2", "2", "2", "2", "2"])
+    assert not path.exists()
+    writer.write(["2024-01-03", "3", "3", "3", "3", "3"])
+    rows = read_rows(path)
+    assert rows[0] == LOG_HEADER
+    assert [row[0] for row in rows[1:]] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert len(writer) == 0
+
+
+def test_log_writer_flushes_after_max_delay(tmp_path):
+    path = tmp_path / "log.csv"
+    clock = FakeClock()
+    writer = LogWriter(path, max_rows=100, max_delay=5.0, fsync="never", clock=clock)
+    writer.write(["a"])
+    clock.now = 6.0
+    writer.write(["b"])
+    assert read_rows(path) == [["a"], ["b"]]
+
+
+def test_log_writer_flushes_idle_buffer_on_timer(tmp_path):
+    path = tmp_path / "log.csv"
+    writer = LogWriter(path, max_rows=100, max_delay=0.05, fsync="never")
+    writer.write(["a"])
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert read_rows(path) == [["a"]]
+    assert len(writer) == 0
+    writer.close()
+
+
+def test_log_writer_keeps_rows_when_write_fails(tmp_path, monkeypatch):
+    path = tmp_path / "log.csv"
+    writer = LogWriter(path, header=["h"], max_rows=100, fsync="never")
+    writer.write(["a"])
+    writer.write(["b"])
+
+    def no_space(fd, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr(writer_module.os, "write", no_space)
+        with pytest.raises(OSError):
+            writer.flush()
+    assert len(writer) == 2
+    writer.write(["c"])
+    assert writer.flush() == 3
+    assert read_rows(path) == [["h"], ["a"], ["b"], ["c"]]
+
+
+def test_log_writer_context_manager_flushes_on_exit(tmp_path):
+    path = tmp_path / "log.csv"
+    with LogWriter(path, header=["h"], fsync="always") as writer:
+        writer.write(["x"])
+    assert read_rows(path) == [["h"], ["x"]]
+    with pytest.raises(ValueError):
+        LogWriter(path, fsync="sometimes")
+
+
+def _append_many(path, worker, count):
+    with LogWriter(path, header=LOG_HEADER, max_rows=7, fsync="never") as writer:
+        for i in range(count):
+            writer.write([f"w{worker}-{i:04d}", "1", "2", "3", "4", "5"])
+
+
+def test_concurrent_processes_and_threads_do_not_interleave(tmp_path):
+    path = tmp_path / "log.csv"
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_append_many, args=(path, p, 200)) for p in range(3)]
+    threads = [threading.Thread(target=_append_many, args=(path, 10 + t, 200)) for t in range(3)]
+    for worker in processes + threads:
+        worker.start()
+    for worker in processes + threads:
+        worker.join()
+
+    rows = read_rows(path)
+    assert rows[0] == LOG_HEADER
+    assert rows.count(LOG_HEADER) == 1
+    body = rows[1:]
+    assert len(body) == 6 * 200
+    assert all(len(row) == 6 for row in body)
+    assert len({row[0] for row in body}) == len(body)
+
+
+def test_log_index_append_shares_file_lock(tmp_path):
+    path = tmp_path / "log.csv"
+
+    def upsert(day):
+        LogIndex(path).upsert([f"2024-01-{day:02d}", "1", "1", "1", "1", "1"])
+
+    threads = [threading.Thread(target=upsert, args=(day,)) for day in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rows = read_rows(path)
+    assert rows.count(LOG_HEADER) == 1
+    assert [row[0] for row in rows[1:]] == [f"2024-01-{day:02d}" for day in range(1, 21)]